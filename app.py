@@ -5,22 +5,87 @@ Main Streamlit Application Entry Point
 """
 
 import streamlit as st
-import pandas as pd
 from pathlib import Path
-from datetime import datetime
-import os
 
-# Configure Streamlit page
-st.set_page_config(
-    page_title="Job-O-Matic Dashboard",
-    page_icon="🎯",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Heavy dependencies (pandas, SQLAlchemy, requests, python-docx) are imported
+# inside the page or resource that needs them so a cold start only pays for
+# Streamlit itself. tests/test_app_loads.py enforces this.
+
+
+@st.cache_resource
+def get_engine():
+    """Database engine, with tables created once per server process"""
+    from src.db import engine, init_db
+
+    init_db(engine)
+    return engine
+
+
+@st.cache_resource
+def get_http_session():
+    """Shared requests.Session so API calls reuse pooled connections"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@st.cache_resource(max_entries=1)
+def get_cv_corpus(signature):
+    """CV files and their text, reloaded only when `signature` changes"""
+    from src.cv_corpus import load_cv_corpus
+
+    return load_cv_corpus()
+
+
+@st.cache_resource
+def get_report_store():
+    """PR report store; keeps parsed reports cached across reruns"""
+    from src.pr_reports import ReportStore
+
+    return ReportStore()
+
+
+@st.cache_data(ttl=60)
+def get_pr_trends(repository, days):
+    """Daily readiness trend and per-PR rollup summary from the history tables"""
+    from src.db import get_session
+    from src.pr_history import daily_trend, rollup_summary
+
+    get_engine()
+    return daily_trend(repository, days, get_session), rollup_summary(repository, get_session)
+
+
+@st.cache_data(ttl=30)
+def get_job_counts():
+    """Job counts by status plus overall submission success rate"""
+    from sqlalchemy import func, select
+
+    from src.models import Job, SubmissionRecord
+
+    with get_engine().connect() as conn:
+        counts = dict(conn.execute(select(Job.status, func.count(Job.id)).group_by(Job.status)).all())
+        total, ok = conn.execute(
+            select(func.count(SubmissionRecord.id),
+                   func.count(SubmissionRecord.id).filter(SubmissionRecord.response_status.in_([200, 201])))
+        ).one()
+    return counts, (ok / total if total else 0.0)
 
 def main():
     """Main application function"""
-    
+
+    # Configure Streamlit page (must be the first Streamlit call of each run)
+    st.set_page_config(
+        page_title="Job-O-Matic Dashboard",
+        page_icon="🎯",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
     # Header
     st.title("🎯 Job-O-Matic")
     st.subheader("Automated Job Application System")
@@ -32,11 +97,27 @@ def main():
         st.success("✅ Directory structure created!")
         st.info("📝 Please add your CV files to the `data/cv/` directory and configure your settings.")
     
+    # Optional Prometheus sidecar (JOB_O_MATIC_METRICS_PORT); starts once per process
+    try:
+        from src.metrics import start_metrics_server
+        start_metrics_server()
+    except Exception as e:
+        print("Metrics endpoint not started:", e)
+
+    # Optional GitHub webhook receiver (PR_WEBHOOK_PORT + PR_WEBHOOK_SECRET)
+    try:
+        import os
+        if os.getenv("PR_WEBHOOK_PORT"):
+            from src.pr_webhooks import start_webhook_server
+            start_webhook_server()
+    except Exception as e:
+        print("Webhook receiver not started:", e)
+
     # Sidebar navigation
     st.sidebar.title("Navigation")
     page = st.sidebar.selectbox(
         "Choose a page:",
-        ["Dashboard", "Job Search", "Applications", "PR Status", "Settings", "Help"]
+        ["Dashboard", "Job Search", "Applications", "PR Status", "Performance", "Settings", "Help"]
     )
     
     # Main content based on page selection
@@ -48,6 +129,8 @@ def main():
         show_applications()
     elif page == "PR Status":
         show_pr_status()
+    elif page == "Performance":
+        show_performance()
     elif page == "Settings":
         show_settings()
     elif page == "Help":
@@ -90,30 +173,44 @@ Email and cover letter templates go in `templates/`:
 3. Start searching for jobs and managing applications
 """)
 
+    # Seed editable email/cover letter templates
+    try:
+        from src.email_templates import TemplateStore
+        TemplateStore("data/templates").write_defaults()
+    except Exception:
+        pass
+
 def show_dashboard():
     """Display main dashboard"""
     st.header("📊 Dashboard")
     
-    # Sample metrics
+    try:
+        counts, success_rate = get_job_counts()
+    except Exception as e:
+        print("Could not load job counts:", e)
+        counts, success_rate = {}, 0.0
+
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Jobs Found", "0", "0")
+        st.metric("Total Jobs Found", sum(counts.values()))
     
     with col2:
-        st.metric("Applications Sent", "0", "0")
+        st.metric("Applications Sent", counts.get("SENT", 0))
     
     with col3:
-        st.metric("Pending Reviews", "0", "0")
+        st.metric("Pending Reviews", counts.get("PREVIEW_READY", 0))
     
     with col4:
-        st.metric("Success Rate", "0%", "0%")
+        st.metric("Success Rate", f"{success_rate:.0%}")
     
     # Status overview
     st.subheader("📋 Recent Activity")
     
-    # Check if there are any data files
-    if not any(Path("data/cv").glob("*")) if Path("data/cv").exists() else True:
+    from src.cv_corpus import corpus_signature
+
+    corpus = get_cv_corpus(corpus_signature())
+    if not corpus:
         st.info("👋 Welcome to Job-O-Matic! Get started by:")
         st.markdown("""
         1. **Upload your CV files** to the `data/cv/` directory
@@ -125,11 +222,24 @@ def show_dashboard():
         st.success("✅ System is ready to use!")
         
         # Show CV files found
-        cv_files = list(Path("data/cv").glob("*"))
+        cv_files = [entry["path"] for entry in corpus.values()]
         if cv_files:
             st.write("**CV Files Found:**")
+            from src.apply.streaming import deferred_file
+
             for cv_file in cv_files:
-                st.write(f"📄 {cv_file.name}")
+                col_name, col_download = st.columns([4, 1])
+                with col_name:
+                    st.write(f"📄 {cv_file.name}")
+                with col_download:
+                    # The file is only read when Download is clicked, not on every rerun
+                    st.download_button(
+                        label="📥 Download",
+                        data=deferred_file(cv_file),
+                        file_name=cv_file.name,
+                        mime="application/octet-stream",
+                        key=f"cv_download_{cv_file.name}",
+                    )
 
 def show_job_search():
     """Display job search interface"""
@@ -154,9 +264,74 @@ def show_applications():
     - View all job applications
     - Track application status
     - Generate tailored CVs and cover letters
-    - Send applications via API
     """)
 
+    st.subheader("🚀 Auto-Submit")
+    show_auto_submit()
+
+def get_approved_jobs():
+    """Approved jobs waiting to be sent, as plain dicts for the submit executor"""
+    from sqlalchemy import select
+
+    from src.models import Job
+
+    with get_engine().connect() as conn:
+        rows = conn.execute(
+            select(Job.id, Job.company, Job.title, Job.apply_url, Job.platform, Job.status,
+                   Job.board_token, Job.posting_id, Job.preview_dir.label("output_dir"))
+            .where(Job.status == "APPROVED").order_by(Job.id)
+        ).mappings().all()
+    return [dict(r) for r in rows]
+
+def show_auto_submit():
+    """Submit approved jobs concurrently, streaming per-job progress"""
+    try:
+        rows = get_approved_jobs()
+    except Exception as e:
+        st.error(f"❌ Could not load approved jobs: {e}")
+        return
+    if not rows:
+        st.info("📝 No approved jobs. Preview and approve jobs before submitting.")
+        return
+
+    st.write(f"**{len(rows)} approved job(s)** ready to submit.")
+    if st.button(f"🚀 Submit {len(rows)} application(s)", type="primary"):
+        run_auto_submit(rows)
+
+def run_auto_submit(rows):
+    """Run the submit executor and report progress as each job finishes"""
+    import os
+
+    from src.auto_submit import JobApplicationSubmitter
+    from src.submit_executor import SubmitExecutor
+
+    candidate_data = {
+        "first_name": os.getenv("CANDIDATE_FIRST_NAME", ""),
+        "last_name": os.getenv("CANDIDATE_LAST_NAME", ""),
+        "email": os.getenv("CANDIDATE_EMAIL", ""),
+        "phone": os.getenv("CANDIDATE_PHONE", ""),
+    }
+    api_keys = {
+        "greenhouse": os.getenv("GREENHOUSE_API_KEY", ""),
+        "lever": os.getenv("LEVER_API_KEY", ""),
+    }
+    executor = SubmitExecutor(JobApplicationSubmitter(session=get_http_session()))
+    progress = st.progress(0.0, text=f"Submitting {len(rows)} application(s)...")
+    log = st.empty()
+    lines = []
+
+    def on_progress(done, total, result):
+        # Called from this (the script) thread, so Streamlit elements can be updated directly
+        icon = "✅" if result["success"] else "⏭️" if result.get("skipped") else "❌"
+        lines.append(f"{icon} {result['job']}: {result['message']}")
+        progress.progress(done / total, text=f"Submitted {done}/{total}")
+        log.markdown("\n".join(f"- {line}" for line in lines))
+
+    results = executor.run(rows, candidate_data, api_keys, on_progress=on_progress)
+    sent = sum(1 for r in results if r["success"])
+    (st.success if sent == len(results) else st.warning)(f"{sent}/{len(results)} application(s) sent.")
+    get_job_counts.clear()
+
 def show_settings():
     """Display settings page"""
     st.header("⚙️ Settings")
@@ -234,112 +409,258 @@ python3 scripts/check-pr-merge-readiness.py
 ./scripts/check-pr-readiness.sh
         """, language="bash")
     
+    with st.expander("⚡ Current Readiness", expanded=True):
+        show_current_pr_state()
+
     with st.expander("📊 Latest Report"):
         show_latest_pr_report()
 
+    with st.expander("📈 Readiness Trends"):
+        show_pr_trends()
+
 def check_pr_status_live():
-    """Run PR status check and display results"""
-    import subprocess
-    import os
-    
+    """Run the PR checker in-process on a background thread and display results"""
+    import threading
+
+    from src.pr_checker import check_prs
+
+    session = get_http_session()
+    state = {"done": 0, "total": 0, "last": None, "report": None, "error": None}
+
+    def on_progress(done, total, readiness):
+        state.update(done=done, total=total, last=readiness)
+
+    def worker():
+        try:
+            state["report"] = check_prs(session=session, on_progress=on_progress)
+        except Exception as e:
+            state["error"] = e
+
+    progress = st.progress(0.0, text="Fetching open pull requests...")
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    while thread.is_alive():
+        thread.join(timeout=0.2)
+        if state["total"]:
+            progress.progress(state["done"] / state["total"],
+                              text=f"Checked PR #{state['last']['pr_number']} "
+                                   f"({state['done']}/{state['total']})")
+    progress.empty()
+
+    if state["error"] is not None:
+        st.error(f"❌ Unexpected error: {state['error']}")
+        return
+
+    report = state["report"]
+    if not report["summary"]["total_prs"]:
+        st.warning("No open pull requests found (or GitHub could not be reached).")
+        # Suggest alternatives
+        st.markdown("""
+        **Alternative options:**
+        - Use GitHub CLI: `gh pr list --repo letter-orgz/job-O-matic-`
+        - Visit the web interface: https://github.com/letter-orgz/job-O-matic-/pulls
+        - Set up GitHub token authentication
+        """)
+        return
+
+    st.success("✅ PR check completed successfully!")
+    # Keep the report for history; render from memory rather than re-reading it
     try:
-        # Try to run the PR checker script
-        result = subprocess.run(
-            ["python3", "scripts/check-pr-merge-readiness.py"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        if result.returncode == 0:
-            st.success("✅ PR check completed successfully!")
-            
-            # Display output
-            if result.stdout:
-                st.text_area("Output:", result.stdout, height=300)
-            
-            # Try to show latest report
-            show_latest_pr_report()
-        else:
-            st.error(f"❌ PR check failed with exit code {result.returncode}")
-            if result.stderr:
-                st.error(f"Error: {result.stderr}")
-                
-            # Suggest alternatives
-            st.markdown("""
-            **Alternative options:**
-            - Use GitHub CLI: `gh pr list --repo letter-orgz/job-O-matic-`
-            - Visit the web interface: https://github.com/letter-orgz/job-O-matic-/pulls
-            - Set up GitHub token authentication
-            """)
-    
-    except subprocess.TimeoutExpired:
-        st.error("⏰ Check timed out. This might be due to network issues or rate limiting.")
-    except FileNotFoundError:
-        st.error("❌ Python script not found. Please ensure the scripts are properly installed.")
+        store = get_report_store()
+        path = store.save(report)
+        store.compact()
+        label = path.name
+    except OSError as e:
+        st.warning(f"Report not saved: {e}")
+        label = "live check"
+    try:
+        from src.db import get_session
+        from src.pr_history import record_report
+        from src.pr_state import replace_from_report
+
+        get_engine()
+        record_report(report, get_session)
+        replace_from_report(report, get_session)
+        get_pr_trends.clear()
     except Exception as e:
-        st.error(f"❌ Unexpected error: {str(e)}")
+        st.warning(f"PR history not updated: {e}")
+    render_pr_report(report, label)
+
+def show_current_pr_state():
+    """Display the stored per-PR readiness kept fresh by checks and webhooks"""
+    from src.db import get_session
+    from src.pr_checker import DEFAULT_REPO_NAME, DEFAULT_REPO_OWNER
+    from src.pr_state import current_report
+
+    try:
+        get_engine()
+        report = current_report(f"{DEFAULT_REPO_OWNER}/{DEFAULT_REPO_NAME}", get_session)
+    except Exception as e:
+        st.error(f"❌ Could not load PR state: {e}")
+        return
+    if report is None:
+        st.info("📝 No PR state yet. Run a check, or point a GitHub webhook at the receiver.")
+        return
+    render_pr_report(report, f"state as of {report['timestamp'][:19]} UTC")
 
 def show_latest_pr_report():
     """Display the latest PR report if available"""
-    reports_dir = Path("reports")
+    store = get_report_store()
     
-    if not reports_dir.exists():
+    if not store.reports_dir.exists():
         st.info("📝 No reports directory found. Run a PR check to generate reports.")
         return
     
-    # Find latest report file
-    report_files = list(reports_dir.glob("pr-merge-readiness-*.json"))
+    try:
+        # Index lookup + mtime-keyed cache: no directory scan or re-parse per rerun
+        report_data = store.latest()
+        if report_data is None:
+            st.info("📝 No PR reports found. Run a check to generate one.")
+            return
+        render_pr_report(report_data, store.latest_path().name)
     
-    if not report_files:
-        st.info("📝 No PR reports found. Run a check to generate one.")
+    except Exception as e:
+        st.error(f"❌ Error reading report: {str(e)}")
+
+def show_pr_trends():
+    """Chart readiness trends from the precomputed daily rollups"""
+    from src.pr_checker import DEFAULT_REPO_NAME, DEFAULT_REPO_OWNER
+
+    days = st.select_slider("Window (days)", options=[30, 90, 180, 365], value=180)
+    try:
+        trend, summary = get_pr_trends(f"{DEFAULT_REPO_OWNER}/{DEFAULT_REPO_NAME}", days)
+    except Exception as e:
+        st.error(f"❌ Could not load PR history: {e}")
         return
+    if not trend:
+        st.info("No history yet. Run a PR check, or import old reports with "
+                "`python -m src.pr_history --backfill`.")
+        return
+
+    import pandas as pd
+
+    col1, col2, col3, col4 = st.columns(4)
+    ttr = summary["median_time_to_ready_hours"]
+    col1.metric("PRs tracked", summary["prs_tracked"])
+    col2.metric("Median time to ready", "—" if ttr is None else f"{ttr:.1f} h")
+    col3.metric("Mean time in draft", f"{summary['mean_draft_hours']:.1f} h")
+    col4.metric("Flaky flips / 100 snapshots", f"{summary['flaky_flips_per_100_snapshots']:.1f}")
+
+    df = pd.DataFrame(trend).set_index("day")
+    st.line_chart(df[["ready_share", "draft_share", "failing_checks_share", "conflict_share"]])
+    st.bar_chart(df["avg_open_prs"])
+
+def render_pr_report(report_data, label):
+    """Display summary metrics and per-PR status for a report dict"""
+    st.success(f"📊 Latest report: {label}")
     
-    # Get the most recent report
-    latest_report = max(report_files, key=lambda f: f.stat().st_mtime)
+    # Display summary
+    summary = report_data.get("summary", {})
     
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total PRs", summary.get("total_prs", 0))
+    with col2:
+        st.metric("Ready to Merge", summary.get("ready_count", 0), 
+                 delta=None, delta_color="normal")
+    with col3:
+        st.metric("Need Attention", summary.get("needs_attention_count", 0),
+                 delta=None, delta_color="inverse")
+    
+    # Show ready PRs
+    ready_prs = report_data.get("ready_to_merge", [])
+    if ready_prs:
+        st.subheader("✅ Ready to Merge")
+        for pr in ready_prs:
+            st.success(f"PR #{pr['pr_number']}: {pr['title']} (by {pr['author']})")
+    
+    # Show PRs needing attention
+    needs_attention = report_data.get("needs_attention", [])
+    if needs_attention:
+        st.subheader("⚠️ Needs Attention")
+        for pr in needs_attention:
+            st.markdown(f"**PR #{pr['pr_number']}: {pr['title']}**")
+            st.write(f"**Author:** {pr['author']} · **Updated:** {pr['updated_at']}")
+            if pr.get('blocking_factors'):
+                st.write("**Blocking factors:** " + ", ".join(pr['blocking_factors']))
+
+def show_performance():
+    """Display the slowest recorded timing spans"""
+    st.header("⏱️ Performance")
+
     try:
-        import json
-        with open(latest_report, 'r') as f:
-            report_data = json.load(f)
-        
-        st.success(f"📊 Latest report: {latest_report.name}")
-        
-        # Display summary
-        summary = report_data.get("summary", {})
-        
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Total PRs", summary.get("total_prs", 0))
-        with col2:
-            st.metric("Ready to Merge", summary.get("ready_count", 0), 
-                     delta=None, delta_color="normal")
-        with col3:
-            st.metric("Need Attention", summary.get("needs_attention_count", 0),
-                     delta=None, delta_color="inverse")
-        
-        # Show ready PRs
-        ready_prs = report_data.get("ready_to_merge", [])
-        if ready_prs:
-            st.subheader("✅ Ready to Merge")
-            for pr in ready_prs:
-                st.success(f"PR #{pr['pr_number']}: {pr['title']} (by {pr['author']})")
-        
-        # Show PRs needing attention
-        needs_attention = report_data.get("needs_attention", [])
-        if needs_attention:
-            st.subheader("⚠️ Needs Attention")
-            for pr in needs_attention:
-                with st.expander(f"PR #{pr['pr_number']}: {pr['title']}"):
-                    st.write(f"**Author:** {pr['author']}")
-                    st.write(f"**Updated:** {pr['updated_at']}")
-                    if pr.get('blocking_factors'):
-                        st.write("**Blocking factors:**")
-                        for factor in pr['blocking_factors']:
-                            st.write(f"• {factor}")
-    
-    except Exception as e:
-        st.error(f"❌ Error reading report: {str(e)}")
+        import pandas as pd
+
+        from src import tracing
+    except Exception:
+        st.error("❌ Tracing module not available")
+        return
+
+    # The span buffer is process-wide: it holds spans from every browser session
+    source = "This process"
+    if tracing.TRACE_FILE:
+        source = st.radio("Span source", ["This process", f"Trace file ({tracing.TRACE_FILE})"],
+                          horizontal=True)
+    if source == "This process":
+        spans = [s.to_dict() for s in tracing.recent_spans()]
+    else:
+        spans = tracing.load_trace_file()
+
+    if not spans:
+        st.info("No spans recorded yet. Run a search, bulk preview or submission first.")
+        return
+
+    df = pd.DataFrame(spans)
+    summary = pd.DataFrame(tracing.summarize_spans(spans)).set_index("name").round(2)
+    st.subheader("By operation")
+    st.dataframe(summary, width="stretch")
+
+    limit = st.slider("Slowest spans to show", 10, 200, 25)
+    slowest = df.nlargest(limit, "duration_ms").copy()
+    slowest["started"] = pd.to_datetime(slowest["start_ns"], unit="ns")
+    slowest["duration_ms"] = slowest["duration_ms"].round(2)
+    slowest["attributes"] = slowest["attributes"].apply(
+        lambda a: ", ".join(f"{k}={v}" for k, v in a.items()))
+    st.subheader("Slowest spans")
+    st.dataframe(
+        slowest[["started", "name", "duration_ms", "status", "attributes", "trace_id"]],
+        width="stretch", hide_index=True,
+    )
+
+    if source == "This process" and st.button("Clear recorded spans"):
+        tracing.clear_spans()
+        st.rerun()
+
+    show_query_profile()
+
+def show_query_profile():
+    """SQL fingerprints, slow queries and N+1 findings from the query profiler"""
+    import pandas as pd
+
+    from src.query_profiler import get_profiler
+
+    profiler = get_profiler()
+    st.subheader("SQL queries")
+    if profiler is None:
+        st.caption("Set JOB_O_MATIC_QUERY_PROFILE=true to record query timings and N+1 patterns.")
+        return
+
+    n_plus_one = profiler.n_plus_one_findings()
+    if n_plus_one:
+        st.warning(f"⚠️ {len(n_plus_one)} possible N+1 query pattern(s)")
+        st.dataframe(pd.DataFrame(n_plus_one), width="stretch", hide_index=True)
+
+    fingerprints = profiler.top_fingerprints()
+    if fingerprints:
+        st.dataframe(
+            pd.DataFrame(fingerprints)[["fingerprint", "kind", "count", "total_ms", "mean_ms", "max_ms", "rows"]].round(2),
+            width="stretch", hide_index=True,
+        )
+    for q in profiler.slow_queries():
+        with st.expander(f"{q['duration_ms']:.1f} ms — {q['fingerprint'][:90]}"):
+            st.code(q["statement"], language="sql")
+            if q["plan"]:
+                st.text(q["plan"])
 
 def show_help():
     """Display help and documentation"""
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Load test for the Greenhouse/Lever submit pipeline.
+
+Runs SubmitExecutor + JobApplicationSubmitter against the local mock ATS
+server (started in-process unless --url is given) and reports throughput,
+latency percentiles and retry counts.
+
+Example:
+    python3 scripts/load_test_submitters.py --jobs 500 --concurrency 8 \
+        --latency-ms 80 --rate-limit 50 --fail-rate 0.02
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.auto_submit import JobApplicationSubmitter  # noqa: E402
+from src.db import init_db  # noqa: E402
+from src.mock_ats import MockATSConfig, start_mock_ats  # noqa: E402
+from src.submission_ledger import SubmissionLedger  # noqa: E402
+from src.submit_executor import RateLimiter, SubmitExecutor  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def synthetic_jobs(n, cv_dir):
+    jobs = []
+    for i in range(n):
+        if i % 2 == 0:
+            url = f"https://boards.greenhouse.io/loadtest/jobs/{1000000 + i}"
+        else:
+            url = f"https://jobs.lever.co/loadtest/{uuid.UUID(int=i)}"
+        jobs.append({"id": i + 1, "company": "LoadTest", "title": f"Role {i}",
+                     "status": "APPROVED", "apply_url": url, "output_dir": str(cv_dir)})
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the submit pipeline against a mock ATS")
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4, help="per-platform concurrency cap")
+    parser.add_argument("--client-rate", type=float, default=0.0,
+                        help="shared client rate limit (req/s), 0 = unlimited")
+    parser.add_argument("--url", default=None, help="use an already running mock server")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="server-side req/s limit")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=0.2)
+    parser.add_argument("--cv-kb", type=int, default=1, help="size of the synthetic CV attached to each job")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server = start_mock_ats(MockATSConfig(latency_ms=args.latency_ms, rate_limit=args.rate_limit,
+                                              burst=args.concurrency, fail_rate=args.fail_rate,
+                                              retry_after=args.retry_after, seed=args.seed))
+        base_url = server.base_url
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        bundle = tmp_path / "bundle"
+        bundle.mkdir()
+        (bundle / "email_body.txt").write_text("Load test cover letter", encoding="utf-8")
+        # The submitter refuses bundles without a CV, so always attach one
+        (bundle / "cv_loadtest.pdf").write_bytes(b"x" * (max(1, args.cv_kb) * 1024))
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}", future=True,
+                               connect_args={"timeout": 30, "check_same_thread": False})
+        init_db(engine)
+        ledger = SubmissionLedger(sessionmaker(bind=engine, future=True))
+        submitter = JobApplicationSubmitter(ledger=ledger, greenhouse_api_base=base_url,
+                                            lever_api_base=base_url)
+        executor = SubmitExecutor(
+            submitter,
+            platform_concurrency={"greenhouse": args.concurrency, "lever": args.concurrency},
+            rate_limiter=RateLimiter(args.client_rate),
+            on_success=lambda row: None,
+        )
+
+        jobs = synthetic_jobs(args.jobs, bundle)
+        candidate = {"first_name": "Load", "last_name": "Test", "email": "load@test.invalid"}
+        api_keys = {"greenhouse": "test", "lever": "test"}
+
+        started = time.perf_counter()
+        results = executor.run(jobs, candidate, api_keys)
+        wall = time.perf_counter() - started
+        ledger_stats = ledger.stats()
+
+    latencies = [r["elapsed_ms"] for r in results if "elapsed_ms" in r]
+    ok = sum(1 for r in results if r["success"])
+    retries = sum(r["retries"] for r in results)
+
+    print("=" * 60)
+    print(f"Jobs:            {len(results)}  (ok {ok}, failed {len(results) - ok})")
+    print(f"Wall time:       {wall:.2f}s")
+    print(f"Throughput:      {len(results) / wall if wall else 0:.1f} submissions/sec")
+    print(f"Latency p50:     {percentile(latencies, 50):.1f} ms")
+    print(f"Latency p95:     {percentile(latencies, 95):.1f} ms")
+    print(f"Latency p99:     {percentile(latencies, 99):.1f} ms")
+    print(f"Latency mean:    {statistics.fmean(latencies) if latencies else 0:.1f} ms")
+    print(f"429 retries:     {retries}")
+    for platform, s in sorted(ledger_stats.items()):
+        print(f"{platform:<16} {s['successes']}/{s['submissions']} ok, "
+              f"avg {s['avg_latency_ms'] or 0:.1f} ms")
+    if server:
+        print(f"Server stats:    {server.stats}")
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,18 @@
-import json
+import sys
 from pathlib import Path
 
-p = Path(__file__).resolve().parents[1] / "data" / "imports" / "sample_jobs.json"
-if not p.exists():
-    print("No sample jobs found at", p)
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.ndjson_store import NDJSONReader  # noqa: E402
+
+reader = NDJSONReader(ROOT / "data" / "imports", prefix="search")
+if not reader.segments():
+    print("No search logs found in", reader.directory)
     raise SystemExit(1)
 
-jobs = json.loads(p.read_text())
-print(f"Loaded {len(jobs)} sample jobs:\n")
-for j in jobs:
-    print(f"[{j['id']}] {j['title']} @ {j['company']} ({j['location']}) - {j['status']}")
-    print("   ", j['description'])
+print(f"Loaded {len(reader)} jobs from {len(reader.segments())} search log segments:\n")
+for j in reader.iter_from(0):
+    print(f"[{j.get('id')}] {j.get('title')} @ {j.get('company')} ({j.get('location') or 'n/a'})")
+    print("   ", j.get("description_snippet") or j.get("description") or "")
     print()
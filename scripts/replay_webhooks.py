@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Replay recorded GitHub webhook deliveries.
+
+Each fixture is a JSON file {"event": "<X-GitHub-Event>", "payload": {...}}.
+Directories are replayed in file-name order. By default events are applied
+in-process to the local database. With --url they are signed and POSTed to
+a running receiver (src/pr_webhooks.py) instead.
+
+    python scripts/replay_webhooks.py tests/fixtures/webhooks
+    python scripts/replay_webhooks.py tests/fixtures/webhooks --url http://127.0.0.1:9010/ --secret s3cret
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.pr_webhooks import apply_event, sign  # noqa: E402
+
+
+def iter_fixtures(paths):
+    for path in map(Path, paths):
+        files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+        for f in files:
+            fixture = json.loads(f.read_text())
+            yield f.name, fixture["event"], fixture["payload"]
+
+
+def post(url, secret, event, payload):
+    import requests
+
+    body = json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json", "X-GitHub-Event": event,
+               "X-Hub-Signature-256": sign(secret, body)}
+    response = requests.post(url, data=body, headers=headers, timeout=30)
+    return f"{response.status_code} {response.text}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded webhook fixtures")
+    parser.add_argument("paths", nargs="+", help="fixture files or directories")
+    parser.add_argument("--url", help="POST to a running receiver instead of applying in-process")
+    parser.add_argument("--secret", default=os.getenv("PR_WEBHOOK_SECRET", ""), help="signing secret for --url")
+    args = parser.parse_args(argv)
+
+    if args.url and not args.secret:
+        parser.error("--url needs --secret or PR_WEBHOOK_SECRET")
+
+    for name, event, payload in iter_fixtures(args.paths):
+        if args.url:
+            result = post(args.url, args.secret, event, payload)
+        else:
+            result = f"updated PRs {apply_event(event, payload)}"
+        print(f"{name} ({event}): {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Streaming file helpers for CV uploads and downloads.
+
+`MultipartStream` builds a multipart/form-data request body that reads the
+resume from disk in small chunks while requests sends it, so a large PDF is
+never loaded into memory. Its length is known up front, so requests sends a
+normal Content-Length instead of chunked encoding.
+"""
+
+import io
+import mimetypes
+import os
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Dict, Generator, Iterator, Optional, Union
+
+CHUNK_SIZE = 64 * 1024
+
+FileSpec = Union[str, Path, tuple]
+
+
+def _flatten_fields(fields: Dict, prefix: str = ""):
+    """Yield (name, value) pairs, encoding nested dicts as name[key]."""
+    for key, value in fields.items():
+        name = f"{prefix}[{key}]" if prefix else str(key)
+        if isinstance(value, dict):
+            yield from _flatten_fields(value, name)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                yield f"{name}[]", item
+        elif value is not None:
+            if isinstance(value, bool):
+                value = "true" if value else "false"
+            yield name, value
+
+
+class MultipartStream:
+    """File-like multipart/form-data body that streams files from disk.
+
+    fields: plain form fields (nested dicts become name[key]).
+    files: {field: path} or {field: (filename, path[, content_type])}.
+    """
+
+    def __init__(self, fields: Optional[Dict] = None, files: Optional[Dict[str, FileSpec]] = None,
+                 boundary: Optional[str] = None, chunk_size: int = CHUNK_SIZE):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self._fields = [
+            (n, str(v).encode("utf-8")) for n, v in _flatten_fields(fields or {})
+        ]
+        self._files = []
+        for field, spec in (files or {}).items():
+            if isinstance(spec, tuple):
+                filename, path = spec[0], Path(spec[1])
+                content_type = spec[2] if len(spec) > 2 else None
+            else:
+                path = Path(spec)
+                filename, content_type = path.name, None
+            content_type = content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            self._files.append((field, filename, path, content_type, os.path.getsize(path)))
+        self._parts = self._iter_parts()
+        self._buffer = b""
+        self._open_file: Optional[BinaryIO] = None
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def _field_header(self, name: str) -> bytes:
+        return (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+        ).encode("utf-8")
+
+    def _file_header(self, field: str, filename: str, content_type: str) -> bytes:
+        return (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode("utf-8")
+
+    def _closing(self) -> bytes:
+        return f"--{self.boundary}--\r\n".encode("utf-8")
+
+    def __len__(self) -> int:
+        total = len(self._closing())
+        for name, value in self._fields:
+            total += len(self._field_header(name)) + len(value) + 2
+        for field, filename, _, content_type, size in self._files:
+            total += len(self._file_header(field, filename, content_type)) + size + 2
+        return total
+
+    def _iter_parts(self) -> Generator[bytes, None, None]:
+        for name, value in self._fields:
+            yield self._field_header(name) + value + b"\r\n"
+        for field, filename, path, content_type, _ in self._files:
+            yield self._file_header(field, filename, content_type)
+            fh = self._open_file = open(path, "rb")
+            try:
+                while True:
+                    chunk = fh.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                fh.close()
+                self._open_file = None
+            yield b"\r\n"
+        yield self._closing()
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            data = self._buffer + b"".join(self._parts)
+            self._buffer = b""
+            return data
+        while len(self._buffer) < size:
+            try:
+                self._buffer += next(self._parts)
+            except StopIteration:
+                break
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self) -> None:
+        """Release any open file handle, even if the body was not fully sent."""
+        self._parts.close()
+        if self._open_file is not None:
+            self._open_file.close()
+            self._open_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_file_chunks(path, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file's bytes in chunks; the handle is closed when iteration ends."""
+    with open(path, "rb") as fh:
+        while True:
+            chunk = fh.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class ChunkedFileReader(io.RawIOBase):
+    """Raw, read-only view of a file that is opened on first read and read in chunks.
+
+    The handle is closed as soon as the end of the file is reached, so a
+    reader that is never drained to the end still gets it released by close().
+    """
+
+    def __init__(self, path, chunk_size: int = CHUNK_SIZE):
+        super().__init__()
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self._fh: Optional[io.BufferedReader] = None
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence != os.SEEK_SET:
+            raise io.UnsupportedOperation("only absolute seeks are supported")
+        if self._fh is not None:
+            self._fh.seek(offset)
+        self._pos = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        if self._fh is None:
+            if self.closed:
+                raise ValueError("I/O operation on closed file")
+            self._fh = open(self.path, "rb")
+            self._fh.seek(self._pos)
+        view = memoryview(buffer)[: self.chunk_size]
+        n = self._fh.readinto(view)
+        self._pos += n
+        if not n:
+            self._release()
+        return n
+
+    def _release(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def close(self) -> None:
+        self._release()
+        super().close()
+
+
+def deferred_file(path, chunk_size: int = CHUNK_SIZE):
+    """Return a callable for `st.download_button(data=...)`.
+
+    Streamlit only invokes it when the user clicks Download, so reruns never
+    touch the CV. The callable hands back a `ChunkedFileReader` instead of the
+    file's bytes, so the file is read in `chunk_size` pieces and closed when
+    Streamlit reaches the end of it.
+    """
+    def _load() -> ChunkedFileReader:
+        return ChunkedFileReader(path, chunk_size)
+
+    return _load
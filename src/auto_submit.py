@@ -0,0 +1,305 @@
+"""Greenhouse/Lever application submission with safeguards."""
+
+import base64
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from src import metrics
+from src.apply.streaming import MultipartStream
+from src.platforms import classify_url, parse_job_url
+from src.tracing import span, traced
+
+
+GREENHOUSE_API_BASE = os.getenv("GREENHOUSE_API_BASE", "https://boards-api.greenhouse.io")
+LEVER_API_BASE = os.getenv("LEVER_API_BASE", "https://api.lever.co")
+
+
+class RateLimited(Exception):
+    """Raised when a platform answers 429; carries the Retry-After delay if given."""
+
+    def __init__(self, platform: str, retry_after: Optional[float] = None):
+        super().__init__(f"Rate limited by {platform}")
+        self.platform = platform
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        from datetime import datetime, timezone
+        from email.utils import parsedate_to_datetime
+
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except Exception:
+        return None
+
+
+def request_never_sent(exc: Exception) -> bool:
+    """True if `exc` means the connection was never made, so the ATS cannot have the application.
+
+    Read timeouts and connections dropped mid-request are ambiguous: the
+    application may have been received even though no response came back.
+    """
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(exc, requests.exceptions.ConnectionError):
+        from urllib3.exceptions import NewConnectionError
+
+        reason = exc.args[0] if exc.args else None
+        return isinstance(reason, NewConnectionError) or isinstance(getattr(reason, "reason", None), NewConnectionError)
+    return False
+
+
+def find_bundle_cv(output_path: Path) -> Optional[str]:
+    """Return the CV to upload for a preview bundle, or None if there is none.
+
+    Bulk preview copies the chosen CV into the bundle as cv_<variant>.pdf/.docx;
+    older bundles only name the variant file in cv_variant.txt.
+    """
+    cv_files = sorted(output_path.glob("cv_*.pdf")) or sorted(output_path.glob("cv_*.docx"))
+    if cv_files:
+        return str(cv_files[0])
+    variant_txt = output_path / "cv_variant.txt"
+    if not variant_txt.exists():
+        return None
+    lines = variant_txt.read_text(encoding="utf-8").splitlines()
+    if len(lines) < 2 or not lines[1].strip():
+        return None
+    from src.cv_corpus import CV_DIR
+
+    cv_path = Path(lines[1].strip())
+    if not cv_path.is_absolute():
+        cv_path = CV_DIR / cv_path
+    return str(cv_path) if cv_path.is_file() else None
+
+
+class JobApplicationSubmitter:
+    """Handle automated job application submissions with proper safeguards"""
+
+    def __init__(self, session=None, ledger=None, greenhouse_api_base=None, lever_api_base=None):
+        self.supported_platforms = ("greenhouse", "lever")
+        self.greenhouse_api_base = (greenhouse_api_base or GREENHOUSE_API_BASE).rstrip("/")
+        self.lever_api_base = (lever_api_base or LEVER_API_BASE).rstrip("/")
+        # requests.Session is safe to share across the executor's worker threads
+        # for simple POSTs and reuses pooled connections.
+        self.session = session or requests.Session()
+        self._ledger = ledger
+
+    @property
+    def ledger(self):
+        if self._ledger is None:
+            from src.submission_ledger import SubmissionLedger
+
+            self._ledger = SubmissionLedger()
+        return self._ledger
+
+    def detect_platform(self, apply_url: str) -> Optional[str]:
+        """Detect if URL is from supported platforms"""
+        platform = classify_url(apply_url or "")
+        return platform if platform in self.supported_platforms else None
+
+    def _send(self, platform: str, job_id, apply_url: str, api_url: str, payload: Dict,
+              candidate_data: Dict, cv_file_path: Optional[str] = None,
+              headers: Optional[Dict] = None, as_json: bool = False) -> Tuple[bool, str]:
+        """POST one application, guarded by the submission ledger."""
+        from src.submission_ledger import STATUS_IN_FLIGHT, idempotency_key, request_hash
+
+        key = idempotency_key(platform, apply_url, candidate_data)
+        claimed, reason = self.ledger.claim(key, job_id, platform, request_hash(payload, cv_file_path))
+        if not claimed:
+            metrics.SUBMISSIONS.labels(platform=platform, outcome="deduplicated").inc()
+            return reason == "Already submitted", reason
+
+        started = time.perf_counter()
+        status: Optional[int] = 0  # STATUS_IN_FLIGHT (None) when the outcome is unknown
+        outcome = "error"
+        posting = False
+        try:
+            with span("submit.http", platform=platform) as sp:
+                if cv_file_path:
+                    # Stream the CV from disk; the handle is released even on errors.
+                    with MultipartStream(payload, {"resume": cv_file_path}) as body:
+                        posting = True
+                        response = self.session.post(
+                            api_url,
+                            data=body,
+                            headers={**(headers or {}), "Content-Type": body.content_type},
+                            timeout=30,
+                        )
+                elif as_json:
+                    posting = True
+                    response = self.session.post(api_url, json=payload, headers=headers, timeout=30)
+                else:
+                    posting = True
+                    response = self.session.post(api_url, data=payload, headers=headers, timeout=30)
+                status = response.status_code
+                if sp:
+                    sp.set_attribute("http.status_code", status)
+
+            if status in [200, 201]:
+                outcome = "success"
+                result = (True, "Application submitted successfully")
+            elif status == 429:
+                outcome = "rate_limited"
+                raise RateLimited(platform, parse_retry_after(response.headers.get("Retry-After")))
+            else:
+                outcome = "failed"
+                result = (False, f"Submission failed: {status} - {response.text}")
+            message = result[1]
+            return result
+        except RateLimited as e:
+            message = str(e)
+            raise
+        except Exception as e:
+            if posting and not request_never_sent(e):
+                # The ATS may have received it: keep the key claimed so it is never auto-resent
+                status = STATUS_IN_FLIGHT
+                outcome = "unconfirmed"
+                message = f"Submission unconfirmed ({type(e).__name__}) - check the platform before retrying"
+            else:
+                message = f"Error submitting application: {str(e)}"
+            return False, message
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.SUBMISSIONS.labels(platform=platform, outcome=outcome).inc()
+            metrics.SUBMIT_LATENCY.labels(platform=platform).observe(elapsed)
+            self.ledger.record(key, status, int(elapsed * 1000), message)
+
+    @traced("submit.greenhouse")
+    def submit_greenhouse_application(self,
+                                      apply_url: str,
+                                      api_key: str,
+                                      candidate_data: Dict,
+                                      cv_file_path: Optional[str] = None,
+                                      cover_letter_text: Optional[str] = None,
+                                      job_id: Optional[int] = None,
+                                      board_token: Optional[str] = None,
+                                      posting_id: Optional[str] = None) -> Tuple[bool, str]:
+        """Submit application to Greenhouse job posting.
+
+        board_token/posting_id come from the jobs table when available;
+        otherwise they are parsed from apply_url.
+        Already-sent applications (per the submission ledger) are not resent.
+        Raises RateLimited on HTTP 429 so callers can back off and retry.
+        """
+        try:
+            if not (board_token and posting_id):
+                ref = parse_job_url(apply_url)
+                if ref is None or ref.platform != "greenhouse":
+                    return False, "Unrecognised Greenhouse job URL"
+                board_token, posting_id = ref.board_token, ref.posting_id
+
+            api_url = f"{self.greenhouse_api_base}/v1/boards/{board_token}/jobs/{posting_id}"
+
+            auth_string = base64.b64encode(f"{api_key}:".encode()).decode()
+            headers = {"Authorization": f"Basic {auth_string}"}
+
+            payload = {
+                "first_name": candidate_data.get("first_name", ""),
+                "last_name": candidate_data.get("last_name", ""),
+                "email": candidate_data.get("email", ""),
+                "phone": candidate_data.get("phone", ""),
+                "data_compliance": {"gdpr_consent_given": True}
+            }
+            if cover_letter_text:
+                payload["cover_letter_text"] = cover_letter_text
+
+            return self._send("greenhouse", job_id, apply_url, api_url, payload, candidate_data,
+                              cv_file_path, headers=headers, as_json=True)
+
+        except RateLimited:
+            raise
+        except Exception as e:
+            return False, f"Error submitting application: {str(e)}"
+
+    @traced("submit.lever")
+    def submit_lever_application(self,
+                                 apply_url: str,
+                                 api_key: str,
+                                 candidate_data: Dict,
+                                 cv_file_path: Optional[str] = None,
+                                 cover_letter_text: Optional[str] = None,
+                                 job_id: Optional[int] = None,
+                                 site: Optional[str] = None,
+                                 posting_id: Optional[str] = None) -> Tuple[bool, str]:
+        """Submit application to Lever job posting.
+
+        site/posting_id come from the jobs table when available; otherwise
+        they are parsed from apply_url.
+        Already-sent applications (per the submission ledger) are not resent.
+        Raises RateLimited on HTTP 429 so callers can back off and retry.
+        """
+        try:
+            if not (site and posting_id):
+                ref = parse_job_url(apply_url)
+                if ref is None or ref.platform != "lever":
+                    return False, "Unrecognised Lever job URL"
+                site, posting_id = ref.board_token, ref.posting_id
+
+            api_url = f"{self.lever_api_base}/v0/postings/{site}/{posting_id}?key={api_key}"
+
+            payload = {
+                "name": f"{candidate_data.get('first_name', '')} {candidate_data.get('last_name', '')}".strip(),
+                "email": candidate_data.get("email", ""),
+                "phone": candidate_data.get("phone", "")
+            }
+            if cover_letter_text:
+                payload["comments"] = cover_letter_text
+
+            return self._send("lever", job_id, apply_url, api_url, payload, candidate_data,
+                              cv_file_path)
+
+        except RateLimited:
+            raise
+        except Exception as e:
+            return False, f"Error submitting application: {str(e)}"
+
+    def auto_submit_with_confirmation(self,
+                                      job_row: Dict,
+                                      candidate_data: Dict,
+                                      output_dir: str,
+                                      api_keys: Dict) -> Tuple[bool, str]:
+        """Auto-submit application with proper confirmation and safeguards"""
+
+        apply_url = job_row["apply_url"]
+        platform = self.detect_platform(apply_url)
+
+        if not platform:
+            return False, "Unsupported platform - manual submission required"
+
+        if not api_keys.get(platform):
+            return False, f"No API key configured for {platform}"
+
+        output_path = Path(output_dir)
+        cv_file_path = find_bundle_cv(output_path)
+        if cv_file_path is None:
+            return False, "No CV found in preview bundle - run Bulk Preview again"
+
+        cover_letter_file = output_path / "email_body.txt"
+        cover_letter_text = cover_letter_file.read_text(encoding="utf-8") if cover_letter_file.exists() else None
+
+        if platform == "greenhouse":
+            return self.submit_greenhouse_application(
+                apply_url, api_keys["greenhouse"], candidate_data, cv_file_path, cover_letter_text,
+                job_id=job_row.get("id"), board_token=job_row.get("board_token"),
+                posting_id=job_row.get("posting_id")
+            )
+        elif platform == "lever":
+            return self.submit_lever_application(
+                apply_url, api_keys["lever"], candidate_data, cv_file_path, cover_letter_text,
+                job_id=job_row.get("id"), site=job_row.get("board_token"),
+                posting_id=job_row.get("posting_id")
+            )
+
+        return False, "Unknown platform error"
@@ -0,0 +1,160 @@
+"""Bulk preview/approve operations over the jobs table."""
+
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+from src.cv_corpus import CV_DIR
+from src.sections import parse_sections, save_sections
+from src.tracing import span, traced
+
+
+def bundle_slug(job_id, company: str, title: str) -> str:
+    """Directory name of a job's preview bundle; the id keeps same-named postings apart."""
+    return f"{job_id}_{company}_{title}".replace(" ", "_").replace("/", "-")
+
+
+def _bundle_dir(job, timestamp: str, out_dir="outputs") -> Path:
+    return Path(out_dir) / timestamp / bundle_slug(job.id, job.company, job.title)
+
+
+def _copy_cv(variant: str, variant_file: str, outdir: Path, cv_dir=CV_DIR):
+    """Copy the chosen CV into the bundle as cv_<variant><ext>; None if the file is missing."""
+    source = Path(variant_file)
+    if not source.is_absolute():
+        source = Path(cv_dir) / source
+    if not source.is_file():
+        return None
+    target = outdir / f"cv_{variant}{source.suffix}".replace(" ", "_").replace("/", "-")
+    shutil.copyfile(source, target)
+    return target
+
+
+@traced("bulk.preview")
+def bulk_preview(job_ids, on_progress=None, force_refresh=False, pick_variant=None, tailor=None,
+                 tailor_cache=None, out_dir="outputs", cv_dir=CV_DIR):
+    """Generate preview packs for multiple jobs without sending.
+
+    Each bundle gets tailored.txt, the email files, a copy of the chosen CV
+    (cv_<variant>.pdf/.docx, from cv_dir) and a sections.json holding every
+    `=== HEADER ===` section, so later steps never re-parse the text. The
+    bundle path is stored on the job as preview_dir for auto-submit.
+    Tailoring goes through the persistent tailor cache; pass force_refresh=True
+    to regenerate content for unchanged jobs.
+
+    pick_variant(job_text) -> (variant, variant_file) and tailor(job_text, variant)
+    -> str are passed in; they default to src.cv_selector and src.tailor when
+    those modules are installed.
+    """
+    try:
+        from sqlalchemy import select
+
+        from src.db import get_session
+        from src.email_templates import build_email
+        from src.models import Job
+        from src.tailor_cache import get_cache
+    except Exception:
+        print("DB helpers not available; ensure src/db.py and src/models.py exist.")
+        return []
+    try:
+        if pick_variant is None:
+            from src.cv_selector import pick_variant
+        if tailor is None:
+            from src.tailor import tailor
+    except ImportError:
+        print("Tailoring helpers not available; pass pick_variant and tailor, or add src/cv_selector.py and src/tailor.py.")
+        return []
+    cache = tailor_cache or get_cache()
+
+    results = []
+    sess = get_session()
+    try:
+        jobs = sess.execute(select(Job).where(Job.id.in_(job_ids))).scalars().all()
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+
+        for i, job in enumerate(jobs):
+            try:
+                job_text = job.description or f"{job.company} {job.title}"
+                with span("bulk.preview.pick_variant", job_id=job.id):
+                    variant, variant_file = pick_variant(job_text)
+                with span("bulk.preview.tailor", job_id=job.id, variant=variant):
+                    tailored_content = cache.get_or_compute(
+                        job_text, variant, lambda: tailor(job_text, variant), force_refresh=force_refresh
+                    )
+
+                with span("bulk.preview.build_email", job_id=job.id):
+                    sections = parse_sections(tailored_content)
+                    subject, body = build_email(
+                        job.company, job.title, sections.get("COVER_PARAGRAPH", "")
+                    )
+
+                with span("bulk.preview.write_bundle", job_id=job.id):
+                    outdir = _bundle_dir(job, timestamp, out_dir)
+                    outdir.mkdir(parents=True, exist_ok=True)
+                    (outdir / "tailored.txt").write_text(tailored_content, encoding="utf-8")
+                    save_sections(outdir, sections)
+                    (outdir / "email_subject.txt").write_text(subject, encoding="utf-8")
+                    (outdir / "email_body.txt").write_text(body, encoding="utf-8")
+                    (outdir / "cv_variant.txt").write_text(f"{variant}\n{variant_file}", encoding="utf-8")
+                    cv_copy = _copy_cv(variant, variant_file, outdir, cv_dir)
+                    (outdir / "job_info.txt").write_text(
+                        f"Company: {job.company}\nTitle: {job.title}\nURL: {job.apply_url}",
+                        encoding="utf-8",
+                    )
+
+                job.status = "PREVIEW_READY"
+                job.preview_dir = str(outdir)
+                results.append(
+                    {
+                        "job_id": job.id,
+                        "company": job.company,
+                        "title": job.title,
+                        "variant": variant,
+                        "output_dir": str(outdir),
+                        "cv_file": str(cv_copy) if cv_copy else None,
+                        "status": "success",
+                    }
+                )
+                if on_progress:
+                    on_progress(i + 1, len(jobs), job, str(outdir))
+            except Exception as e:
+                results.append({"job_id": job.id, "status": "error", "error": str(e)})
+
+        sess.commit()
+    except Exception as e:
+        print("Error during bulk preview:", e)
+        sess.rollback()
+    finally:
+        sess.close()
+
+    return results
+
+
+@traced("bulk.approve")
+def bulk_approve(job_ids):
+    """Mark selected jobs as approved after human review"""
+    try:
+        from sqlalchemy import select
+
+        from src.db import get_session
+        from src.models import Job
+    except Exception:
+        print("DB helpers not available; ensure src/db.py and src/models.py exist.")
+        return 0
+
+    count = 0
+    sess = get_session()
+    try:
+        jobs = sess.execute(select(Job).where(Job.id.in_(job_ids))).scalars().all()
+        for job in jobs:
+            if job.status == "PREVIEW_READY":
+                job.status = "APPROVED"
+                count += 1
+        sess.commit()
+    except Exception as e:
+        print("Error approving jobs:", e)
+        sess.rollback()
+    finally:
+        sess.close()
+
+    return count
@@ -0,0 +1,52 @@
+"""Load the CV variants in data/cv/ into memory once.
+
+Text is extracted from .txt/.md directly and from .docx via python-docx
+(imported only when a .docx is present). PDFs are listed without text.
+`corpus_signature()` changes whenever a file is added, removed or edited, so
+callers can key a cache on it.
+"""
+
+from pathlib import Path
+from typing import Dict, Tuple
+
+CV_DIR = Path("data/cv")
+TEXT_SUFFIXES = (".txt", ".md")
+
+
+def corpus_signature(cv_dir=CV_DIR) -> Tuple:
+    """(name, size, mtime_ns) for every CV file; cheap enough to call on each rerun."""
+    cv_dir = Path(cv_dir)
+    if not cv_dir.exists():
+        return ()
+    return tuple(sorted((p.name, st.st_size, st.st_mtime_ns)
+                        for p in cv_dir.iterdir() if p.is_file()
+                        for st in (p.stat(),)))
+
+
+def _read_text(path: Path) -> str:
+    suffix = path.suffix.lower()
+    if suffix in TEXT_SUFFIXES:
+        return path.read_text(encoding="utf-8", errors="replace")
+    if suffix == ".docx":
+        try:
+            import docx
+        except ImportError:
+            return ""
+        return "\n".join(p.text for p in docx.Document(str(path)).paragraphs)
+    return ""
+
+
+def load_cv_corpus(cv_dir=CV_DIR) -> Dict[str, dict]:
+    """Map file name -> {"path", "size", "text"} for every CV file."""
+    cv_dir = Path(cv_dir)
+    corpus: Dict[str, dict] = {}
+    if not cv_dir.exists():
+        return corpus
+    for path in sorted(p for p in cv_dir.iterdir() if p.is_file()):
+        try:
+            text = _read_text(path)
+        except Exception as e:
+            print(f"Could not read CV {path.name}:", e)
+            text = ""
+        corpus[path.name] = {"path": path, "size": path.stat().st_size, "text": text}
+    return corpus
@@ -1,5 +1,6 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker
+from pathlib import Path
 import os
 
 DATABASE_URL = os.getenv("JOB_O_MATIC_DATABASE_URL", "sqlite:///data/jobs.db")
@@ -10,3 +11,48 @@ SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, futu
 
 def get_session():
     return SessionLocal()
+
+
+def enable_query_profiler(bind=None, **kwargs):
+    """Attach the SQL profiler (timings, slow-query plans, N+1 detection) to an engine."""
+    from src.query_profiler import enable
+
+    return enable(bind or engine, **kwargs)
+
+
+if os.getenv("JOB_O_MATIC_QUERY_PROFILE", "false").lower() in ("1", "true", "yes"):
+    enable_query_profiler()
+
+
+def init_db(bind=None):
+    """Create any missing tables (and the SQLite data directory)."""
+    from src.models import Base
+
+    bind = bind or engine
+    if bind.url.get_backend_name() == "sqlite" and bind.url.database not in (None, "", ":memory:"):
+        Path(bind.url.database).parent.mkdir(parents=True, exist_ok=True)
+    Base.metadata.create_all(bind)
+    _add_missing_columns(bind, Base.metadata)
+
+
+def _add_missing_columns(bind, metadata):
+    """Add nullable columns and indexes that older databases lack.
+
+    create_all only creates missing tables, so columns and indexes added to
+    existing models later would otherwise be absent from a user's jobs.db.
+    """
+    insp = inspect(bind)
+    with bind.begin() as conn:
+        for table in metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                col_type = column.type.compile(dialect=bind.dialect)
+                conn.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}')
+            existing_indexes = {i["name"] for i in insp.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn, checkfirst=True)
@@ -0,0 +1,165 @@
+"""Email and cover-letter templates.
+
+Templates live in `data/templates/` (email_template.txt, cover_letter_template.txt)
+and use `string.Template` placeholders such as `$company` and `${title}`.
+Each file is read and compiled once; the cache is refreshed only when the
+file's mtime changes, so batch rendering never touches the filesystem per job.
+"""
+
+import os
+import time
+from pathlib import Path
+from string import Template
+from typing import Dict
+
+TEMPLATES_DIR = Path(os.getenv("JOB_O_MATIC_TEMPLATES_DIR", "data/templates"))
+
+# How often (seconds) to stat template files for changes.
+WATCH_INTERVAL = 2.0
+
+DEFAULT_TEMPLATES = {
+    "email_template.txt": """Subject: Application for $title at $company
+
+Dear Hiring Team at $company,
+
+$cover_paragraph
+
+I have attached my CV and would welcome the chance to discuss the $title role.
+
+Kind regards,
+$candidate_name
+""",
+    "cover_letter_template.txt": """Dear Hiring Manager,
+
+I am writing to apply for the $title position at $company.
+
+$cover_paragraph
+
+Thank you for your time and consideration.
+
+Yours sincerely,
+$candidate_name
+""",
+}
+
+
+class TemplateStore:
+    """Load, compile and cache templates, reloading them when files change."""
+
+    def __init__(self, templates_dir=None, watch_interval: float = WATCH_INTERVAL):
+        self.templates_dir = Path(templates_dir) if templates_dir else TEMPLATES_DIR
+        self.watch_interval = watch_interval
+        # name -> (mtime or None for built-in default, compiled parts)
+        self._compiled: Dict[str, tuple] = {}
+        self._last_check: Dict[str, float] = {}
+
+    def _compile(self, text: str):
+        subject = None
+        if text.startswith("Subject:"):
+            first, _, text = text.partition("\n")
+            subject = Template(first[len("Subject:"):].strip())
+            text = text.lstrip("\n")
+        return subject, Template(text)
+
+    def _load(self, name: str):
+        path = self.templates_dir / name
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            mtime = None
+        cached = self._compiled.get(name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        if mtime is not None:
+            text = path.read_text(encoding="utf-8")
+        elif name in DEFAULT_TEMPLATES:
+            text = DEFAULT_TEMPLATES[name]
+        else:
+            raise FileNotFoundError(f"Template not found: {path}")
+        compiled = self._compile(text)
+        self._compiled[name] = (mtime, compiled)
+        return compiled
+
+    def get(self, name: str):
+        """Return the compiled (subject, body) templates for `name`."""
+        now = time.monotonic()
+        if name in self._compiled and now - self._last_check.get(name, 0) < self.watch_interval:
+            return self._compiled[name][1]
+        self._last_check[name] = now
+        return self._load(name)
+
+    def render(self, name: str, context: dict):
+        """Render one template; returns (subject, body). Subject is '' if absent."""
+        subject_tpl, body_tpl = self.get(name)
+        subject = subject_tpl.safe_substitute(context) if subject_tpl else ""
+        return subject, body_tpl.safe_substitute(context)
+
+    def render_batch(self, name: str, contexts) -> list:
+        """Render many contexts against one compiled template without re-reading files."""
+        subject_tpl, body_tpl = self.get(name)
+        if subject_tpl is None:
+            return [("", body_tpl.safe_substitute(c)) for c in contexts]
+        return [(subject_tpl.safe_substitute(c), body_tpl.safe_substitute(c)) for c in contexts]
+
+    def write_defaults(self) -> None:
+        """Write the built-in templates to disk if they are not there yet."""
+        self.templates_dir.mkdir(parents=True, exist_ok=True)
+        for name, text in DEFAULT_TEMPLATES.items():
+            path = self.templates_dir / name
+            if not path.exists():
+                path.write_text(text, encoding="utf-8")
+
+
+_store = None
+
+
+def get_store() -> TemplateStore:
+    global _store
+    if _store is None:
+        _store = TemplateStore()
+    return _store
+
+
+def _candidate_name() -> str:
+    first = os.getenv("CANDIDATE_FIRST_NAME", "")
+    last = os.getenv("CANDIDATE_LAST_NAME", "")
+    return f"{first} {last}".strip()
+
+
+def _context(company: str, title: str, cover_paragraph: str) -> dict:
+    return {
+        "company": company or "",
+        "title": title or "",
+        "cover_paragraph": cover_paragraph or "",
+        "candidate_name": _candidate_name(),
+    }
+
+
+def build_email(company: str, title: str, cover_paragraph: str):
+    """Build (subject, body) for one application email."""
+    return get_store().render("email_template.txt", _context(company, title, cover_paragraph))
+
+
+def build_cover_letter(company: str, title: str, cover_paragraph: str) -> str:
+    """Build the cover letter text for one application."""
+    return get_store().render(
+        "cover_letter_template.txt", _context(company, title, cover_paragraph)
+    )[1]
+
+
+def build_emails(rows) -> list:
+    """Build (subject, body) pairs for many jobs.
+
+    rows: iterable of dicts with company, title and cover_paragraph keys.
+    """
+    candidate_name = _candidate_name()
+    contexts = [
+        {
+            "company": r.get("company") or "",
+            "title": r.get("title") or "",
+            "cover_paragraph": r.get("cover_paragraph") or "",
+            "candidate_name": candidate_name,
+        }
+        for r in rows
+    ]
+    return get_store().render_batch("email_template.txt", contexts)
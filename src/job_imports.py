@@ -0,0 +1,312 @@
+"""Incremental job imports from data/imports/.
+
+NDJSON (`.ndjson`, `.jsonl`) and JSON (`.json`) files are stream-parsed, so
+memory does not grow with file size. Items are normalized and written in
+batches through `bulk_upsert_jobs`. After each batch the file's byte offset and
+a SHA-256 of every byte before it are saved in `import_files`. On later runs:
+
+* an unchanged, fully imported file is skipped without being read;
+* a file whose first `offset` bytes still match the checksum resumes from
+  `offset` (an interrupted import, or an NDJSON file that was appended to);
+* anything else (rewritten or truncated) is imported again from the start.
+
+JSON arrays are streamed item by item. A top-level object is read whole and
+its "jobs", "results" or (possibly nested) "data" list is imported, because an envelope gives no
+safe item boundaries to resume from. An NDJSON line still being written (no
+trailing newline, not yet valid JSON) is left for the next pass.
+
+Usage:
+    python -m src.job_imports            # one pass over data/imports/
+    python -m src.job_imports --watch    # keep polling for new or grown files
+"""
+
+import argparse
+import codecs
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.job_schema import unwrap
+from src.tracing import span
+
+IMPORT_DIR = os.getenv("JOB_O_MATIC_IMPORT_DIR", "data/imports")
+IMPORT_BATCH = int(os.getenv("JOB_O_MATIC_IMPORT_BATCH", "5000"))
+PATTERNS = ("*.json", "*.ndjson", "*.jsonl")
+CHUNK_SIZE = 1 << 16
+
+# Yielded in place of an item that failed to parse; the offset still advances
+INVALID = object()
+
+
+def iter_ndjson(f, start: int = 0) -> Iterator[Tuple[object, int]]:
+    """Yield (item, end_offset) per line of a binary file, from byte `start`.
+
+    Blank lines yield None so their bytes still count as consumed.
+    """
+    f.seek(start)
+    offset = start
+    for line in f:
+        if not line.endswith(b"\n"):
+            try:
+                item = json.loads(line)
+            except ValueError:
+                return  # a line still being written; pick it up next time
+            yield item, offset + len(line)
+            return
+        offset += len(line)
+        if not line.strip():
+            yield None, offset
+            continue
+        try:
+            yield json.loads(line), offset
+        except ValueError:
+            yield INVALID, offset
+
+
+def iter_json_array(f, start: int = 0, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[object, int]]:
+    """Yield (item, end_offset) for each element of a top-level JSON array.
+
+    `start` is 0 or an offset previously yielded by this function. After the
+    closing bracket (and trailing whitespace) one final (None, end) is yielded.
+    A truncated file simply stops early.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    f.seek(start)
+    buf, i, offset = "", 0, start
+    expect = "[" if start == 0 else ","  # "[" | "value" | ","
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, i, eof
+        data = f.read(chunk_size)
+        eof = not data
+        buf = buf[i:] + utf8.decode(data, final=eof)
+        i = 0
+        return not eof
+
+    while True:
+        # Skip whitespace (always single-byte in UTF-8)
+        while True:
+            j = i
+            while j < len(buf) and buf[j] in " \t\r\n":
+                j += 1
+            offset += j - i
+            i = j
+            if i < len(buf) or not fill():
+                break
+        if i >= len(buf):
+            if expect == "done":
+                yield None, offset
+            return
+
+        ch = buf[i]
+        if expect == "done":
+            return  # trailing garbage: leave the offset before it
+        if ch == "]" and expect in ("value", ","):
+            i += 1
+            offset += 1
+            expect = "done"
+            continue
+        if expect == "[":
+            if ch != "[":
+                raise ValueError("not a JSON array")
+            i, offset, expect = i + 1, offset + 1, "value"
+            continue
+        if expect == ",":
+            if ch != ",":
+                raise ValueError(f"expected ',' at byte {offset}")
+            i, offset, expect = i + 1, offset + 1, "value"
+            continue
+
+        try:
+            item, end = decoder.raw_decode(buf, i)
+            complete = end < len(buf) or eof
+        except ValueError:
+            complete = False
+        if not complete:
+            if not fill():
+                return  # truncated mid-item
+            continue
+        offset += len(buf[i:end].encode("utf-8"))
+        i = end
+        expect = ","
+        yield item, offset
+
+
+def _looks_like_ndjson(path: Path) -> bool:
+    with open(path, "rb") as f:
+        first = f.readline()
+        rest = f.read(1024).strip()
+    if not rest:
+        return False
+    try:
+        json.loads(first)
+        return True
+    except ValueError:
+        return False
+
+
+def iter_items(path: Path, f, start: int = 0) -> Iterator[Tuple[object, int]]:
+    """Pick the streaming parser for a file; yields (item, end_offset)"""
+    if path.suffix in (".ndjson", ".jsonl"):
+        return iter_ndjson(f, start)
+    head = f.read(64).lstrip()
+    f.seek(0)
+    if head.startswith(b"["):
+        return iter_json_array(f, start)
+    if _looks_like_ndjson(path):
+        return iter_ndjson(f, start)
+    return _iter_envelope(f)
+
+
+def _iter_envelope(f) -> Iterator[Tuple[object, int]]:
+    doc = json.load(f)
+    end = f.tell()
+    items = unwrap(doc) if isinstance(doc, dict) else [doc]
+    for n, item in enumerate(items, start=1):
+        yield item, end if n == len(items) else 0
+    if not items:
+        yield None, end
+
+
+def _hash_prefix(path: Path, length: int):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while length > 0:
+            data = f.read(min(CHUNK_SIZE, length))
+            if not data:
+                break
+            h.update(data)
+            length -= len(data)
+    return h
+
+
+def import_file(path, batch_size: int = IMPORT_BATCH) -> Dict[str, Any]:
+    """Import one file, skipping or resuming based on its recorded state"""
+    try:
+        from src.db import get_session
+        from src.models import ImportFileState
+        from src.pplx_search import bulk_upsert_jobs, normalize_perplexity_results
+    except Exception:
+        print("DB helpers not available; ensure src/db.py and src/models.py exist.")
+        return {"path": str(path), "status": "error"}
+
+    path = Path(path)
+    key = str(path.resolve())
+    stat = path.stat()
+    sess = get_session()
+    try:
+        state = sess.query(ImportFileState).filter(ImportFileState.path == key).one_or_none()
+        if state is None:
+            state = ImportFileState(path=key, offset=0, items=0, errors=0, completed=False)
+            sess.add(state)
+        elif state.completed and state.size == stat.st_size and state.mtime_ns == stat.st_mtime_ns:
+            return {"path": key, "status": "skipped", "items": 0}
+
+        start, hasher = 0, hashlib.sha256()
+        if state.offset and state.offset <= stat.st_size:
+            prefix = _hash_prefix(path, state.offset)
+            if prefix.hexdigest() == state.prefix_sha256:
+                start, hasher = state.offset, prefix
+        if start == 0:
+            state.offset, state.items, state.errors = 0, 0, 0
+        elif start == stat.st_size and state.completed:
+            state.mtime_ns = stat.st_mtime_ns  # touched, not changed
+            sess.commit()
+            return {"path": key, "status": "skipped", "items": 0}
+        status = "resumed" if start else "imported"
+
+        imported = 0
+        with span("imports.file", path=path.name, start=start), \
+                open(path, "rb") as f, open(path, "rb") as hf:
+            hf.seek(start)
+            batch: List[dict] = []
+            hashed = end = start
+
+            def flush():
+                nonlocal hashed, imported
+                if batch:
+                    bulk_upsert_jobs(normalize_perplexity_results(batch, "import"), batch_size, raise_errors=True)
+                while hashed < end:
+                    data = hf.read(min(CHUNK_SIZE, end - hashed))
+                    hasher.update(data)
+                    hashed += len(data)
+                state.offset = end
+                state.prefix_sha256 = hasher.hexdigest()
+                state.items += len(batch)
+                state.updated_at = datetime.utcnow()
+                imported += len(batch)
+                batch.clear()
+                sess.commit()
+
+            for item, item_end in iter_items(path, f, start):
+                if item is INVALID or (item is not None and not isinstance(item, dict)):
+                    state.errors += 1
+                elif item is not None:
+                    batch.append(item)
+                if item_end >= end:  # envelope items report 0 until the last one
+                    end = item_end
+                if len(batch) >= batch_size:
+                    flush()
+            flush()
+
+        state.size = stat.st_size
+        state.mtime_ns = stat.st_mtime_ns
+        state.completed = state.offset >= stat.st_size
+        sess.commit()
+        if not state.completed:
+            status = "partial"
+        return {"path": key, "status": status, "items": imported, "errors": state.errors, "offset": state.offset}
+    except Exception as e:
+        print(f"Error importing {path}: {e}")
+        sess.rollback()
+        return {"path": key, "status": "error", "error": str(e)}
+    finally:
+        sess.close()
+
+
+def scan_imports(directory=IMPORT_DIR, batch_size: int = IMPORT_BATCH) -> List[Dict[str, Any]]:
+    """Import every new or changed file in `directory` (in name order)"""
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    files = sorted({p for pattern in PATTERNS for p in directory.glob(pattern)})
+    return [import_file(p, batch_size) for p in files if not p.name.startswith(".")]
+
+
+def watch_imports(directory=IMPORT_DIR, interval: float = 5.0, batch_size: int = IMPORT_BATCH,
+                  stop: Optional[threading.Event] = None) -> None:
+    """Poll `directory` and import new or grown files until `stop` is set"""
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        for result in scan_imports(directory, batch_size):
+            if result["status"] != "skipped":
+                print(f"{Path(result['path']).name}: {result['status']} ({result.get('items', 0)} jobs)")
+        stop.wait(interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import job files from data/imports/")
+    parser.add_argument("--dir", default=IMPORT_DIR)
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH)
+    parser.add_argument("--watch", action="store_true", help="keep polling for new or grown files")
+    parser.add_argument("--interval", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    from src.db import init_db
+
+    init_db()
+    if args.watch:
+        watch_imports(args.dir, args.interval, args.batch_size)
+        return
+    for result in scan_imports(args.dir, args.batch_size):
+        print(f"{Path(result['path']).name}: {result['status']} ({result.get('items', 0)} jobs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Schema mapping from search and import payloads to internal job dicts.
+
+Each source has a table mapping every job field to the keys it may appear
+under, in order of preference. For each distinct set of keys seen in that
+source's items, the table is compiled once into a plain extractor function
+(keys outside the table are ignored, and at most MAX_EXTRACTORS are kept).
+The function reads exactly the keys that are present, so per-item work is one
+call with no alias probing.
+
+Payloads may be a bare list, a single job, or an envelope. The envelopes are
+`{"jobs": [...]}`, `{"results": [...]}`, `{"items": [...]}` and
+`{"data": ...}`, and `data` may nest any of these. Every job gets a stable
+content-hash `id`, so the same posting has the same id in every run, and a
+`posted_at` ISO timestamp parsed from `posted_date` (relative dates are read
+against the time of the call; see src/posted_dates.py). Imported items that
+already carry a valid `posted_at` keep it, so re-reading a saved search log
+does not shift relative dates to the import time.
+Field values are coerced to str (numbers via str(); lists and dicts in
+optional fields become ""). Duplicates within a payload are dropped, and items
+with no title or company, or a non-scalar one, are rejected. `normalize` also returns per-field coverage, so a source
+that changes its schema shows up as a coverage drop, not as silently empty
+fields.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.posted_dates import parse_posted_date
+
+FIELDS = ("title", "company", "location", "apply_url", "description", "posted_date", "platform")
+REQUIRED = ("title", "company")
+ENVELOPE_KEYS = ("jobs", "results", "items", "data")
+
+SOURCES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "perplexity": {
+        "title": ("title", "job_title", "position", "role"),
+        "company": ("company", "employer", "company_name", "organization"),
+        "location": ("location", "place", "city"),
+        "apply_url": ("apply_url", "url", "link", "application_url", "job_url"),
+        "description": ("description_snippet", "description", "summary"),
+        "posted_date": ("posted_date", "date", "date_posted", "posted"),
+        "platform": ("platform",),
+    },
+}
+SOURCES["import"] = SOURCES["perplexity"]
+
+DEFAULTS = {"perplexity": {"platform": "perplexity"}, "import": {"platform": "perplexity"}}
+
+# Every alias key of each source, in table order. Extractors are keyed on which of
+# these an item has, so keys the table never reads do not create new extractors.
+ALL_ALIASES: Dict[str, Tuple[str, ...]] = {
+    source: tuple(dict.fromkeys(k for field in FIELDS for k in aliases.get(field, ())))
+    for source, aliases in SOURCES.items()
+}
+MAX_EXTRACTORS = 256
+# Sources whose items may already be normalized (e.g. re-read from the search log);
+# their posted_at was resolved when the job was found and is kept as is.
+KEEPS_POSTED_AT = ("import",)
+SCALARS = (str, int, float)  # bool is an int
+
+_extractors: Dict[Tuple[str, Tuple[str, ...]], Callable[[dict], dict]] = {}
+
+
+def job_id(job: dict) -> str:
+    """Stable id: the apply URL if there is one, else company + title + location"""
+    key = job["apply_url"].strip().lower() if job["apply_url"] else "|".join(
+        str(job[f]).strip().lower() for f in ("company", "title", "location"))
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def compile_extractor(aliases: Dict[str, Tuple[str, ...]], keys: Tuple[str, ...],
+                      defaults: Optional[Dict[str, str]] = None) -> Callable[[dict], dict]:
+    """Build `extract(item) -> job dict` for items that have exactly `keys`"""
+    defaults = defaults or {}
+    present = set(keys)
+    lines = ["def extract(it):", "    return {"]
+    for field in FIELDS:
+        found = [k for k in aliases.get(field, ()) if k in present]
+        fallback = repr(defaults.get(field, ""))
+        # Same semantics as `it.get(a) or it.get(b) or default`: empty values fall through
+        expr = " or ".join([f"it[{k!r}]" for k in found] + [fallback])
+        lines.append(f"        {field!r}: {expr},")
+    lines.append("        'status': 'NOT_APPLIED',")
+    lines.append("    }")
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace)
+    return namespace["extract"]
+
+
+def _extractor(source: str, item: dict) -> Callable[[dict], dict]:
+    keys = tuple(k for k in ALL_ALIASES[source] if k in item)
+    fn = _extractors.get((source, keys))
+    if fn is None:
+        if len(_extractors) >= MAX_EXTRACTORS:
+            _extractors.clear()
+        fn = _extractors[(source, keys)] = compile_extractor(SOURCES[source], keys, DEFAULTS.get(source))
+    return fn
+
+
+def _coerce_fields(job: dict) -> bool:
+    """Make every field a str in place; False if a required field is not a scalar"""
+    for field in FIELDS:
+        value = job[field]
+        if type(value) is str:
+            continue
+        if isinstance(value, SCALARS):
+            job[field] = str(value)
+        elif field in REQUIRED:
+            return False
+        else:
+            job[field] = ""
+    return True
+
+
+def _kept_posted_at(item: dict):
+    """The item's own posted_at if it is a valid ISO timestamp, else None"""
+    value = item.get("posted_at")
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def unwrap(payload: Any) -> List[Any]:
+    """The list of job items inside a payload (empty if there is none)"""
+    if isinstance(payload, list):
+        return payload
+    if not isinstance(payload, dict):
+        return []
+    for key in ENVELOPE_KEYS:
+        if key in payload and isinstance(payload[key], (list, dict)):
+            items = unwrap(payload[key])
+            if items:
+                return items
+    return [payload] if any(k in payload for k in SOURCES["perplexity"]["title"]) else []
+
+
+def normalize(payload: Any, source: str = "perplexity", now: Optional[datetime] = None) -> Tuple[List[dict], Dict[str, Any]]:
+    """Map a payload to job dicts; returns (jobs, report). `now` anchors relative dates"""
+    items = unwrap(payload)
+    now = now or datetime.utcnow()
+    jobs: List[dict] = []
+    seen = set()
+    invalid = duplicates = 0
+    for item in items:
+        if not isinstance(item, dict):
+            invalid += 1
+            continue
+        job = _extractor(source, item)(item)
+        if not _coerce_fields(job) or not all(job[f] for f in REQUIRED):
+            invalid += 1
+            continue
+        jid = job["id"] = job_id(job)
+        if jid in seen:
+            duplicates += 1
+            continue
+        seen.add(jid)
+        posted_at = _kept_posted_at(item) if source in KEEPS_POSTED_AT else None
+        posted_at = posted_at or parse_posted_date(job["posted_date"], now)
+        job["posted_at"] = posted_at.isoformat(timespec="seconds") if posted_at else ""
+        jobs.append(job)
+
+    n = len(jobs)
+    report = {
+        "source": source,
+        "items": len(items),
+        "valid": n,
+        "invalid": invalid,
+        "duplicates": duplicates,
+        "coverage": {f: (sum(1 for j in jobs if j[f]) / n if n else 0.0) for f in FIELDS + ("posted_at",)},
+    }
+    return jobs, report
@@ -0,0 +1,367 @@
+"""Process-wide metrics registry with Prometheus text exposition.
+
+Counters, gauges and histograms (optionally labelled) are created once at
+import time and updated from the search, database and submit code paths.
+Each labelled series carries its own lock, so concurrent updates only
+contend when they touch the same series; a scrape snapshots each series in
+turn and never blocks writers for longer than one copy.
+
+Set JOB_O_MATIC_METRICS_PORT to have the Streamlit app start a sidecar
+endpoint at http://<host>:<port>/metrics, or call `start_metrics_server()`.
+"""
+
+import bisect
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+METRICS_PORT = os.getenv("JOB_O_MATIC_METRICS_PORT", "")
+METRICS_HOST = os.getenv("JOB_O_MATIC_METRICS_HOST", "127.0.0.1")
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric(ABC):
+    """Base for metric families; subclasses define the child series type and its samples."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._create_lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._new_child()
+            self._children[()] = self._default
+
+    @abstractmethod
+    def _new_child(self):
+        """A new, zeroed series for one set of label values."""
+
+    def labels(self, *values, **kwargs):
+        """Return the series for the given label values (created on first use)."""
+        if kwargs:
+            values = tuple(str(kwargs[n]) for n in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._create_lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abstractmethod
+    def samples(self):
+        """Yield (sample_name, label_string, value) for every series."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}",
+                 f"# TYPE {self.name} {self.type_name}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self._value += amount
+
+    def get(self) -> float:
+        return self._value
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            yield self.name, _label_str(self.labelnames, values), child.get()
+
+
+class _GaugeChild:
+    __slots__ = ("_value", "_lock", "_fn")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+        self._fn = None
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Evaluate `fn` at scrape time instead of storing a value."""
+        self._fn = fn
+
+    def get(self) -> float:
+        if self._fn is not None:
+            try:
+                return float(self._fn())
+            except Exception:
+                return math.nan
+        return self._value
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._default.set_function(fn)
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            yield self.name, _label_str(self.labelnames, values), child.get()
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += value
+
+    def time(self):
+        return _Timer(self.observe)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def samples(self):
+        bounds = self.buckets + (math.inf,)
+        for values, child in list(self._children.items()):
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield self.name + "_bucket", _label_str(self.labelnames, values, le), cumulative
+            labels = _label_str(self.labelnames, values)
+            yield self.name + "_sum", labels, total
+            yield self.name + "_count", labels, cumulative
+
+
+class _Timer:
+    """Context manager that observes elapsed seconds on exit."""
+
+    __slots__ = ("_observe", "_start")
+
+    def __init__(self, observe):
+        self._observe = observe
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._observe(time.perf_counter() - self._start)
+        return False
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, documentation, labelnames=(), **kwargs):
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if not isinstance(existing, cls) or existing.labelnames != tuple(labelnames):
+                    raise ValueError(f"Metric {name} already registered with a different type or labels")
+                return existing
+            metric = cls(name, documentation, labelnames, **kwargs)
+            self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Text exposition of every registered metric."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+PROCESS_START = REGISTRY.gauge("jobomatic_process_start_time_seconds",
+                               "Unix time the process started.")
+PROCESS_START.set(time.time())
+
+PPLX_REQUESTS = REGISTRY.counter("jobomatic_pplx_requests_total",
+                                 "Perplexity search calls by outcome.", ["outcome"])
+PPLX_LATENCY = REGISTRY.histogram("jobomatic_pplx_request_seconds",
+                                  "Perplexity search HTTP latency.")
+JOBS_NORMALIZED = REGISTRY.counter("jobomatic_jobs_normalized_total",
+                                   "Search results normalized into job dicts.")
+JOBS_INGESTED = REGISTRY.counter("jobomatic_jobs_ingested_total",
+                                 "Jobs written to the database.", ["mode", "result"])
+DB_WRITE_SECONDS = REGISTRY.histogram("jobomatic_db_write_seconds",
+                                      "Time spent in job insert/upsert transactions.", ["op"])
+DB_QUERY_SECONDS = REGISTRY.histogram("jobomatic_db_query_seconds",
+                                      "SQL statement time (recorded while the query profiler is on).",
+                                      ["kind"])
+TAILOR_CACHE_LOOKUPS = REGISTRY.counter("jobomatic_tailor_cache_lookups_total",
+                                        "Tailor cache lookups by result.", ["result"])
+SUBMISSIONS = REGISTRY.counter("jobomatic_submissions_total",
+                               "Application submissions by platform and outcome.",
+                               ["platform", "outcome"])
+SUBMIT_LATENCY = REGISTRY.histogram("jobomatic_submit_request_seconds",
+                                    "ATS submit HTTP latency.", ["platform"])
+SUBMIT_RETRIES = REGISTRY.counter("jobomatic_submit_retries_total",
+                                  "Submissions retried after a 429.", ["platform"])
+SUBMIT_INFLIGHT = REGISTRY.gauge("jobomatic_submit_inflight",
+                                 "Submissions currently holding a platform slot.", ["platform"])
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        data = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: Optional[int] = None, host: Optional[str] = None,
+                         registry: Registry = REGISTRY) -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics on a daemon thread; repeated calls return the same server."""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        if port is None:
+            if not METRICS_PORT:
+                return None
+            port = int(METRICS_PORT)
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        server = ThreadingHTTPServer((host or METRICS_HOST, port), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        _server = server
+        return server
+
+
+def stop_metrics_server() -> None:
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
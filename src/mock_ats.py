@@ -0,0 +1,182 @@
+"""Local stand-in for the Greenhouse and Lever submit endpoints.
+
+Emulates `POST /v1/boards/<token>/jobs/<id>` (Greenhouse boards-api) and
+`POST /v0/postings/<site>/<id>` (Lever) with configurable latency, a
+token-bucket rate limit that answers 429 + Retry-After, and random 5xx
+failure injection. Point the submitter at it with GREENHOUSE_API_BASE /
+LEVER_API_BASE.
+
+Usage:
+    python -m src.mock_ats --port 8765 --latency-ms 80 --rate-limit 20 --fail-rate 0.05
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+_GREENHOUSE_RE = re.compile(r"^/v1/boards/[^/]+/jobs/[^/?]+")
+_LEVER_RE = re.compile(r"^/v0/postings/[^/]+/[^/?]+")
+
+
+class MockATSConfig:
+    def __init__(self, latency_ms: float = 50.0, jitter_ms: float = 10.0,
+                 rate_limit: float = 0.0, burst: int = 5, fail_rate: float = 0.0,
+                 retry_after: float = 1.0, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit  # requests/second, 0 = unlimited
+        self.burst = burst
+        self.fail_rate = fail_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class MockATSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: Optional[MockATSConfig] = None):
+        super().__init__(address, MockATSHandler)
+        self.config = config or MockATSConfig()
+        self.bucket = _TokenBucket(self.config.rate_limit, self.config.burst)
+        self.stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "accepted": 0, "rate_limited": 0, "failed": 0,
+                      "not_found": 0, "bytes_received": 0}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}"
+
+    def count(self, key: str, n: int = 1) -> None:
+        with self.stats_lock:
+            self.stats[key] += n
+
+
+class MockATSHandler(BaseHTTPRequestHandler):
+    server: MockATSServer
+
+    def log_message(self, format, *args):  # keep load tests quiet
+        pass
+
+    def _reply(self, status: int, body: dict, headers: Optional[dict] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _drain_body(self) -> int:
+        length = int(self.headers.get("Content-Length") or 0)
+        remaining = length
+        while remaining > 0:
+            chunk = self.rfile.read(min(65536, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+        return length - remaining
+
+    def do_GET(self):
+        if self.path.startswith("/__stats"):
+            with self.server.stats_lock:
+                self._reply(200, dict(self.server.stats))
+            return
+        self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        server, cfg = self.server, self.server.config
+        server.count("requests")
+        server.count("bytes_received", self._drain_body())
+
+        if _GREENHOUSE_RE.match(self.path):
+            platform = "greenhouse"
+        elif _LEVER_RE.match(self.path):
+            platform = "lever"
+        else:
+            server.count("not_found")
+            self._reply(404, {"error": "unknown endpoint"})
+            return
+
+        if not server.bucket.take():
+            server.count("rate_limited")
+            self._reply(429, {"error": "rate limited"},
+                        {"Retry-After": f"{cfg.retry_after:g}"})
+            return
+
+        delay = max(0.0, cfg.latency_ms + cfg.random.uniform(-cfg.jitter_ms, cfg.jitter_ms))
+        time.sleep(delay / 1000.0)
+
+        if cfg.fail_rate and cfg.random.random() < cfg.fail_rate:
+            server.count("failed")
+            self._reply(cfg.random.choice([500, 502, 503]), {"error": "injected failure"})
+            return
+
+        server.count("accepted")
+        self._reply(200, {"success": True, "platform": platform})
+
+
+def start_mock_ats(config: Optional[MockATSConfig] = None, host: str = "127.0.0.1",
+                   port: int = 0) -> MockATSServer:
+    """Start the mock server on a background thread; call .shutdown() to stop."""
+    server = MockATSServer((host, port), config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Greenhouse/Lever submit API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests/sec, 0 = unlimited")
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of 5xx responses")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = MockATSConfig(args.latency_ms, args.jitter_ms, args.rate_limit, args.burst,
+                           args.fail_rate, args.retry_after, args.seed)
+    server = MockATSServer((args.host, args.port), config)
+    print(f"Mock ATS listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
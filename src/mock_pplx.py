@@ -0,0 +1,154 @@
+"""Local fake Perplexity endpoint serving synthetic job payloads.
+
+Set PERPLEXITY_API_URL to this server (plus ENABLE_PERPLEXITY=true and any
+PERPLEXITY_API_KEY) to exercise search -> normalize -> insert offline.
+Payload size and shape can be set on the command line or per request via the
+query string, e.g. `http://127.0.0.1:8766/search?n=500&shape=jobs&fields=mixed`.
+
+shape:  list     -> [ {...}, ... ]
+        results  -> {"results": [...]}
+        jobs     -> {"jobs": [...], "meta": {...}}
+fields: canonical (company/title/apply_url/...), alt (employer/job_title/url/...),
+        mixed (alternates per item)
+
+Usage:
+    python -m src.mock_pplx --port 8766 --n 100 --shape results
+"""
+
+import argparse
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+SHAPES = ("list", "results", "jobs")
+FIELD_STYLES = ("canonical", "alt", "mixed")
+
+_COMPANIES = ["Acme Legal", "Northwind", "Globex", "Initech", "Hooli", "Umbrella Compliance"]
+_TITLES = ["Paralegal", "Legal Assistant", "Compliance Analyst", "Contract Analyst",
+           "Privacy Officer", "Legal Researcher"]
+_LOCATIONS = ["London", "Remote (UK)", "Manchester", "Ilford", "Hybrid - London"]
+
+
+def synthetic_item(i: int, style: str = "canonical", rng: Optional[random.Random] = None,
+                   description_words: int = 40) -> dict:
+    """Build one fake search result using the given field-name style."""
+    rng = rng or random.Random()
+    if style == "mixed":
+        style = "canonical" if i % 2 == 0 else "alt"
+    company = rng.choice(_COMPANIES)
+    title = rng.choice(_TITLES)
+    location = rng.choice(_LOCATIONS)
+    url = f"https://boards.greenhouse.io/{company.split()[0].lower()}/jobs/{4000000 + i}"
+    description = " ".join(rng.choice(["GDPR", "contracts", "research", "compliance",
+                                       "review", "drafting", "policy"])
+                           for _ in range(description_words))
+    posted = f"{rng.randint(1, 14)} days ago"
+    if style == "alt":
+        return {"employer": company, "job_title": title, "place": location, "url": url,
+                "description": description, "date": posted}
+    return {"company": company, "title": title, "location": location, "apply_url": url,
+            "description_snippet": description, "posted_date": posted}
+
+
+def build_payload(n: int = 20, shape: str = "results", fields: str = "canonical",
+                  seed: int = 0, description_words: int = 40):
+    rng = random.Random(seed)
+    items = [synthetic_item(i, fields, rng, description_words) for i in range(n)]
+    if shape == "list":
+        return items
+    if shape == "jobs":
+        return {"jobs": items, "meta": {"search_window_days": 14, "notes": "synthetic"}}
+    return {"results": items}
+
+
+class MockPerplexityServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, n: int = 20, shape: str = "results", fields: str = "canonical",
+                 seed: int = 0, description_words: int = 40):
+        super().__init__(address, MockPerplexityHandler)
+        self.defaults = {"n": n, "shape": shape, "fields": fields, "seed": seed,
+                         "description_words": description_words}
+        self.requests = 0
+        self._payload_cache: Dict[tuple, bytes] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}/search"
+
+    def payload_bytes(self, opts: dict) -> bytes:
+        key = tuple(sorted(opts.items()))
+        with self._lock:
+            self.requests += 1
+            if key not in self._payload_cache:
+                self._payload_cache[key] = json.dumps(build_payload(**opts)).encode("utf-8")
+            return self._payload_cache[key]
+
+
+class MockPerplexityHandler(BaseHTTPRequestHandler):
+    server: MockPerplexityServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        qs = parse_qs(urlsplit(self.path).query)
+        opts = dict(self.server.defaults)
+        for key in ("n", "seed", "description_words"):
+            if key in qs:
+                opts[key] = int(qs[key][0])
+        if qs.get("shape", [""])[0] in SHAPES:
+            opts["shape"] = qs["shape"][0]
+        if qs.get("fields", [""])[0] in FIELD_STYLES:
+            opts["fields"] = qs["fields"][0]
+
+        data = self.server.payload_bytes(opts)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_mock_pplx(host: str = "127.0.0.1", port: int = 0, **defaults) -> MockPerplexityServer:
+    """Start the fake endpoint on a background thread; call .shutdown() to stop."""
+    server = MockPerplexityServer((host, port), **defaults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Perplexity search endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--n", type=int, default=20)
+    parser.add_argument("--shape", choices=SHAPES, default="results")
+    parser.add_argument("--fields", choices=FIELD_STYLES, default="canonical")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--description-words", type=int, default=40)
+    args = parser.parse_args()
+
+    server = MockPerplexityServer((args.host, args.port), args.n, args.shape, args.fields,
+                                  args.seed, args.description_words)
+    print(f"Mock Perplexity listening on {server.url}")
+    print(f"  export PERPLEXITY_API_URL={server.url} ENABLE_PERPLEXITY=true PERPLEXITY_API_KEY=test")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
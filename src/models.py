@@ -1,19 +1,213 @@
-from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from typing import Optional
+
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy import Boolean, Integer, String, Text, DateTime, Index, UniqueConstraint
 from datetime import datetime
 
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    pass
 
 
 class Job(Base):
     __tablename__ = "jobs"
 
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(256), nullable=False)
-    company = Column(String(256), nullable=False)
-    location = Column(String(128), nullable=True)
-    apply_url = Column(String(1024), nullable=True)
-    description = Column(Text, nullable=True)
-    posted_date = Column(String(64), nullable=True)
-    status = Column(String(64), default="NOT_APPLIED")
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    title: Mapped[str] = mapped_column(String(256), nullable=False)
+    company: Mapped[str] = mapped_column(String(256), nullable=False)
+    location: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    apply_url: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True, index=True)
+    platform: Mapped[Optional[str]] = mapped_column(String(32), nullable=True, index=True)  # ATS detected from apply_url
+    board_token: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)  # Greenhouse board token / Lever site
+    posting_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # Greenhouse job id / Lever posting uuid
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    posted_date: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # raw text as scraped ("2 days ago", "Oct 3")
+    posted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)  # posted_date parsed at ingest (src/posted_dates.py)
+    status: Mapped[Optional[str]] = mapped_column(String(64), default="NOT_APPLIED")
+    preview_dir: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)  # latest bulk preview bundle (src/bulk_ops.py)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_jobs_platform_board_posting", "platform", "board_token", "posting_id"),
+    )
+
+
+class TailorCacheEntry(Base):
+    __tablename__ = "tailor_cache"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    cache_key: Mapped[str] = mapped_column(String(64), nullable=False, unique=True, index=True)
+    variant: Mapped[str] = mapped_column(String(128), nullable=False)
+    prompt_version: Mapped[str] = mapped_column(String(32), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    hit_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    last_used_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+class SubmissionRecord(Base):
+    __tablename__ = "submission_ledger"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    job_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+    platform: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
+    idempotency_key: Mapped[str] = mapped_column(String(64), nullable=False, unique=True, index=True)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    response_status: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # NULL while the request is in flight
+    latency_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    attempts: Mapped[Optional[int]] = mapped_column(Integer, default=1)
+    message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class PRSnapshot(Base):
+    """Append-only: one row per PR per readiness check."""
+
+    __tablename__ = "pr_readiness_history"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    repository: Mapped[str] = mapped_column(String(256), nullable=False)
+    pr_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    captured_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    title: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    author: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    head_sha: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    draft: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    mergeable: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    checks_status: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    review_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    has_approval: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    has_requested_changes: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    can_merge: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    blocking_factors: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON list
+
+    __table_args__ = (
+        Index("ix_pr_history_repo_pr_time", "repository", "pr_number", "captured_at"),
+        Index("ix_pr_history_repo_time", "repository", "captured_at"),
+    )
+
+
+class PRReportRun(Base):
+    """One row per recorded readiness report, including reports with no open PRs."""
+
+    __tablename__ = "pr_readiness_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    repository: Mapped[str] = mapped_column(String(256), nullable=False)
+    captured_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    pr_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    recorded_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("repository", "captured_at", name="uq_pr_runs_repo_time"),
+    )
+
+
+class PRRollup(Base):
+    """Per-PR aggregates, updated incrementally as snapshots are appended."""
+
+    __tablename__ = "pr_readiness_rollup"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    repository: Mapped[str] = mapped_column(String(256), nullable=False)
+    pr_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    title: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    first_ready_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    time_to_ready_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    draft_seconds: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    snapshots: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    check_runs_seen: Mapped[Optional[int]] = mapped_column(Integer, default=0)  # snapshots with a final check state
+    flaky_flips: Mapped[Optional[int]] = mapped_column(Integer, default=0)  # failure <-> success on the same head SHA
+    last_draft: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    last_checks_status: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    last_head_sha: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    last_can_merge: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+
+    __table_args__ = (
+        UniqueConstraint("repository", "pr_number", name="uq_pr_rollup_repo_pr"),
+        Index("ix_pr_rollup_repo_last_seen", "repository", "last_seen_at"),
+    )
+
+
+class PRDailyRollup(Base):
+    """Per-day readiness counts for trend charts."""
+
+    __tablename__ = "pr_readiness_daily"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    repository: Mapped[str] = mapped_column(String(256), nullable=False)
+    day: Mapped[str] = mapped_column(String(10), nullable=False)  # YYYY-MM-DD
+    runs: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    pr_snapshots: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    ready_snapshots: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    draft_snapshots: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    failing_check_snapshots: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    conflict_snapshots: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("repository", "day", name="uq_pr_daily_repo_day"),
+    )
+
+
+class PRReadinessState(Base):
+    """Current readiness per open PR; seeded by full checks, kept fresh by webhooks."""
+
+    __tablename__ = "pr_readiness_current"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    repository: Mapped[str] = mapped_column(String(256), nullable=False)
+    pr_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    title: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    author: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    head_sha: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    draft: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    mergeable: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    mergeable_state: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    check_states: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON {context or check-run name: state}
+    reviewers: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON {login: latest review state}
+    checks_status: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    can_merge: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    blocking_factors: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON list
+    pr_updated_at: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)  # GitHub's updated_at
+    refreshed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    source: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)  # "check" or the webhook event name
+
+    __table_args__ = (
+        UniqueConstraint("repository", "pr_number", name="uq_pr_current_repo_pr"),
+        Index("ix_pr_current_repo_sha", "repository", "head_sha"),
+    )
+
+
+class PRCheckState(Base):
+    """Latest state per (commit, check context); buffers checks that arrive before their PR event."""
+
+    __tablename__ = "pr_check_states"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    repository: Mapped[str] = mapped_column(String(256), nullable=False)
+    sha: Mapped[str] = mapped_column(String(64), nullable=False)
+    name: Mapped[str] = mapped_column(String(256), nullable=False)  # status context or check-run name
+    state: Mapped[str] = mapped_column(String(32), nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        UniqueConstraint("repository", "sha", "name", name="uq_pr_check_repo_sha_name"),
+    )
+
+
+class ImportFileState(Base):
+    __tablename__ = "import_files"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    path: Mapped[str] = mapped_column(String(1024), nullable=False, unique=True, index=True)
+    size: Mapped[Optional[int]] = mapped_column(Integer, default=0)  # file size when last scanned
+    mtime_ns: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    offset: Mapped[Optional[int]] = mapped_column(Integer, default=0)  # bytes ingested so far (always ends on an item boundary)
+    prefix_sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # checksum of bytes [0, offset)
+    items: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    errors: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    completed: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,400 @@
+"""Append-only NDJSON segments with rotation and an offset index.
+
+`NDJSONWriter` appends one JSON document per line to the active segment,
+`<prefix>-YYYYMMDD-NNNN.ndjson`. Cost per record is constant, however large
+the archive grows. A new segment starts when the day changes or when the
+active one would pass `max_bytes`. The segment it replaces is sealed:
+
+* it is flushed and fsync'd;
+* with compression ("zstd" or "gzip"), it is rewritten as independent
+  frames of `index_every` records. The compressed copy goes to a temp file
+  and is renamed into place, so readers never see a half-written archive.
+  Until the plain segment is removed, readers use the archive and ignore
+  it; after a crash the next writer deletes the leftover.
+
+Every segment has a `.idx` sidecar of (first_record, byte_offset) pairs, one
+per `index_every` records. For compressed segments these are the frame
+starts. `NDJSONReader` uses the sidecars to jump to any record without
+reading or decompressing what comes before it.
+
+Several writers may share a directory (two app sessions, or the app and the
+backfill CLI). Each append()/extend() holds an exclusive flock on the
+`.<prefix>.lock` sidecar, and a writer that finds the active segment changed
+by someone else reloads its record count and index before writing.
+
+fsync policy (JOB_O_MATIC_NDJSON_FSYNC):
+    always  after every record
+    batch   after every append()/extend() call (default)
+    rotate  only when a segment is sealed or the writer is closed
+    never   leave it to the OS
+"""
+
+import bisect
+import gzip
+import json
+import os
+import struct
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+
+    HAVE_FLOCK = True
+except ImportError:  # Windows: single-writer only
+    HAVE_FLOCK = False
+
+MAX_BYTES = int(os.getenv("JOB_O_MATIC_NDJSON_MAX_BYTES", str(64 * 1024 * 1024)))
+COMPRESS = os.getenv("JOB_O_MATIC_NDJSON_COMPRESS", "") or None
+FSYNC = os.getenv("JOB_O_MATIC_NDJSON_FSYNC", "batch")
+INDEX_EVERY = 256
+
+FSYNC_POLICIES = ("always", "batch", "rotate", "never")
+EXTENSIONS = {None: ".ndjson", "gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+_PAIR = struct.Struct("<QQ")
+
+
+def _codec(name: Optional[str]) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """(compress, decompress) for a codec name"""
+    if name == "gzip":
+        return gzip.compress, gzip.decompress
+    if name == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd compression needs the 'zstandard' package (pip install zstandard)")
+        return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+    raise ValueError(f"unknown compression: {name!r}")
+
+
+def _read_pairs(idx_path: Path) -> List[Tuple[int, int]]:
+    if not idx_path.exists():
+        return []
+    data = idx_path.read_bytes()
+    usable = len(data) - len(data) % _PAIR.size
+    return [_PAIR.unpack_from(data, pos) for pos in range(0, usable, _PAIR.size)]
+
+
+def _sealed_name(name: str, codec: Optional[str]) -> str:
+    """File name of the compressed archive that replaces plain segment `name`"""
+    return name[: -len(".ndjson")] + EXTENSIONS[codec]
+
+
+def _segment_codec(path: Path) -> Optional[str]:
+    if path.name.endswith(".gz"):
+        return "gzip"
+    if path.name.endswith(".zst"):
+        return "zstd"
+    return None
+
+
+class NDJSONWriter:
+    def __init__(self, directory, prefix: str = "jobs", max_bytes: int = MAX_BYTES,
+                 rotate_daily: bool = True, compress: Optional[str] = COMPRESS,
+                 fsync: str = FSYNC, index_every: int = INDEX_EVERY,
+                 clock: Callable[[], datetime] = datetime.now):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+        if compress:
+            _codec(compress)  # fail fast if zstandard is missing
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compress = compress or None
+        self.fsync = fsync
+        self.index_every = index_every
+        self.clock = clock
+        self._f: Optional[BinaryIO] = None
+        self._idx: Optional[BinaryIO] = None
+        self._lock = open(self.directory / f".{prefix}.lock", "ab")
+        with self._locked():
+            self._open_segment()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive lock shared by every writer of this directory and prefix"""
+        if not HAVE_FLOCK:
+            yield
+            return
+        fcntl.flock(self._lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock.fileno(), fcntl.LOCK_UN)
+
+    def _files(self) -> Tuple[BinaryIO, BinaryIO]:
+        if self._f is None or self._idx is None:
+            raise RuntimeError("writer has no open segment")
+        return self._f, self._idx
+
+    def _refresh(self) -> None:
+        """Reopen the newest segment if another writer appended to or sealed ours"""
+        try:
+            current = (self.path.stat().st_size, self._idx_path(self.path).stat().st_size)
+        except FileNotFoundError:
+            current = None
+        if current != (self._size, self._idx_size):
+            f, idx = self._files()
+            f.close()
+            idx.close()
+            self._open_segment()
+
+    # -- segment lifecycle -------------------------------------------------
+
+    def _open_segment(self, new: bool = False) -> None:
+        self._day = self.clock().strftime("%Y%m%d")
+        seqs = [int(p.name.split("-")[-1].split(".")[0])
+                for p in self.directory.glob(f"{self.prefix}-{self._day}-*.ndjson*")
+                if not p.name.endswith((".idx", ".tmp"))]
+        seq = max(seqs, default=0)
+        path = self.directory / f"{self.prefix}-{self._day}-{seq:04d}.ndjson"
+        if path.exists() and any(path.with_name(_sealed_name(path.name, c)).exists() for c in ("gzip", "zstd")):
+            # Crashed after compressing this segment but before removing the plain copy
+            path.unlink()
+            self._idx_path(path).unlink(missing_ok=True)
+        if new or not (seq and path.exists() and path.stat().st_size < self.max_bytes):
+            seq += 1
+            path = self.directory / f"{self.prefix}-{self._day}-{seq:04d}.ndjson"
+        self.path = path
+        self._recover()
+        self._f = open(self.path, "ab")
+        self._idx = open(self._idx_path(self.path), "ab")
+
+    @staticmethod
+    def _idx_path(path: Path) -> Path:
+        return path.with_name(path.name + ".idx")
+
+    def _recover(self) -> None:
+        """Continue an existing plain segment: drop a torn last line and stale index entries"""
+        self._records = self._size = self._idx_size = 0
+        if not self.path.exists():
+            self._idx_path(self.path).unlink(missing_ok=True)
+            return
+        size = self.path.stat().st_size
+        pairs = [p for p in _read_pairs(self._idx_path(self.path)) if p[1] < size]
+        first, offset = pairs[-1] if pairs else (0, 0)
+        records, end = first, offset
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                records += 1
+                end += len(line)
+        if end < size:
+            os.truncate(self.path, end)
+        with open(self._idx_path(self.path), "wb") as idx:
+            idx.write(b"".join(_PAIR.pack(*p) for p in pairs))
+        self._records, self._size, self._idx_size = records, end, len(pairs) * _PAIR.size
+
+    def _sync(self) -> None:
+        f, idx = self._files()
+        f.flush()
+        idx.flush()
+        if self.fsync != "never":
+            os.fsync(f.fileno())
+            os.fsync(idx.fileno())
+
+    def _seal(self) -> None:
+        f, idx = self._files()
+        idx.write(_PAIR.pack(self._records, self._size))  # sentinel: total records, end offset
+        self._sync()
+        f.close()
+        idx.close()
+        if not self._records:
+            self.path.unlink(missing_ok=True)
+            self._idx_path(self.path).unlink(missing_ok=True)
+        elif self.compress:
+            self._compress_segment(self.path)
+
+    def _compress_segment(self, path: Path) -> Path:
+        compress, _ = _codec(self.compress)
+        target = path.with_name(_sealed_name(path.name, self.compress))
+        tmp = target.with_name(target.name + ".tmp")
+        idx_tmp = target.with_name(target.name + ".idx.tmp")
+        pairs, records = [], 0
+        with open(path, "rb") as src, open(tmp, "wb") as dst:
+            lines = []
+            for line in src:
+                lines.append(line)
+                if len(lines) == self.index_every:
+                    pairs.append((records, dst.tell()))
+                    dst.write(compress(b"".join(lines)))
+                    records += len(lines)
+                    lines = []
+            if lines:
+                pairs.append((records, dst.tell()))
+                dst.write(compress(b"".join(lines)))
+                records += len(lines)
+            pairs.append((records, dst.tell()))
+            dst.flush()
+            if self.fsync != "never":
+                os.fsync(dst.fileno())
+        idx_tmp.write_bytes(b"".join(_PAIR.pack(*p) for p in pairs))
+        os.replace(idx_tmp, self._idx_path(target))
+        os.replace(tmp, target)
+        path.unlink()
+        self._idx_path(path).unlink(missing_ok=True)
+        return target
+
+    def rotate(self) -> None:
+        """Seal the active segment and start the next one"""
+        with self._locked():
+            self._refresh()
+            self._rotate()
+
+    def _rotate(self) -> None:
+        self._seal()
+        self._open_segment(new=True)
+
+    # -- writing -----------------------------------------------------------
+
+    def _write(self, record: Any) -> None:
+        line = (json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        if (self.rotate_daily and self.clock().strftime("%Y%m%d") != self._day) or \
+                (self._size and self._size + len(line) > self.max_bytes):
+            self._rotate()
+        f, idx = self._files()
+        if self._records % self.index_every == 0:
+            idx.write(_PAIR.pack(self._records, self._size))
+            self._idx_size += _PAIR.size
+        f.write(line)
+        self._records += 1
+        self._size += len(line)
+        if self.fsync == "always":
+            self._sync()
+
+    def append(self, record: Any) -> None:
+        self.extend([record])
+
+    def extend(self, records: Iterable[Any]) -> int:
+        n = 0
+        with self._locked():
+            self._refresh()
+            for record in records:
+                self._write(record)
+                n += 1
+            if self.fsync == "batch":
+                self._sync()
+            else:
+                f, idx = self._files()
+                f.flush()
+                idx.flush()
+        return n
+
+    def close(self) -> None:
+        """Flush and close; the segment stays active for the next writer"""
+        if self._f and self._idx and not self._f.closed:
+            with self._locked():
+                self._f.flush()
+                self._idx.flush()
+                if self.fsync != "never":
+                    os.fsync(self._f.fileno())
+                    os.fsync(self._idx.fileno())
+                self._f.close()
+                self._idx.close()
+        self._lock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class NDJSONReader:
+    def __init__(self, directory, prefix: str = "jobs"):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self._cache: Dict[Path, Tuple[Tuple[int, int], List[Tuple[int, int]], int]] = {}
+
+    def segments(self) -> List[Path]:
+        """Segment files, oldest first; a compressed archive hides a leftover plain copy"""
+        paths = [p for p in self.directory.glob(f"{self.prefix}-*.ndjson*")
+                 if not p.name.endswith((".idx", ".tmp"))]
+        names = {p.name for p in paths}
+        return sorted(p for p in paths
+                      if _segment_codec(p) or not any(_sealed_name(p.name, c) in names for c in ("gzip", "zstd")))
+
+    def _segment_index(self, path: Path) -> Tuple[List[Tuple[int, int]], int]:
+        """Checkpoints (first_record, offset) and record count for one segment"""
+        stat = path.stat()
+        key = (stat.st_size, stat.st_mtime_ns)
+        cached = self._cache.get(path)
+        if cached and cached[0] == key:
+            return cached[1], cached[2]
+
+        pairs = [p for p in _read_pairs(path.with_name(path.name + ".idx")) if p[1] <= stat.st_size]
+        if pairs and pairs[-1][1] == stat.st_size:
+            count = pairs[-1][0]  # sealed: sentinel holds the total
+            pairs = pairs[:-1]
+        elif _segment_codec(path):
+            raise ValueError(f"{path.name}: compressed segment without a complete index")
+        else:
+            # Active (or unindexed) plain segment: count complete lines after the last checkpoint
+            first, offset = pairs[-1] if pairs else (0, 0)
+            pairs = pairs or [(0, 0)]
+            count = first
+            with open(path, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if line.endswith(b"\n"):
+                        count += 1
+        self._cache[path] = (key, pairs, count)
+        return pairs, count
+
+    def _layout(self) -> Tuple[List[Path], List[int]]:
+        paths = self.segments()
+        starts, total = [], 0
+        for path in paths:
+            starts.append(total)
+            total += self._segment_index(path)[1]
+        return paths, starts + [total]
+
+    def __len__(self) -> int:
+        return self._layout()[1][-1]
+
+    def _iter_segment(self, path: Path, local: int) -> Iterator[Any]:
+        pairs, count = self._segment_index(path)
+        if local >= count:
+            return
+        k = bisect.bisect_right([p[0] for p in pairs], local) - 1
+        first, offset = pairs[k]
+        codec = _segment_codec(path)
+        with open(path, "rb") as f:
+            if codec is None:
+                f.seek(offset)
+                for n, line in enumerate(f, start=first):
+                    if n >= count:
+                        return
+                    if n >= local:
+                        yield json.loads(line)
+                return
+            _, decompress = _codec(codec)
+            ends = [p[1] for p in pairs[1:]] + [path.stat().st_size]
+            for (frame_first, frame_offset), frame_end in zip(pairs[k:], ends[k:]):
+                f.seek(frame_offset)
+                lines = decompress(f.read(frame_end - frame_offset)).splitlines()
+                for n, line in enumerate(lines, start=frame_first):
+                    if n >= local:
+                        yield json.loads(line)
+
+    def iter_from(self, start: int = 0) -> Iterator[Any]:
+        """Records from global position `start` onwards, across segments"""
+        paths, bounds = self._layout()
+        seg = max(bisect.bisect_right(bounds, start) - 1, 0)
+        for i in range(seg, len(paths)):
+            yield from self._iter_segment(paths[i], max(start - bounds[i], 0))
+
+    def read(self, position: int) -> Any:
+        """The record at global `position` (0-based)"""
+        for record in self.iter_from(position):
+            return record
+        raise IndexError(position)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.iter_from(0)
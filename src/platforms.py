@@ -0,0 +1,157 @@
+"""Classify job URLs by applicant-tracking platform.
+
+Hosts are matched on whole-label suffixes with a reversed-label trie, so
+`boards.greenhouse.io` is Greenhouse but `notgreenhouse.io.example.com` is not.
+Rules can be overridden with a YAML file mapping platform -> list of domains
+(path in JOB_O_MATIC_PLATFORMS_FILE). `parse_job_url` also extracts the
+Greenhouse board token / Lever site and the posting id at ingest time.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional
+from urllib.parse import parse_qs, urlsplit
+
+PLATFORMS_FILE = os.getenv("JOB_O_MATIC_PLATFORMS_FILE", "")
+
+DEFAULT_PLATFORM_RULES = {
+    "greenhouse": ["greenhouse.io"],
+    "lever": ["lever.co"],
+    "workday": ["myworkdayjobs.com", "myworkdaysite.com", "workday.com"],
+    "ashby": ["ashbyhq.com"],
+    "smartrecruiters": ["smartrecruiters.com"],
+}
+
+# scheme://[userinfo@]host[:port]...; host is group 1. Scheme-less URLs also match.
+_HOST_RE = re.compile(r"^\s*(?:[a-zA-Z][a-zA-Z0-9+.-]*:)?(?://)?(?:[^/?#@]*@)?([^/?#:\s]+)")
+
+_LEAF = "\0platform"
+
+
+class HostTrie:
+    """Trie keyed on reversed host labels (io -> greenhouse -> boards)."""
+
+    def __init__(self, rules: Mapping[str, Iterable[str]]):
+        self._root: dict = {}
+        for platform, domains in rules.items():
+            for domain in domains:
+                self.add(domain, platform)
+
+    def add(self, domain: str, platform: str) -> None:
+        node = self._root
+        for label in reversed(domain.lower().strip(".").split(".")):
+            node = node.setdefault(label, {})
+        node[_LEAF] = platform
+
+    def match(self, host: str) -> Optional[str]:
+        """Return the platform of the longest matching domain suffix of host."""
+        node = self._root
+        found = None
+        for label in reversed(host.lower().rstrip(".").split(".")):
+            child = node.get(label)
+            if child is None:
+                break
+            node = child
+            found = node.get(_LEAF, found)
+        return found
+
+
+def load_platform_rules(path: str = PLATFORMS_FILE) -> Dict[str, List[str]]:
+    """Load platform rules from YAML, falling back to the built-in defaults."""
+    if not path or not os.path.exists(path):
+        return dict(DEFAULT_PLATFORM_RULES)
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return {str(k): [str(d) for d in (v or [])] for k, v in data.items()}
+
+
+_trie = HostTrie(load_platform_rules())
+
+
+def set_platform_rules(rules: Mapping[str, Iterable[str]]) -> None:
+    """Replace the active rules (clears the per-host cache)."""
+    global _trie
+    _trie = HostTrie(rules)
+    classify_host.cache_clear()
+    parse_job_url.cache_clear()
+
+
+def extract_host(url: str) -> str:
+    if not url:
+        return ""
+    m = _HOST_RE.match(url)
+    return m.group(1).lower() if m else ""
+
+
+@lru_cache(maxsize=65536)
+def classify_host(host: str) -> Optional[str]:
+    return _trie.match(host) if host else None
+
+
+def classify_url(url: str) -> Optional[str]:
+    """Return the platform name for a job URL, or None if unrecognised."""
+    return classify_host(extract_host(url))
+
+
+def classify_urls(urls) -> List[Optional[str]]:
+    """Classify many URLs, doing one trie lookup per distinct host.
+
+    Accepts any iterable of strings (including a pandas Series).
+    """
+    hosts = [extract_host(u) if isinstance(u, str) else "" for u in urls]
+    by_host = {h: classify_host(h) for h in set(hosts)}
+    return [by_host[h] for h in hosts]
+
+
+class PostingRef(NamedTuple):
+    platform: str
+    board_token: str
+    posting_id: str
+
+
+_GREENHOUSE_PATH_RES = (
+    # boards-api.greenhouse.io/v1/boards/<token>/jobs/<id>
+    re.compile(r"^/v1/boards/([A-Za-z0-9_-]+)/jobs/(\d+)/?$"),
+    # boards.greenhouse.io/<token>/jobs/<id>, job-boards.greenhouse.io/<token>/jobs/<id>
+    re.compile(r"^/([A-Za-z0-9_-]+)/jobs/(\d+)/?$"),
+)
+_LEVER_PATH_RES = (
+    # api.lever.co/v0/postings/<site>/<uuid>
+    re.compile(r"^/v0/postings/([A-Za-z0-9_.-]+)/([0-9a-fA-F-]{36})/?$"),
+    # jobs.lever.co/<site>/<uuid>[/apply]
+    re.compile(r"^/([A-Za-z0-9_.-]+)/([0-9a-fA-F-]{36})(?:/apply)?/?$"),
+)
+_UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+
+
+@lru_cache(maxsize=65536)
+def parse_job_url(url: str) -> Optional[PostingRef]:
+    """Extract (platform, board_token, posting_id) from a Greenhouse/Lever URL.
+
+    Query strings and fragments are ignored. Returns None when the URL is not
+    a recognised posting URL, so bad links fail at ingest instead of at submit.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    platform = classify_host((parts.hostname or "").lower())
+    if platform == "greenhouse":
+        if parts.path.rstrip("/").endswith("/embed/job_app"):
+            qs = parse_qs(parts.query)
+            token, job_id = qs.get("for", [""])[0], qs.get("token", [""])[0]
+            if token and job_id.isdigit():
+                return PostingRef(platform, token, job_id)
+            return None
+        for pattern in _GREENHOUSE_PATH_RES:
+            m = pattern.match(parts.path)
+            if m:
+                return PostingRef(platform, m.group(1), m.group(2))
+    elif platform == "lever":
+        for pattern in _LEVER_PATH_RES:
+            m = pattern.match(parts.path)
+            if m and _UUID_RE.match(m.group(2).lower()):
+                return PostingRef(platform, m.group(1), m.group(2).lower())
+    return None
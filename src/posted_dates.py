@@ -0,0 +1,199 @@
+"""Normalize free-text posting dates into `Job.posted_at`.
+
+Search results give posting dates as free text, for example "2 days ago",
+"2026-10-01", "Oct 3" or "Posted yesterday". The raw string is kept in
+`posted_date`, and this module turns it into a naive UTC datetime for the
+indexed `posted_at` column. Recency filters are then range queries on an
+index, so rows never have to be loaded and parsed in Python.
+
+Parsing happens in two steps. `_parse` classifies the text into an absolute
+datetime, an age ("3 days ago" becomes a timedelta) or a month and day with
+no year. It depends only on the text, so it is cached with lru_cache. A feed
+repeats the same few hundred strings, so almost every call is a cache hit.
+`parse_posted_date` then resolves the result against a reference time:
+ages are subtracted from it, and a month/day with no year gets the most
+recent year that does not put the date in the future. Numeric dates such as
+"03/10/2026" are read day-first.
+
+Usage:
+    python -m src.posted_dates --backfill    # fill posted_at for existing rows
+"""
+
+import argparse
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+
+UNITS = {
+    "minute": timedelta(minutes=1), "min": timedelta(minutes=1),
+    "hour": timedelta(hours=1), "hr": timedelta(hours=1),
+    "day": timedelta(days=1), "week": timedelta(weeks=1),
+    "month": timedelta(days=30), "year": timedelta(days=365),
+}
+MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1)}
+NAMED = {"just now": 0, "now": 0, "today": 0, "yesterday": 1}
+
+_AGO = re.compile(r"^(\d+|an?|one)\+?\s*(minute|min|hour|hr|day|week|month|year)s?\s+ago$")
+_MONTH_DAY = re.compile(r"^([a-z]{3})[a-z]*\.?\s+(\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(\d{4}))?$")
+_DAY_MONTH = re.compile(r"^(\d{1,2})(?:st|nd|rd|th)?\s+([a-z]{3})[a-z]*\.?,?(?:\s+(\d{4}))?$")
+_NUMERIC = re.compile(r"^(\d{1,2})[/.](\d{1,2})[/.](\d{4})$")
+_PREFIX = re.compile(r"^(posted|reposted|active|updated)(\s+on)?[:\s]+")
+
+# (kind, value): ("at", datetime) | ("ago", timedelta) | ("md", (month, day)) | None
+Parsed = Optional[Tuple[str, Union[datetime, timedelta, Tuple[int, int]]]]
+
+
+def _date(year: int, month: int, day: int) -> Optional[datetime]:
+    try:
+        return datetime(year, month, day)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _parse(text: str) -> Parsed:
+    s = _PREFIX.sub("", text.strip().lower())
+    if not s:
+        return None
+    if s in NAMED:
+        return "ago", timedelta(days=NAMED[s])
+    m = _AGO.match(s)
+    if m:
+        n = 1 if m.group(1) in ("a", "an", "one") else int(m.group(1))
+        return "ago", n * UNITS[m.group(2)]
+    at: Optional[datetime]
+    if s[:1].isdigit() and "-" in s:
+        try:
+            at = datetime.fromisoformat(s.upper().replace("Z", "+00:00"))
+        except ValueError:
+            pass
+        else:
+            offset = at.utcoffset()
+            if offset is not None:
+                at = (at - offset).replace(tzinfo=None)
+            return "at", at
+    m = _NUMERIC.match(s)
+    if m:
+        at = _date(int(m.group(3)), int(m.group(2)), int(m.group(1)))
+        return ("at", at) if at else None
+    m = _MONTH_DAY.match(s)
+    if m:
+        month, day, year = m.group(1), m.group(2), m.group(3)
+    else:
+        m = _DAY_MONTH.match(s)
+        if not m:
+            return None
+        day, month, year = m.group(1), m.group(2), m.group(3)
+    if month not in MONTHS:
+        return None
+    if year:
+        at = _date(int(year), MONTHS[month], int(day))
+        return ("at", at) if at else None
+    if not _date(2000, MONTHS[month], int(day)):  # leap year, so Feb 29 is accepted
+        return None
+    return "md", (MONTHS[month], int(day))
+
+
+def parse_posted_date(raw, now: Optional[datetime] = None) -> Optional[datetime]:
+    """The posting time `raw` describes, relative to `now` (UTC); None if unparseable"""
+    if not raw or not isinstance(raw, str):
+        return None
+    parsed = _parse(raw)
+    if parsed is None:
+        return None
+    _, value = parsed
+    if isinstance(value, datetime):
+        return value
+    now = now or datetime.utcnow()
+    if isinstance(value, timedelta):
+        return now - value
+    month, day = value
+    # Feb 29 can be up to 8 years back (across a skipped century leap year)
+    for year in range(now.year, now.year - 9, -1):
+        at = _date(year, month, day)
+        if at and at.date() <= now.date():
+            return at
+    return None
+
+
+def recent_jobs(days: int = 7, limit: Optional[int] = None, session_factory=None) -> List[object]:
+    """Jobs posted in the last `days` days, newest first (an index range scan on posted_at)"""
+    try:
+        from sqlalchemy import select
+
+        from src.db import get_session
+        from src.models import Job
+    except Exception:
+        print("DB helpers not available; ensure src/db.py and src/models.py exist.")
+        return []
+
+    since = datetime.utcnow() - timedelta(days=days)
+    stmt = select(Job).where(Job.posted_at >= since).order_by(Job.posted_at.desc())
+    if limit:
+        stmt = stmt.limit(limit)
+    sess = (session_factory or get_session)()
+    try:
+        return sess.execute(stmt).scalars().all()
+    finally:
+        sess.close()
+
+
+def backfill_posted_at(now: Optional[datetime] = None, batch_size: int = 5000, session_factory=None) -> int:
+    """Fill posted_at for rows that only have the raw string; returns rows updated.
+
+    Relative dates are resolved against each row's created_at, which is when
+    the string was scraped, not against the current time.
+    """
+    try:
+        from sqlalchemy import select, update
+
+        from src.db import get_session
+        from src.models import Job
+    except Exception:
+        print("DB helpers not available; ensure src/db.py and src/models.py exist.")
+        return 0
+
+    updated, last_id = 0, 0
+    sess = (session_factory or get_session)()
+    try:
+        while True:
+            rows = sess.execute(
+                select(Job.id, Job.posted_date, Job.created_at)
+                .where(Job.id > last_id, Job.posted_at.is_(None), Job.posted_date != "")
+                .order_by(Job.id).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            changes = [{"id": r.id, "posted_at": at} for r in rows
+                       if (at := parse_posted_date(r.posted_date, r.created_at or now))]
+            if changes:
+                sess.execute(update(Job), changes)
+                sess.commit()
+                updated += len(changes)
+    except Exception as e:
+        print("Error backfilling posted_at:", e)
+        sess.rollback()
+    finally:
+        sess.close()
+    return updated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Normalize job posting dates")
+    parser.add_argument("--backfill", action="store_true", help="fill posted_at for existing rows")
+    args = parser.parse_args(argv)
+    if not args.backfill:
+        parser.print_help()
+        return
+
+    from src.db import init_db
+
+    init_db()
+    print(f"posted_at filled for {backfill_posted_at()} jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 
 # Load environment variables from .env if present
 import os
+import time
+from datetime import datetime
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -13,6 +15,8 @@ try:
 except Exception:
     requests = None
     _REQUESTS_AVAILABLE = False
+from src import metrics
+from src.tracing import span, traced
 
 API_KEY = os.getenv("PERPLEXITY_API_KEY", "")
 ENABLED = os.getenv("ENABLE_PERPLEXITY", "false").lower() in ("1", "true", "yes")
@@ -105,6 +109,7 @@ RETURN FORMAT (JSON only)
 Output ONLY the JSON.
 """.strip()
 
+@traced("pplx.search")
 def search_perplexity(prompt, dry_run=True):
     """
     Search Perplexity API with the given prompt.
@@ -130,73 +135,93 @@ def search_perplexity(prompt, dry_run=True):
         import requests as _requests
         headers = {"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"}
         payload = {"query": prompt, "format": "json"}
-        resp = _requests.post(PERPLEXITY_API_URL, headers=headers, json=payload, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
+        started = time.perf_counter()
+        with span("pplx.search.http"):
+            resp = _requests.post(PERPLEXITY_API_URL, headers=headers, json=payload, timeout=30)
+            resp.raise_for_status()
+        metrics.PPLX_LATENCY.observe(time.perf_counter() - started)
+        metrics.PPLX_REQUESTS.labels(outcome="ok").inc()
+        with span("pplx.search.parse_json", bytes=len(resp.content)):
+            return resp.json()
     except Exception as e:
         # Catch broad exceptions here but keep the message concise for debugging.
+        metrics.PPLX_REQUESTS.labels(outcome="error").inc()
         print("Error during Perplexity API call:", e)
         return []
 
 
-def normalize_perplexity_results(raw_results) -> list:
-    """Normalize raw Perplexity results (list or dict) into internal job dicts.
+@traced("pplx.normalize")
+def normalize_perplexity_results(raw_results, source: str = "perplexity") -> list:
+    """Normalize raw Perplexity results (list, envelope or single job) into internal job dicts.
 
-    Expected to return a list of dicts with keys: id, title, company, location, platform, apply_url, description, posted_date, status
+    Returns dicts with keys: id, title, company, location, platform, apply_url, description, posted_date, posted_at, status.
+    `id` is a stable content hash (see src/job_schema.py); items without a title or company are dropped.
     """
-    jobs = []
-    if not raw_results:
-        return jobs
-    # If raw_results is a dict with 'results' key, try to extract
-    items = raw_results if isinstance(raw_results, list) else raw_results.get("results") or raw_results
-    if not isinstance(items, list):
-        return jobs
-    for idx, it in enumerate(items, start=1):
-        # Try common fields, fall back to safe names
-        company = it.get("company") or it.get("employer") or ""
-        title = it.get("title") or it.get("job_title") or ""
-        location = it.get("location") or it.get("place") or ""
-        apply_url = it.get("apply_url") or it.get("url") or it.get("link") or ""
-        description = it.get("description_snippet") or it.get("description") or ""
-        posted_date = it.get("posted_date") or it.get("date") or ""
-        jobs.append(
-            {
-                "id": idx,
-                "title": title,
-                "company": company,
-                "location": location,
-                "platform": it.get("platform", "perplexity"),
-                "apply_url": apply_url,
-                "description": description,
-                "posted_date": posted_date,
-                "status": "NOT_APPLIED",
-            }
-        )
+    jobs, report = normalize_with_report(raw_results, source)
     return jobs
 
 
-def save_jobs_to_file(jobs: list, out_path: str = "data/imports/sample_jobs.json"):
-    """Save normalized jobs to a JSON file (creates parent dir if needed)."""
+def normalize_with_report(raw_results, source: str = "perplexity"):
+    """Like normalize_perplexity_results, but also return the validation/coverage report"""
+    from src.job_schema import normalize
+
+    jobs, report = normalize(raw_results, source)
+    if report["invalid"] or report["duplicates"]:
+        print(f"Normalized {report['valid']}/{report['items']} items "
+              f"({report['invalid']} invalid, {report['duplicates']} duplicates)")
+    metrics.JOBS_NORMALIZED.inc(len(jobs))
+    return jobs, report
+
+
+def save_jobs_to_file(jobs: list, out_path: str = "data/imports", prefix: str = "search"):
+    """Append normalized jobs to the NDJSON search log in `out_path`.
+
+    Cost is proportional to len(jobs), not to what is already on disk.
+    Segments rotate by size and date (see src/ndjson_store.py), and
+    src.job_imports picks up the appended lines incrementally. A path ending
+    in .json still writes a single pretty-printed file, as before.
+    """
     from pathlib import Path
 
     p = Path(out_path)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    import json
+    if p.suffix == ".json":
+        import json
+
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(jobs, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Saved {len(jobs)} jobs to {p}")
+        return p
 
-    p.write_text(json.dumps(jobs, indent=2, ensure_ascii=False), encoding="utf-8")
-    print(f"Saved {len(jobs)} jobs to {p}")
+    from src.ndjson_store import NDJSONWriter
 
+    with NDJSONWriter(p, prefix=prefix) as writer:
+        writer.extend(jobs)
+    print(f"Appended {len(jobs)} jobs to {writer.path}")
+    return writer.path
 
+
+def _set_platform_fields(job, classify_url, parse_job_url):
+    """Store the ATS platform and posting identifiers parsed from apply_url."""
+    ref = parse_job_url(job.apply_url or "")
+    job.platform = ref.platform if ref else classify_url(job.apply_url or "")
+    job.board_token = ref.board_token if ref else None
+    job.posting_id = ref.posting_id if ref else None
+
+
+@traced("db.insert_jobs")
 def insert_jobs_into_db(jobs: list):
     """Insert or update jobs into the local database using src.models.Job"""
     try:
         from src.db import get_session
         from src.models import Job
+        from src.platforms import classify_url, parse_job_url
     except Exception:
         print("DB helpers not available; ensure src/db.py and src/models.py exist.")
         return 0
 
-    inserted = 0
+    inserted = updated = 0
+    started = time.perf_counter()
+    now = datetime.utcnow()
     sess = get_session()
     try:
         for j in jobs:
@@ -211,6 +236,9 @@ def insert_jobs_into_db(jobs: list):
                 existing.location = j.get("location") or existing.location
                 existing.description = j.get("description") or existing.description
                 existing.posted_date = j.get("posted_date") or existing.posted_date
+                existing.posted_at = _posted_at(j, now) or existing.posted_at
+                _set_platform_fields(existing, classify_url, parse_job_url)
+                updated += 1
             else:
                 nj = Job(
                     title=j.get("title") or "",
@@ -219,11 +247,16 @@ def insert_jobs_into_db(jobs: list):
                     apply_url=j.get("apply_url") or "",
                     description=j.get("description") or "",
                     posted_date=j.get("posted_date") or "",
+                    posted_at=_posted_at(j, now),
                     status=j.get("status") or "NOT_APPLIED",
                 )
+                _set_platform_fields(nj, classify_url, parse_job_url)
                 sess.add(nj)
                 inserted += 1
         sess.commit()
+        metrics.JOBS_INGESTED.labels(mode="insert", result="inserted").inc(inserted)
+        metrics.JOBS_INGESTED.labels(mode="insert", result="updated").inc(updated)
+        metrics.DB_WRITE_SECONDS.labels(op="insert_jobs").observe(time.perf_counter() - started)
     except Exception as e:
         print("Error inserting jobs into DB:", e)
         sess.rollback()
@@ -232,6 +265,118 @@ def insert_jobs_into_db(jobs: list):
 
     return inserted
 
+
+def _batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+_JOB_FIELDS = ("title", "company", "location", "apply_url", "description", "posted_date")
+
+
+def _posted_at(job: dict, now: datetime):
+    """The job's posting datetime: its normalized posted_at if set, else parsed from posted_date"""
+    from src.posted_dates import parse_posted_date
+
+    value = job.get("posted_at")
+    if isinstance(value, datetime):
+        return value
+    if value:
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            pass
+    return parse_posted_date(job.get("posted_date"), now)
+
+
+@traced("db.bulk_upsert_jobs")
+def bulk_upsert_jobs(jobs, batch_size: int = 5000, raise_errors: bool = False) -> int:
+    """Insert or update jobs in batches keyed on apply_url.
+
+    Accepts any iterable (including generators) and does one indexed lookup
+    per batch instead of one query per job. Existing rows only have non-empty
+    fields overwritten, matching insert_jobs_into_db. Returns rows inserted.
+    With raise_errors, a failed batch is re-raised after rollback instead of
+    only printed.
+    """
+    try:
+        from typing import cast
+
+        from sqlalchemy import Table, insert, select, update
+
+        from src.db import get_session
+        from src.models import Job
+        from src.platforms import classify_url, parse_job_url
+    except Exception:
+        print("DB helpers not available; ensure src/db.py and src/models.py exist.")
+        return 0
+
+    inserted = 0
+    sess = get_session()
+    try:
+        for batch in _batched(jobs, batch_size):
+            with span("db.bulk_upsert_jobs.batch", rows=len(batch)):
+                started = time.perf_counter()
+                now = datetime.utcnow()
+                rows = {}
+                unkeyed = []
+                for j in batch:
+                    row = {f: j.get(f) or "" for f in _JOB_FIELDS}
+                    ref = parse_job_url(row["apply_url"])
+                    row["platform"] = ref.platform if ref else classify_url(row["apply_url"])
+                    row["board_token"] = ref.board_token if ref else None
+                    row["posting_id"] = ref.posting_id if ref else None
+                    row["posted_at"] = _posted_at(j, now)
+                    row["status"] = j.get("status") or "NOT_APPLIED"
+                    if row["apply_url"]:
+                        rows[row["apply_url"]] = row  # last duplicate in a batch wins
+                    else:
+                        unkeyed.append(row)
+
+                existing = {}
+                urls = list(rows)
+                for i in range(0, len(urls), 900):  # stay under SQLite's bound-parameter limit
+                    chunk = urls[i:i + 900]
+                    existing.update(sess.execute(select(Job.apply_url, Job.id).where(Job.apply_url.in_(chunk))).all())
+
+                updates = []
+                new_rows = unkeyed
+                for url, row in rows.items():
+                    if url in existing:
+                        changes = {k: v for k, v in row.items() if v and k != "status"}
+                        changes["id"] = existing[url]
+                        updates.append(changes)
+                    else:
+                        new_rows.append(row)
+
+                if updates:
+                    sess.execute(update(Job), updates)
+                if new_rows:
+                    # Core executemany on the table; ORM bulk insert is ~10x slower here.
+                    sess.execute(insert(cast(Table, Job.__table__)), new_rows)
+                    inserted += len(new_rows)
+                sess.commit()
+                metrics.JOBS_INGESTED.labels(mode="bulk", result="inserted").inc(len(new_rows))
+                metrics.JOBS_INGESTED.labels(mode="bulk", result="updated").inc(len(updates))
+                metrics.DB_WRITE_SECONDS.labels(op="bulk_upsert_batch").observe(
+                    time.perf_counter() - started)
+    except Exception as e:
+        print("Error bulk inserting jobs into DB:", e)
+        sess.rollback()
+        if raise_errors:
+            raise
+    finally:
+        sess.close()
+
+    return inserted
+
+
 if __name__ == "__main__":
     # Example usage: dry run
     prompt = build_omar_prompt()
@@ -0,0 +1,384 @@
+"""
+PR Merge Readiness Checker
+Analyzes open pull requests to determine which ones are ready to be merged.
+
+Importable so the Streamlit app can run a check in-process:
+
+    report = check_prs("letter-orgz", "job-O-matic-", token, session=session,
+                       on_progress=lambda done, total, pr: ...)
+
+`scripts/check-pr-merge-readiness.py` is the command-line wrapper.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import requests
+
+DEFAULT_REPO_OWNER = os.getenv("GITHUB_REPOSITORY_OWNER", "letter-orgz")
+DEFAULT_REPO_NAME = os.getenv("GITHUB_REPOSITORY_NAME", "job-O-matic-")
+PR_CHECK_WORKERS = int(os.getenv("PR_CHECK_WORKERS", "8"))
+
+# Check-run conclusions that count as passing; anything else completed is a failure
+PASSING_CONCLUSIONS = {"success", "neutral", "skipped"}
+
+# Rollups for commits whose checks have all finished never change, so they are
+# cached per (repository, sha) for the life of the process.
+_CHECKS_CACHE: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_CHECKS_CACHE_MAX = 2048
+_CHECKS_CACHE_LOCK = threading.Lock()
+
+
+def check_run_state(run: Dict[str, Any]) -> str:
+    if run.get("status") != "completed":
+        return "pending"
+    return "success" if run.get("conclusion") in PASSING_CONCLUSIONS else "failure"
+
+
+def rollup_states(states: Dict[str, str]) -> Dict[str, Any]:
+    """Roll per-check states ({context or check-run name: state}) into one.
+
+    Any failure or error wins, then anything still pending; otherwise success.
+    A commit with no checks at all stays "pending", as before.
+    """
+    values = set(states.values())
+    if "error" in values:
+        state = "error"
+    elif "failure" in values:
+        state = "failure"
+    elif "pending" in values or not values:
+        state = "pending"
+    else:
+        state = "success"
+    failing = [name for name, s in states.items() if s in ("failure", "error")]
+    return {"state": state, "total_count": len(states), "failing": failing, "states": states}
+
+
+def rollup_checks(status: Dict[str, Any], check_runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge the legacy combined status and check runs into one rollup"""
+    states = {s.get("context", "status"): s.get("state", "pending") for s in status.get("statuses", [])}
+    if not states and status.get("state") and status.get("total_count") is None:
+        states["status"] = status["state"]  # combined state without the per-context list
+    for run in check_runs:
+        states[run.get("name", "check")] = check_run_state(run)
+    return rollup_states(states)
+
+
+def clear_checks_cache() -> None:
+    with _CHECKS_CACHE_LOCK:
+        _CHECKS_CACHE.clear()
+
+
+def blocking_factors(readiness: Dict[str, Any]) -> List[str]:
+    """Reasons a readiness record cannot be merged (empty when it can)"""
+    factors = []
+    if readiness["draft"]:
+        factors.append("PR is marked as draft")
+
+    if readiness["mergeable"] is False:
+        factors.append("Has merge conflicts")
+
+    if readiness["checks_status"] != "success":
+        factor = f"Checks status: {readiness['checks_status']}"
+        if readiness.get("failing_checks"):
+            factor += f" ({', '.join(readiness['failing_checks'])})"
+        factors.append(factor)
+
+    if readiness["review_status"]["needs_approval"]:
+        factors.append("Needs review approval")
+
+    if readiness["review_status"]["has_requested_changes"]:
+        factors.append("Has requested changes")
+    return factors
+
+
+class PRChecker:
+    def __init__(self, repo_owner: str, repo_name: str, token: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
+        self.repo_owner = repo_owner
+        self.repo_name = repo_name
+        self.base_url = "https://api.github.com"
+        self.session = session or requests.Session()
+        self.headers = {
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "PR-Merge-Checker/1.0"
+        }
+        if token:
+            self.headers["Authorization"] = f"token {token}"
+
+    def get_open_prs(self) -> List[Dict[Any, Any]]:
+        """Fetch all open pull requests"""
+        url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/pulls"
+        params: Dict[str, Union[str, int]] = {"state": "open", "per_page": 100}
+
+        try:
+            response = self.session.get(url, headers=self.headers, params=params, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            print(f"Error fetching PRs: {e}")
+            return []
+
+    def get_pr_status(self, pr_number: int) -> Dict[str, Any]:
+        """Get the status of a specific PR"""
+        url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/pulls/{pr_number}"
+
+        try:
+            response = self.session.get(url, headers=self.headers, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            print(f"Error fetching PR #{pr_number}: {e}")
+            return {}
+
+    def get_pr_reviews(self, pr_number: int) -> List[Dict[Any, Any]]:
+        """Get every review for a PR, oldest first"""
+        url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/pulls/{pr_number}/reviews"
+        reviews: List[Dict[Any, Any]] = []
+        page = 1
+
+        try:
+            while True:
+                response = self.session.get(url, headers=self.headers,
+                                            params={"per_page": 100, "page": page}, timeout=30)
+                response.raise_for_status()
+                batch = response.json()
+                reviews.extend(batch)
+                if len(batch) < 100:
+                    return reviews
+                page += 1
+        except requests.RequestException as e:
+            print(f"Error fetching reviews for PR #{pr_number}: {e}")
+            return []
+
+    def get_commit_status(self, sha: str) -> Dict[str, Any]:
+        """Get the legacy combined status for a commit"""
+        url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/commits/{sha}/status"
+
+        try:
+            response = self.session.get(url, headers=self.headers, params={"per_page": 100}, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            print(f"Error fetching status for commit {sha}: {e}")
+            return {}
+
+    def get_check_runs(self, sha: str) -> Optional[List[Dict[str, Any]]]:
+        """Get every check run for a commit (None if the API call failed)"""
+        url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/commits/{sha}/check-runs"
+        runs: List[Dict[str, Any]] = []
+        page = 1
+
+        try:
+            while True:
+                response = self.session.get(url, headers=self.headers,
+                                            params={"per_page": 100, "page": page}, timeout=30)
+                response.raise_for_status()
+                data = response.json()
+                batch = data.get("check_runs", [])
+                runs.extend(batch)
+                if len(batch) < 100 or len(runs) >= data.get("total_count", 0):
+                    return runs
+                page += 1
+        except requests.RequestException as e:
+            print(f"Error fetching check runs for commit {sha}: {e}")
+            return None
+
+    def get_pr_checks(self, sha: str) -> Dict[str, Any]:
+        """Get the combined status + check-run rollup for a commit"""
+        key = (self.repo_owner, self.repo_name, sha)
+        with _CHECKS_CACHE_LOCK:
+            if key in _CHECKS_CACHE:
+                _CHECKS_CACHE.move_to_end(key)
+                return _CHECKS_CACHE[key]
+
+        status = self.get_commit_status(sha)
+        check_runs = self.get_check_runs(sha)
+        rollup = rollup_checks(status, check_runs or [])
+
+        # Only finished, fully fetched results are immutable
+        if status and check_runs is not None and rollup["state"] != "pending":
+            with _CHECKS_CACHE_LOCK:
+                _CHECKS_CACHE[key] = rollup
+                if len(_CHECKS_CACHE) > _CHECKS_CACHE_MAX:
+                    _CHECKS_CACHE.popitem(last=False)
+        return rollup
+
+    def get_checks_for_shas(self, shas: List[str], workers: int = PR_CHECK_WORKERS) -> Dict[str, Dict[str, Any]]:
+        """Fetch check rollups for distinct SHAs concurrently"""
+        unique = list(dict.fromkeys(shas))
+        if len(unique) <= 1 or workers <= 1:
+            return {sha: self.get_pr_checks(sha) for sha in unique}
+        with ThreadPoolExecutor(max_workers=min(workers, len(unique))) as pool:
+            return dict(zip(unique, pool.map(self.get_pr_checks, unique)))
+
+    def check_mergeable(self, pr_data: Dict[str, Any], checks: Optional[Dict[str, Any]] = None,
+                        review_status: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Check if a PR is mergeable.
+
+        `checks` is a prefetched rollup for its head SHA and `review_status` a
+        prefetched review summary; either is fetched here when not given.
+        """
+        pr_number = pr_data["number"]
+
+        # Get detailed PR info
+        detailed_pr = self.get_pr_status(pr_number)
+
+        # Get reviews
+        if review_status is None:
+            review_status = self._analyze_reviews(self.get_pr_reviews(pr_number))
+
+        # Get checks
+        if checks is None:
+            checks = self.get_pr_checks(pr_data["head"]["sha"])
+
+        # Analyze readiness
+        readiness = {
+            "pr_number": pr_number,
+            "title": pr_data["title"],
+            "author": pr_data["user"]["login"],
+            "head_sha": pr_data["head"]["sha"],
+            "draft": pr_data["draft"],
+            "mergeable": detailed_pr.get("mergeable", None),
+            "mergeable_state": detailed_pr.get("mergeable_state", "unknown"),
+            "checks_status": checks.get("state", "pending"),
+            "failing_checks": checks.get("failing", []),
+            "check_states": checks.get("states", {}),
+            "review_status": review_status,
+            "updated_at": pr_data["updated_at"],
+            "can_merge": False,
+            "blocking_factors": []
+        }
+
+        readiness["blocking_factors"] = blocking_factors(readiness)
+        # PR is ready if no blocking factors
+        readiness["can_merge"] = not readiness["blocking_factors"]
+
+        return readiness
+
+    def _analyze_reviews(self, reviews: List[Dict[Any, Any]]) -> Dict[str, Any]:
+        """Analyze review status"""
+        from src.pr_reviews import summarize_reviews
+
+        return summarize_reviews(reviews)
+
+    def review_analysis(self, pr_numbers: List[int], workers: int = PR_CHECK_WORKERS) -> Dict[int, Dict[str, Any]]:
+        """Fetch reviews for many PRs concurrently and summarize them in one vectorized pass"""
+        from src.pr_reviews import review_summaries
+
+        unique = list(dict.fromkeys(pr_numbers))
+        if len(unique) <= 1 or workers <= 1:
+            reviews = {n: self.get_pr_reviews(n) for n in unique}
+        else:
+            with ThreadPoolExecutor(max_workers=min(workers, len(unique))) as pool:
+                reviews = dict(zip(unique, pool.map(self.get_pr_reviews, unique)))
+        return review_summaries(reviews)
+
+    def build_report(self, on_progress: Optional[Callable[[int, int, Dict], None]] = None) -> Dict[str, Any]:
+        """Check every open PR and return the report dict (nothing is printed or saved).
+
+        on_progress(done, total, readiness) is called after each PR.
+        """
+        prs = self.get_open_prs()
+        # One concurrent fetch per distinct head SHA
+        checks = self.get_checks_for_shas([pr["head"]["sha"] for pr in prs])
+        reviews = self.review_analysis([pr["number"] for pr in prs])
+
+        ready_to_merge = []
+        needs_attention = []
+
+        for i, pr in enumerate(prs, start=1):
+            readiness = self.check_mergeable(pr, checks[pr["head"]["sha"]], reviews[pr["number"]])
+
+            if readiness["can_merge"]:
+                ready_to_merge.append(readiness)
+            else:
+                needs_attention.append(readiness)
+            if on_progress:
+                on_progress(i, len(prs), readiness)
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "repository": f"{self.repo_owner}/{self.repo_name}",
+            "ready_to_merge": ready_to_merge,
+            "needs_attention": needs_attention,
+            "summary": {
+                "total_prs": len(prs),
+                "ready_count": len(ready_to_merge),
+                "needs_attention_count": len(needs_attention)
+            }
+        }
+
+    def generate_report(self) -> None:
+        """Generate a comprehensive merge readiness report"""
+        from src.pr_reports import get_store
+
+        print("🔍 Checking PR merge readiness...")
+        print(f"Repository: {self.repo_owner}/{self.repo_name}")
+        print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print("=" * 60)
+
+        report_data = self.build_report()
+
+        if not report_data["summary"]["total_prs"]:
+            print("No open pull requests found.")
+            return
+
+        ready_to_merge = report_data["ready_to_merge"]
+        needs_attention = report_data["needs_attention"]
+
+        # Print ready to merge PRs
+        print(f"\n✅ READY TO MERGE ({len(ready_to_merge)} PRs)")
+        print("-" * 40)
+        if ready_to_merge:
+            for pr in ready_to_merge:
+                print(f"#{pr['pr_number']}: {pr['title']}")
+                print(f"   Author: {pr['author']}")
+                print(f"   Updated: {pr['updated_at']}")
+                print()
+        else:
+            print("No PRs are currently ready to merge.")
+
+        # Print PRs needing attention
+        print(f"\n⚠️  NEEDS ATTENTION ({len(needs_attention)} PRs)")
+        print("-" * 40)
+        for pr in needs_attention:
+            print(f"#{pr['pr_number']}: {pr['title']}")
+            print(f"   Author: {pr['author']}")
+            print("   Blocking factors:")
+            for factor in pr["blocking_factors"]:
+                print(f"     • {factor}")
+            print()
+
+        # Summary
+        print("=" * 60)
+        print(f"SUMMARY: {len(ready_to_merge)} ready, {len(needs_attention)} need attention")
+
+        # Write the report and update reports/index.json; archive old reports
+        store = get_store()
+        report_file = store.save(report_data)
+        store.compact()
+
+        print(f"Detailed report saved to: {report_file}")
+
+        try:
+            from src.pr_history import record_report
+            from src.pr_state import replace_from_report
+
+            record_report(report_data)
+            replace_from_report(report_data)
+        except Exception as e:
+            print(f"Could not record PR history: {e}")
+
+
+def check_prs(repo_owner: str = DEFAULT_REPO_OWNER, repo_name: str = DEFAULT_REPO_NAME,
+              token: Optional[str] = None, session: Optional[requests.Session] = None,
+              on_progress: Optional[Callable[[int, int, Dict], None]] = None) -> Dict[str, Any]:
+    """Run a readiness check in-process and return the report dict."""
+    if token is None:
+        token = os.getenv("GITHUB_TOKEN")
+    return PRChecker(repo_owner, repo_name, token, session=session).build_report(on_progress)
@@ -0,0 +1,305 @@
+"""PR readiness history and rollups.
+
+Every readiness check appends one `pr_readiness_runs` row for the report and
+one `pr_readiness_history` row per PR, and updates two precomputed tables in
+the same transaction:
+
+* `pr_readiness_rollup` holds one row per PR. It tracks time-to-ready, from
+  the first time the checker saw the PR to the first ready snapshot. It also
+  tracks time in draft, summed across the gaps between snapshots while the PR
+  was a draft. Its flaky-check count is the number of failure<->success flips
+  on the same head SHA.
+* `pr_readiness_daily` holds per-day snapshot counts for trend charts.
+
+Readers only touch the rollup tables through their (repository, ...) indexes,
+so charts over months of history never load old report files.
+
+Usage:
+    python -m src.pr_history --backfill   # import existing reports/ once
+"""
+
+import argparse
+import json
+import statistics
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+FINAL_CHECK_STATES = ("success", "failure", "error")
+_FAILED = ("failure", "error")
+
+
+def _default_session_factory():
+    from src.db import get_session, init_db
+
+    init_db()
+    return get_session
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _snapshot_row(repository: str, captured_at: datetime, pr: dict) -> dict:
+    reviews = pr.get("review_status") or {}
+    return {
+        "repository": repository,
+        "pr_number": pr["pr_number"],
+        "captured_at": captured_at,
+        "title": pr.get("title"),
+        "author": pr.get("author"),
+        "head_sha": pr.get("head_sha"),
+        "draft": bool(pr.get("draft")),
+        "mergeable": pr.get("mergeable"),
+        "checks_status": pr.get("checks_status"),
+        "review_count": reviews.get("review_count", 0),
+        "has_approval": bool(reviews.get("has_approval")),
+        "has_requested_changes": bool(reviews.get("has_requested_changes")),
+        "can_merge": bool(pr.get("can_merge")),
+        "blocking_factors": json.dumps(pr.get("blocking_factors") or []),
+    }
+
+
+def _is_flip(before: Optional[str], after: Optional[str]) -> bool:
+    """A failed check turning green (or back) without a new commit."""
+    return (before == "success" and after in _FAILED) or (before in _FAILED and after == "success")
+
+
+def _new_rollup(repository: str, row: dict):
+    from src.models import PRRollup
+
+    captured = row["captured_at"]
+    return PRRollup(
+        repository=repository,
+        pr_number=row["pr_number"],
+        title=row["title"],
+        first_seen_at=captured,
+        last_seen_at=captured,
+        first_ready_at=captured if row["can_merge"] else None,
+        time_to_ready_seconds=0 if row["can_merge"] else None,
+        draft_seconds=0,
+        snapshots=1,
+        check_runs_seen=1 if row["checks_status"] in FINAL_CHECK_STATES else 0,
+        flaky_flips=0,
+        last_draft=row["draft"],
+        last_checks_status=row["checks_status"],
+        last_head_sha=row["head_sha"],
+        last_can_merge=row["can_merge"],
+    )
+
+
+def _update_rollup(rollup, row: dict) -> None:
+    captured = row["captured_at"]
+    rollup.snapshots = (rollup.snapshots or 0) + 1
+    if row["checks_status"] in FINAL_CHECK_STATES:
+        rollup.check_runs_seen = (rollup.check_runs_seen or 0) + 1
+    if captured <= rollup.last_seen_at:
+        return  # out-of-order snapshot: counted, but interval metrics stay as they are
+
+    if rollup.last_draft:
+        rollup.draft_seconds = (rollup.draft_seconds or 0) + int((captured - rollup.last_seen_at).total_seconds())
+    if row["can_merge"] and rollup.first_ready_at is None:
+        rollup.first_ready_at = captured
+        rollup.time_to_ready_seconds = int((captured - rollup.first_seen_at).total_seconds())
+    if row["head_sha"] and row["head_sha"] == rollup.last_head_sha and _is_flip(rollup.last_checks_status, row["checks_status"]):
+        rollup.flaky_flips = (rollup.flaky_flips or 0) + 1
+
+    rollup.title = row["title"]
+    rollup.last_seen_at = captured
+    rollup.last_draft = row["draft"]
+    rollup.last_checks_status = row["checks_status"]
+    rollup.last_head_sha = row["head_sha"]
+    rollup.last_can_merge = row["can_merge"]
+
+
+def record_report(report: dict, session_factory=None) -> int:
+    """Append snapshots for every PR in a report and update the rollups.
+
+    Recording the same report (repository + timestamp) twice is a no-op, even
+    when it has no PRs: each recorded report gets a `pr_readiness_runs` row.
+    Reports without a parseable timestamp are skipped, since they could not
+    be deduplicated. Returns the number of snapshots written.
+    """
+    from sqlalchemy import insert, select
+    from sqlalchemy.exc import IntegrityError
+
+    from src.models import PRDailyRollup, PRReportRun, PRRollup, PRSnapshot
+
+    session_factory = session_factory or _default_session_factory()
+    repository = report.get("repository") or ""
+    captured_at = _parse_timestamp(report.get("timestamp"))
+    if captured_at is None:
+        print(f"Skipping PR report without a valid timestamp: {report.get('timestamp')!r}")
+        return 0
+    prs = list(report.get("ready_to_merge", [])) + list(report.get("needs_attention", []))
+    rows = [_snapshot_row(repository, captured_at, pr) for pr in prs]
+
+    sess = session_factory()
+    try:
+        already = sess.execute(
+            select(PRReportRun.id).where(PRReportRun.repository == repository,
+                                         PRReportRun.captured_at == captured_at)
+        ).first() or sess.execute(
+            # Reports recorded before pr_readiness_runs existed only left snapshots
+            select(PRSnapshot.id).where(PRSnapshot.repository == repository,
+                                        PRSnapshot.captured_at == captured_at).limit(1)
+        ).first()
+        if already:
+            return 0
+        try:
+            # The unique run row also stops two concurrent recorders of one report
+            sess.add(PRReportRun(repository=repository, captured_at=captured_at, pr_count=len(rows)))
+            sess.flush()
+        except IntegrityError:
+            sess.rollback()
+            return 0
+        if rows:
+            sess.execute(insert(PRSnapshot), rows)
+
+        numbers = [r["pr_number"] for r in rows]
+        rollups = {
+            r.pr_number: r
+            for r in sess.execute(
+                select(PRRollup).where(PRRollup.repository == repository, PRRollup.pr_number.in_(numbers))
+            ).scalars()
+        } if numbers else {}
+        for row in rows:
+            rollup = rollups.get(row["pr_number"])
+            if rollup is None:
+                rollups[row["pr_number"]] = rollup = _new_rollup(repository, row)
+                sess.add(rollup)
+            else:
+                _update_rollup(rollup, row)
+
+        day = captured_at.strftime("%Y-%m-%d")
+        daily = sess.execute(
+            select(PRDailyRollup).where(PRDailyRollup.repository == repository, PRDailyRollup.day == day)
+        ).scalar_one_or_none()
+        if daily is None:
+            daily = PRDailyRollup(repository=repository, day=day, runs=0, pr_snapshots=0,
+                                  ready_snapshots=0, draft_snapshots=0,
+                                  failing_check_snapshots=0, conflict_snapshots=0)
+            sess.add(daily)
+        daily.runs += 1
+        daily.pr_snapshots += len(rows)
+        daily.ready_snapshots += sum(r["can_merge"] for r in rows)
+        daily.draft_snapshots += sum(r["draft"] for r in rows)
+        daily.failing_check_snapshots += sum(r["checks_status"] in _FAILED for r in rows)
+        daily.conflict_snapshots += sum(r["mergeable"] is False for r in rows)
+
+        sess.commit()
+        return len(rows)
+    except Exception:
+        sess.rollback()
+        raise
+    finally:
+        sess.close()
+
+
+def daily_trend(repository: str, days: int = 180, session_factory=None) -> List[dict]:
+    """Per-day counts for the last `days` days, oldest first."""
+    from sqlalchemy import select
+
+    from src.models import PRDailyRollup
+
+    session_factory = session_factory or _default_session_factory()
+    since = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    sess = session_factory()
+    try:
+        rows = sess.execute(
+            select(PRDailyRollup)
+            .where(PRDailyRollup.repository == repository, PRDailyRollup.day >= since)
+            .order_by(PRDailyRollup.day)
+        ).scalars().all()
+        return [
+            {
+                "day": r.day,
+                "runs": r.runs,
+                "avg_open_prs": r.pr_snapshots / r.runs if r.runs else 0,
+                "ready_share": r.ready_snapshots / r.pr_snapshots if r.pr_snapshots else 0,
+                "draft_share": r.draft_snapshots / r.pr_snapshots if r.pr_snapshots else 0,
+                "failing_checks_share": r.failing_check_snapshots / r.pr_snapshots if r.pr_snapshots else 0,
+                "conflict_share": r.conflict_snapshots / r.pr_snapshots if r.pr_snapshots else 0,
+            }
+            for r in rows
+        ]
+    finally:
+        sess.close()
+
+
+def pr_rollups(repository: str, limit: Optional[int] = 200, session_factory=None) -> List[dict]:
+    """Per-PR rollups, most recently seen first."""
+    from sqlalchemy import select
+
+    from src.models import PRRollup
+
+    session_factory = session_factory or _default_session_factory()
+    sess = session_factory()
+    try:
+        stmt = (select(PRRollup).where(PRRollup.repository == repository)
+                .order_by(PRRollup.last_seen_at.desc()))
+        if limit:
+            stmt = stmt.limit(limit)
+        return [
+            {
+                "pr_number": r.pr_number,
+                "title": r.title,
+                "first_seen_at": r.first_seen_at,
+                "last_seen_at": r.last_seen_at,
+                "time_to_ready_hours": None if r.time_to_ready_seconds is None else r.time_to_ready_seconds / 3600,
+                "draft_hours": (r.draft_seconds or 0) / 3600,
+                "snapshots": r.snapshots,
+                "flaky_flips": r.flaky_flips,
+                "ready": r.last_can_merge,
+            }
+            for r in sess.execute(stmt).scalars()
+        ]
+    finally:
+        sess.close()
+
+
+def rollup_summary(repository: str, session_factory=None) -> Dict[str, Optional[float]]:
+    """Headline numbers across all tracked PRs."""
+    rows = pr_rollups(repository, limit=None, session_factory=session_factory)
+    ready_times = [r["time_to_ready_hours"] for r in rows if r["time_to_ready_hours"] is not None]
+    flips = sum(r["flaky_flips"] or 0 for r in rows)
+    runs = sum(r["snapshots"] or 0 for r in rows)
+    return {
+        "prs_tracked": len(rows),
+        "median_time_to_ready_hours": statistics.median(ready_times) if ready_times else None,
+        "mean_draft_hours": statistics.fmean(r["draft_hours"] for r in rows) if rows else 0.0,
+        "flaky_flips_per_100_snapshots": 100 * flips / runs if runs else 0.0,
+    }
+
+
+def backfill_from_reports(store=None, session_factory=None) -> int:
+    """Record every report known to the report store (already recorded ones are skipped)."""
+    if store is None:
+        from src.pr_reports import get_store
+
+        store = get_store()
+    session_factory = session_factory or _default_session_factory()
+    written = 0
+    for row in sorted(store.summaries(), key=lambda r: r["file"]):
+        report = store.load(row["file"])
+        if report:
+            written += record_report(report, session_factory)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PR readiness history")
+    parser.add_argument("--backfill", action="store_true", help="import reports/ into the history tables")
+    args = parser.parse_args(argv)
+    if args.backfill:
+        print(f"Recorded {backfill_from_reports()} PR snapshots")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""Store for PR merge-readiness reports.
+
+Reports are written as `reports/pr-merge-readiness-<timestamp>.json` as
+before, and `reports/index.json` holds a pointer to the latest one plus a
+summary row per report. Readers check the index mtime instead of globbing and
+stat-ing the whole directory. Parsed files are cached by (path, mtime), so an
+unchanged report is never parsed twice.
+
+Retention: `compact()` keeps the newest `keep_last` reports as individual
+files and folds older ones into gzip'd monthly NDJSON archives
+(`reports/archive/pr-merge-readiness-YYYYMM.ndjson.gz`). Their summary rows stay
+in the index. `prune()` drops reports and summary rows past a maximum age,
+rewriting any archive that still holds newer reports.
+
+The app and the CLI can share a reports directory, so every index update holds
+an exclusive flock on `reports/.index.lock` as well as the in-process lock.
+"""
+
+import gzip
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+
+    HAVE_FLOCK = True
+except ImportError:  # Windows: single process only
+    HAVE_FLOCK = False
+
+REPORTS_DIR = Path("reports")
+REPORT_PREFIX = "pr-merge-readiness-"
+INDEX_FILENAME = "index.json"
+LOCK_FILENAME = ".index.lock"
+PR_REPORT_RETENTION = int(os.getenv("PR_REPORT_RETENTION", "50"))
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_archive(path: Path) -> List[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _summary_row(filename: str, report: dict) -> dict:
+    summary = report.get("summary", {})
+    return {
+        "file": filename,
+        "timestamp": report.get("timestamp"),
+        "repository": report.get("repository"),
+        "total_prs": summary.get("total_prs", 0),
+        "ready_count": summary.get("ready_count", 0),
+        "needs_attention_count": summary.get("needs_attention_count", 0),
+        "archive": None,
+    }
+
+
+class ReportStore:
+    def __init__(self, reports_dir=REPORTS_DIR):
+        self.reports_dir = Path(reports_dir)
+        self.index_path = self.reports_dir / INDEX_FILENAME
+        self._lock = threading.RLock()
+        self._held = False  # this instance already holds the file lock
+        self._parsed: Dict[Path, tuple] = {}  # path -> (mtime_ns, data)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive lock shared by every thread and process writing this directory"""
+        with self._lock:
+            if self._held:  # re-entered, e.g. save() -> index() -> rebuild_index()
+                yield
+                return
+            self.reports_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.reports_dir / LOCK_FILENAME, "ab") as f:
+                if HAVE_FLOCK:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # released when f is closed
+                self._held = True
+                try:
+                    yield
+                finally:
+                    self._held = False
+
+    # -- reading ---------------------------------------------------------------
+
+    def _load_json(self, path: Path):
+        """Parse `path`, reusing the cached object while its mtime is unchanged."""
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._parsed.pop(path, None)
+            return None
+        cached = self._parsed.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        self._parsed[path] = (mtime, data)
+        return data
+
+    def index(self) -> dict:
+        """The index, rebuilt from a directory scan if it is missing."""
+        data = self._load_json(self.index_path)
+        if data is None:
+            if not self.reports_dir.exists():
+                return {"latest": None, "reports": []}
+            data = self.rebuild_index()
+        return data
+
+    def latest_path(self) -> Optional[Path]:
+        latest = self.index().get("latest")
+        return self.reports_dir / latest if latest else None
+
+    def latest(self) -> Optional[dict]:
+        """The most recent report, or None if none exist."""
+        path = self.latest_path()
+        if path is None:
+            return None
+        data = self._load_json(path)
+        if data is None:  # deleted behind our back; fall back to a rescan
+            self.rebuild_index()
+            path = self.latest_path()
+            data = self._load_json(path) if path else None
+        return data
+
+    def summaries(self) -> List[dict]:
+        """One summary row per report (including archived ones), oldest first."""
+        return list(self.index().get("reports", []))
+
+    def load(self, filename: str) -> Optional[dict]:
+        """A specific report, from its file or its monthly archive."""
+        path = self.reports_dir / filename
+        if path.exists():
+            return self._load_json(path)
+        row = next((r for r in self.summaries() if r["file"] == filename), None)
+        if row and row.get("archive"):
+            with gzip.open(self.reports_dir / row["archive"], "rt", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if entry.get("file") == filename:
+                        return entry["report"]
+        return None
+
+    # -- writing ---------------------------------------------------------------
+
+    def _write_index(self, index: dict) -> None:
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self.index_path, json.dumps(index, indent=1))
+        self._parsed[self.index_path] = (self.index_path.stat().st_mtime_ns, index)
+
+    def save(self, report: dict, when: Optional[datetime] = None) -> Path:
+        """Write a report file and record it in the index; returns the file path."""
+        when = when or datetime.now()
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        filename = f"{REPORT_PREFIX}{when.strftime('%Y%m%d-%H%M%S')}.json"
+        path = self.reports_dir / filename
+        _atomic_write(path, json.dumps(report, indent=2))
+        with self._locked():
+            index = self.index()
+            rows = [r for r in index.get("reports", []) if r["file"] != filename]
+            rows.append(_summary_row(filename, report))
+            self._write_index({"latest": filename, "reports": rows})
+        return path
+
+    def rebuild_index(self) -> dict:
+        """Scan the reports directory once and write a fresh index."""
+        with self._locked():
+            files = sorted(self.reports_dir.glob(f"{REPORT_PREFIX}*.json"))
+            rows = []
+            for archive in sorted((self.reports_dir / "archive").glob("*.ndjson.gz")):
+                for entry in _read_archive(archive):
+                    row = _summary_row(entry["file"], entry["report"])
+                    row["archive"] = f"archive/{archive.name}"
+                    rows.append(row)
+            for path in files:
+                try:
+                    rows.append(_summary_row(path.name, json.loads(path.read_text(encoding="utf-8"))))
+                except (OSError, ValueError) as e:
+                    print(f"Skipping unreadable report {path.name}:", e)
+            rows.sort(key=lambda r: r["file"])
+            index = {"latest": files[-1].name if files else None, "reports": rows}
+            self._write_index(index)
+            return index
+
+    def compact(self, keep_last: int = PR_REPORT_RETENTION) -> int:
+        """Move all but the newest `keep_last` report files into monthly archives."""
+        with self._locked():
+            index = self.index()
+            live = [r for r in index["reports"] if not r.get("archive")]
+            old = live[:-max(1, keep_last)]  # never archive the latest report
+            if not old:
+                return 0
+            archive_dir = self.reports_dir / "archive"
+            archive_dir.mkdir(exist_ok=True)
+            moved = 0
+            for row in old:
+                path = self.reports_dir / row["file"]
+                report = self._load_json(path)
+                if report is None:
+                    continue
+                month = row["file"][len(REPORT_PREFIX):len(REPORT_PREFIX) + 6]
+                archive = f"archive/{REPORT_PREFIX}{month}.ndjson.gz"
+                with gzip.open(self.reports_dir / archive, "at", encoding="utf-8") as f:
+                    f.write(json.dumps({"file": row["file"], "report": report}) + "\n")
+                row["archive"] = archive
+                path.unlink()
+                self._parsed.pop(path, None)
+                moved += 1
+            self._write_index(index)
+            return moved
+
+    def prune(self, max_age_days: int) -> int:
+        """Delete reports, archive entries and summary rows older than `max_age_days`."""
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime("%Y%m%d")
+        with self._locked():
+            index = self.index()
+            keep, dropped = [], 0
+            for row in index["reports"]:
+                if row["file"][len(REPORT_PREFIX):len(REPORT_PREFIX) + 8] < cutoff and row["file"] != index["latest"]:
+                    (self.reports_dir / row["file"]).unlink(missing_ok=True)
+                    dropped += 1
+                else:
+                    keep.append(row)
+            kept = {r["file"] for r in keep}
+            for archive in (self.reports_dir / "archive").glob("*.ndjson.gz"):
+                entries = _read_archive(archive)
+                live = [e for e in entries if e["file"] in kept]
+                if not live:
+                    archive.unlink()
+                elif len(live) < len(entries):  # partly past the cutoff: drop the old entries
+                    tmp = archive.with_name(archive.name + ".tmp")
+                    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                        f.writelines(json.dumps(e) + "\n" for e in live)
+                    os.replace(tmp, archive)
+            index["reports"] = keep
+            self._write_index(index)
+            return dropped
+
+
+_store = None
+
+
+def get_store() -> ReportStore:
+    global _store
+    if _store is None:
+        _store = ReportStore()
+    return _store
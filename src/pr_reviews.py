@@ -0,0 +1,150 @@
+"""Review analysis for PR readiness.
+
+A reviewer's state is the state of their latest *decisive* review: APPROVED,
+CHANGES_REQUESTED or DISMISSED. Because only decisive reviews count, a
+COMMENTED review after an approval does not withdraw it. A DISMISSED review
+does withdraw it, and PENDING (unsubmitted) reviews are ignored.
+
+`summarize_reviews` handles one PR's review list. `analyze_reviews_frame`
+computes the same summary for every PR at once, with a pandas groupby, and
+`review_summaries` turns that frame back into per-PR summary dicts. The PR
+checker's report (and so the history store and trend charts) is built from
+`review_summaries`, so all of a run's reviews are analyzed in one pass.
+"""
+
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+MIN_APPROVALS = int(os.getenv("PR_REQUIRED_APPROVALS", "1"))
+
+DECISIVE_STATES = ("APPROVED", "CHANGES_REQUESTED", "DISMISSED")
+SUMMARY_COLUMNS = ["needs_approval", "has_approval", "has_requested_changes", "review_count",
+                   "approvals", "changes_requested", "dismissed", "commented", "required_approvals"]
+
+
+def _needs_approval(approvals: int, required_approvals: int, min_approvals: int, required_reviewers) -> bool:
+    return approvals < min_approvals or bool(required_reviewers and not required_approvals)
+
+
+def summarize_reviews(reviews: List[Dict[str, Any]], min_approvals: int = MIN_APPROVALS,
+                      required_reviewers: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Summarize one PR's reviews (in API order, oldest first)"""
+    required = set(required_reviewers or ())
+    latest: Dict[str, str] = {}
+    reviewers: Dict[str, Optional[str]] = {}
+    for review in reviews:
+        login = (review.get("user") or {}).get("login")
+        state = review.get("state")
+        if not login or state == "PENDING":
+            continue
+        if state in DECISIVE_STATES:
+            latest[login] = reviewers[login] = state
+        else:
+            reviewers.setdefault(login, state)
+
+    approvals = sum(s == "APPROVED" for s in latest.values())
+    required_approvals = sum(s == "APPROVED" for login, s in latest.items() if login in required)
+    changes = sum(s == "CHANGES_REQUESTED" for s in latest.values())
+    return {
+        "needs_approval": _needs_approval(approvals, required_approvals, min_approvals, required),
+        "has_approval": approvals > 0,
+        "has_requested_changes": changes > 0,
+        "review_count": len(reviewers),
+        "approvals": approvals,
+        "changes_requested": changes,
+        "dismissed": sum(s == "DISMISSED" for s in latest.values()),
+        "commented": len(reviewers) - len(latest),
+        "required_approvals": required_approvals,
+        "reviewers": reviewers,  # latest state per reviewer; COMMENTED only if never decisive
+    }
+
+
+def reviews_to_frame(reviews_by_pr: Dict[int, List[Dict[str, Any]]]):
+    """Flatten {pr_number: [review, ...]} into a (pr_number, reviewer, state) frame"""
+    import pandas as pd
+
+    rows = [
+        (pr_number, (review.get("user") or {}).get("login"), review.get("state"))
+        for pr_number, reviews in reviews_by_pr.items()
+        for review in reviews
+    ]
+    return pd.DataFrame.from_records(rows, columns=["pr_number", "reviewer", "state"])
+
+
+def analyze_reviews_frame(reviews, pr_numbers: Optional[Iterable[int]] = None,
+                          min_approvals: int = MIN_APPROVALS,
+                          required_reviewers: Optional[Iterable[str]] = None):
+    """Summarize reviews for every PR in one vectorized pass.
+
+    `reviews` is a frame with pr_number, reviewer and state columns, with
+    reviews oldest first within each PR, or the {pr_number: [review, ...]}
+    dict that `reviews_to_frame` accepts. Returns one row per PR, indexed by
+    pr_number, with the same fields as `summarize_reviews`. PRs listed in
+    `pr_numbers` but without reviews are included.
+    """
+    import pandas as pd
+
+    if not isinstance(reviews, pd.DataFrame):
+        pr_numbers = reviews.keys() if pr_numbers is None else pr_numbers
+        reviews = reviews_to_frame(reviews)
+    df = reviews.loc[reviews["reviewer"].notna() & (reviews["state"] != "PENDING"), ["pr_number", "reviewer", "state"]]
+
+    index = pd.Index(df["pr_number"].unique(), name="pr_number")
+    if pr_numbers is not None:
+        index = index.union(pd.Index(list(pr_numbers), name="pr_number"))
+
+    # Latest decisive state per (pr, reviewer): groupby keeps row order, so last() is the newest
+    decisive = df[df["state"].isin(DECISIVE_STATES)]
+    latest = decisive.groupby(["pr_number", "reviewer"], sort=False)["state"].last().reset_index()
+    counts = (
+        latest.groupby(["pr_number", "state"]).size().unstack(fill_value=0)
+        .reindex(index=index, columns=list(DECISIVE_STATES), fill_value=0)
+    )
+
+    out = pd.DataFrame(index=index)
+    out["review_count"] = df.groupby("pr_number")["reviewer"].nunique().reindex(index, fill_value=0)
+    out["approvals"] = counts["APPROVED"]
+    out["changes_requested"] = counts["CHANGES_REQUESTED"]
+    out["dismissed"] = counts["DISMISSED"]
+    out["commented"] = out["review_count"] - counts.sum(axis=1)
+
+    required = set(required_reviewers or ())
+    if required:
+        approved = latest[(latest["state"] == "APPROVED") & latest["reviewer"].isin(required)]
+        out["required_approvals"] = approved.groupby("pr_number").size().reindex(index, fill_value=0)
+    else:
+        out["required_approvals"] = 0
+
+    out["has_approval"] = out["approvals"] > 0
+    out["has_requested_changes"] = out["changes_requested"] > 0
+    out["needs_approval"] = out["approvals"] < min_approvals
+    if required:
+        out["needs_approval"] |= out["required_approvals"] == 0
+    return out[SUMMARY_COLUMNS].astype({c: "int64" for c in SUMMARY_COLUMNS[3:]})
+
+
+def _reviewer_states(frame) -> Dict[int, Dict[str, str]]:
+    """{pr_number: {reviewer: state}} with `summarize_reviews`' "reviewers" semantics"""
+    df = frame.loc[frame["reviewer"].notna() & (frame["state"] != "PENDING")]
+    keys = ["pr_number", "reviewer"]
+    first = df.groupby(keys, sort=False)["state"].first()
+    latest = df[df["state"].isin(DECISIVE_STATES)].groupby(keys, sort=False)["state"].last()
+    states: Dict[int, Dict[str, str]] = {}
+    for (pr_number, reviewer), state in latest.combine_first(first).items():
+        states.setdefault(pr_number, {})[reviewer] = state
+    return states
+
+
+def review_summaries(reviews_by_pr: Dict[int, List[Dict[str, Any]]],
+                     min_approvals: int = MIN_APPROVALS,
+                     required_reviewers: Optional[Iterable[str]] = None) -> Dict[int, Dict[str, Any]]:
+    """`summarize_reviews` for every PR in {pr_number: [review, ...]}, in one vectorized pass"""
+    frame = reviews_to_frame(reviews_by_pr)
+    summary = analyze_reviews_frame(frame, reviews_by_pr.keys(), min_approvals, required_reviewers)
+    reviewers = _reviewer_states(frame)
+    result = {}
+    for pr_number, row in zip(summary.index.tolist(), summary.to_dict("records")):
+        row = {k: v.item() if hasattr(v, "item") else v for k, v in row.items()}
+        row["reviewers"] = reviewers.get(pr_number, {})
+        result[pr_number] = row
+    return result
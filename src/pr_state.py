@@ -0,0 +1,153 @@
+"""Current PR readiness, one row per open PR.
+
+A full check replaces the whole set of rows for a repository. Between checks,
+webhook events (src/pr_webhooks.py) update single rows in place. Each row
+keeps the per-check states and the latest review state per reviewer, so the
+readiness of one PR can be recomputed without calling GitHub. The PR Status
+page renders `current_report()` straight from this table.
+"""
+
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from src.pr_checker import blocking_factors, rollup_states
+from src.pr_reviews import summarize_reviews
+
+# Buffered webhook check states older than this are dropped (their commits are long superseded)
+CHECK_STATE_RETENTION = timedelta(days=14)
+
+
+def _default_session_factory():
+    from src.db import get_session, init_db
+
+    init_db()
+    return get_session
+
+
+def _review_summary(row) -> Dict[str, Any]:
+    reviewers = json.loads(row.reviewers or "{}")
+    return summarize_reviews([{"user": {"login": login}, "state": state} for login, state in reviewers.items()])
+
+
+def refresh(row) -> None:
+    """Recompute checks, reviews and blocking factors from the row's stored state"""
+    checks = rollup_states(json.loads(row.check_states or "{}"))
+    reviews = _review_summary(row)
+    readiness = {
+        "draft": bool(row.draft),
+        "mergeable": row.mergeable,
+        "checks_status": checks["state"],
+        "failing_checks": checks["failing"],
+        "review_status": reviews,
+    }
+    factors = blocking_factors(readiness)
+    row.checks_status = checks["state"]
+    row.blocking_factors = json.dumps(factors)
+    row.can_merge = not factors
+    row.refreshed_at = datetime.utcnow()
+
+
+def to_readiness(row) -> Dict[str, Any]:
+    """A row in the same shape as PRChecker.check_mergeable's result"""
+    checks = rollup_states(json.loads(row.check_states or "{}"))
+    return {
+        "pr_number": row.pr_number,
+        "title": row.title,
+        "author": row.author,
+        "head_sha": row.head_sha,
+        "draft": bool(row.draft),
+        "mergeable": row.mergeable,
+        "mergeable_state": row.mergeable_state or "unknown",
+        "checks_status": row.checks_status,
+        "failing_checks": checks["failing"],
+        "check_states": checks["states"],
+        "review_status": _review_summary(row),
+        "updated_at": row.pr_updated_at,
+        "can_merge": bool(row.can_merge),
+        "blocking_factors": json.loads(row.blocking_factors or "[]"),
+    }
+
+
+def replace_from_report(report: Dict[str, Any], session_factory=None) -> int:
+    """Make the stored state match a full check: upsert its PRs, drop PRs no longer open
+
+    Also prunes buffered webhook check states past CHECK_STATE_RETENTION.
+    """
+    from sqlalchemy import delete, select
+
+    from src.models import PRCheckState, PRReadinessState
+
+    session_factory = session_factory or _default_session_factory()
+    repository = report.get("repository") or ""
+    prs = list(report.get("ready_to_merge", [])) + list(report.get("needs_attention", []))
+
+    sess = session_factory()
+    try:
+        existing = {
+            r.pr_number: r
+            for r in sess.execute(
+                select(PRReadinessState).where(PRReadinessState.repository == repository)
+            ).scalars()
+        }
+        for pr in prs:
+            row = existing.pop(pr["pr_number"], None)
+            if row is None:
+                row = PRReadinessState(repository=repository, pr_number=pr["pr_number"])
+                sess.add(row)
+            row.title = pr.get("title")
+            row.author = pr.get("author")
+            row.head_sha = pr.get("head_sha")
+            row.draft = bool(pr.get("draft"))
+            row.mergeable = pr.get("mergeable")
+            row.mergeable_state = pr.get("mergeable_state")
+            row.check_states = json.dumps(pr.get("check_states") or {})
+            row.reviewers = json.dumps((pr.get("review_status") or {}).get("reviewers") or {})
+            row.checks_status = pr.get("checks_status")
+            row.can_merge = bool(pr.get("can_merge"))
+            row.blocking_factors = json.dumps(pr.get("blocking_factors") or [])
+            row.pr_updated_at = pr.get("updated_at")
+            row.refreshed_at = datetime.utcnow()
+            row.source = "check"
+        if existing:
+            sess.execute(delete(PRReadinessState).where(PRReadinessState.id.in_([r.id for r in existing.values()])))
+        sess.execute(delete(PRCheckState).where(PRCheckState.updated_at < datetime.utcnow() - CHECK_STATE_RETENTION))
+        sess.commit()
+        return len(prs)
+    except Exception:
+        sess.rollback()
+        raise
+    finally:
+        sess.close()
+
+
+def current_report(repository: str, session_factory=None) -> Optional[Dict[str, Any]]:
+    """Stored state as a report dict (None when nothing has been recorded yet)"""
+    from sqlalchemy import select
+
+    from src.models import PRReadinessState
+
+    session_factory = session_factory or _default_session_factory()
+    sess = session_factory()
+    try:
+        rows = sess.execute(
+            select(PRReadinessState)
+            .where(PRReadinessState.repository == repository)
+            .order_by(PRReadinessState.pr_number)
+        ).scalars().all()
+        if not rows:
+            return None
+        prs: List[Dict[str, Any]] = [to_readiness(r) for r in rows]
+        refreshed = max(r.refreshed_at for r in rows)
+    finally:
+        sess.close()
+
+    ready = [p for p in prs if p["can_merge"]]
+    attention = [p for p in prs if not p["can_merge"]]
+    return {
+        "timestamp": refreshed.isoformat(),
+        "repository": repository,
+        "ready_to_merge": ready,
+        "needs_attention": attention,
+        "summary": {"total_prs": len(prs), "ready_count": len(ready), "needs_attention_count": len(attention)},
+    }
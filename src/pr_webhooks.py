@@ -0,0 +1,287 @@
+"""GitHub webhook receiver for PR readiness.
+
+Handles `pull_request`, `pull_request_review`, `status` and `check_run`
+events. Each event updates only the affected PR rows in the current-state
+table (src/pr_state.py), so the PR Status page stays fresh without re-running
+a full check. GitHub does not guarantee delivery order, so check states are
+also kept per commit in `pr_check_states`. A check that reports before the
+`synchronize` event for its commit is merged in when the PR's head moves
+there. Deliveries must carry a valid `X-Hub-Signature-256` for
+PR_WEBHOOK_SECRET; without a secret the receiver does not start.
+
+Usage:
+    PR_WEBHOOK_SECRET=... PR_WEBHOOK_PORT=9010 python -m src.pr_webhooks
+
+`scripts/replay_webhooks.py` feeds recorded event fixtures through the same
+code, either in-process or against a running receiver.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from src.pr_checker import check_run_state
+from src.pr_reviews import DECISIVE_STATES
+
+WEBHOOK_SECRET = os.getenv("PR_WEBHOOK_SECRET", "")
+WEBHOOK_PORT = os.getenv("PR_WEBHOOK_PORT", "")
+WEBHOOK_HOST = os.getenv("PR_WEBHOOK_HOST", "127.0.0.1")
+
+EVENTS = ("pull_request", "pull_request_review", "status", "check_run")
+
+
+def sign(secret: str, body: bytes) -> str:
+    """The X-Hub-Signature-256 header value GitHub sends for `body`"""
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: str, body: bytes, header: Optional[str]) -> bool:
+    if not secret or not header:
+        return False
+    return hmac.compare_digest(sign(secret, body), header)
+
+
+def _default_session_factory():
+    from src.db import get_session, init_db
+
+    init_db()
+    return get_session
+
+
+def _apply_pull_request(sess, repository: str, payload: Dict[str, Any]) -> List[int]:
+    from sqlalchemy import delete, select
+
+    from src.models import PRReadinessState
+
+    pr = payload["pull_request"]
+    number = pr["number"]
+    if payload.get("action") == "closed":
+        sess.execute(delete(PRReadinessState).where(PRReadinessState.repository == repository,
+                                                    PRReadinessState.pr_number == number))
+        return [number]
+
+    row = sess.execute(
+        select(PRReadinessState).where(PRReadinessState.repository == repository,
+                                       PRReadinessState.pr_number == number)
+    ).scalar_one_or_none()
+    if row is None:
+        row = PRReadinessState(repository=repository, pr_number=number, check_states="{}", reviewers="{}")
+        sess.add(row)
+    head_sha = pr["head"]["sha"]
+    if row.head_sha != head_sha:
+        # New commit: start from whatever checks already reported for it.
+        # Deliveries are unordered, so those may have arrived before this event.
+        row.check_states = json.dumps(_buffered_checks(sess, repository, head_sha))
+    row.head_sha = head_sha
+    row.title = pr.get("title")
+    row.author = (pr.get("user") or {}).get("login")
+    row.draft = bool(pr.get("draft"))
+    if pr.get("mergeable") is not None:  # GitHub often has not computed it yet
+        row.mergeable = pr["mergeable"]
+        row.mergeable_state = pr.get("mergeable_state")
+    row.pr_updated_at = pr.get("updated_at")
+    return [number]
+
+
+def _buffered_checks(sess, repository: str, sha: str) -> Dict[str, str]:
+    from sqlalchemy import select
+
+    from src.models import PRCheckState
+
+    return dict(sess.execute(
+        select(PRCheckState.name, PRCheckState.state).where(PRCheckState.repository == repository,
+                                                            PRCheckState.sha == sha)
+    ).all())
+
+
+def _buffer_check(sess, repository: str, sha: str, name: str, state: str) -> None:
+    """Record a check state by commit, whether or not a PR currently points at it"""
+    from sqlalchemy import select
+
+    from src.models import PRCheckState
+
+    now = datetime.utcnow()
+    row = sess.execute(
+        select(PRCheckState).where(PRCheckState.repository == repository, PRCheckState.sha == sha,
+                                   PRCheckState.name == name)
+    ).scalar_one_or_none()
+    if row is None:
+        sess.add(PRCheckState(repository=repository, sha=sha, name=name, state=state, updated_at=now))
+    else:
+        row.state = state
+        row.updated_at = now
+
+
+def _apply_review(sess, repository: str, payload: Dict[str, Any]) -> List[int]:
+    from sqlalchemy import select
+
+    from src.models import PRReadinessState
+
+    number = payload["pull_request"]["number"]
+    review = payload["review"]
+    login = (review.get("user") or {}).get("login")
+    state = "DISMISSED" if payload.get("action") == "dismissed" else (review.get("state") or "").upper()
+    row = sess.execute(
+        select(PRReadinessState).where(PRReadinessState.repository == repository,
+                                       PRReadinessState.pr_number == number)
+    ).scalar_one_or_none()
+    if row is None or not login or state == "PENDING":
+        return []
+    reviewers = json.loads(row.reviewers or "{}")
+    # A comment never replaces an approval or change request
+    if state in DECISIVE_STATES or login not in reviewers:
+        reviewers[login] = state
+    row.reviewers = json.dumps(reviewers)
+    return [number]
+
+
+def _apply_check(sess, repository: str, sha: str, name: str, state: str) -> List[int]:
+    from sqlalchemy import select
+
+    from src.models import PRReadinessState
+
+    _buffer_check(sess, repository, sha, name, state)
+    rows = sess.execute(
+        select(PRReadinessState).where(PRReadinessState.repository == repository,
+                                       PRReadinessState.head_sha == sha)
+    ).scalars().all()
+    for row in rows:
+        states = json.loads(row.check_states or "{}")
+        states[name] = state
+        row.check_states = json.dumps(states)
+    return [row.pr_number for row in rows]
+
+
+def apply_event(event: str, payload: Dict[str, Any], session_factory=None) -> List[int]:
+    """Apply one webhook delivery; returns the PR numbers whose readiness changed"""
+    from sqlalchemy import select
+
+    from src.models import PRReadinessState
+    from src.pr_state import refresh
+
+    if event not in EVENTS:
+        return []
+    session_factory = session_factory or _default_session_factory()
+    repository = (payload.get("repository") or {}).get("full_name", "")
+
+    sess = session_factory()
+    try:
+        if event == "pull_request":
+            touched = _apply_pull_request(sess, repository, payload)
+        elif event == "pull_request_review":
+            touched = _apply_review(sess, repository, payload)
+        elif event == "status":
+            touched = _apply_check(sess, repository, payload["sha"], payload.get("context", "status"),
+                                   payload.get("state", "pending"))
+        else:
+            run = payload["check_run"]
+            touched = _apply_check(sess, repository, run["head_sha"], run.get("name", "check"),
+                                   check_run_state(run))
+
+        if touched:
+            sess.flush()
+            for row in sess.execute(
+                select(PRReadinessState).where(PRReadinessState.repository == repository,
+                                               PRReadinessState.pr_number.in_(touched))
+            ).scalars():
+                refresh(row)
+                row.source = event
+        sess.commit()
+        return touched
+    except Exception:
+        sess.rollback()
+        raise
+    finally:
+        sess.close()
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    secret = WEBHOOK_SECRET
+    session_factory = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, code: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if not verify_signature(self.secret, body, self.headers.get("X-Hub-Signature-256")):
+            self._reply(401, {"error": "bad signature"})
+            return
+        event = self.headers.get("X-GitHub-Event", "")
+        if event == "ping":
+            self._reply(200, {"ok": True})
+            return
+        try:
+            payload = json.loads(body)
+            touched = apply_event(event, payload, self.session_factory)
+        except (ValueError, KeyError) as e:
+            self._reply(400, {"error": f"bad payload: {e}"})
+            return
+        except Exception as e:
+            print(f"Webhook {event} failed: {e}")
+            self._reply(500, {"error": "update failed"})
+            return
+        self._reply(200, {"event": event, "updated": touched})
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_webhook_server(port: Optional[int] = None, host: Optional[str] = None,
+                         secret: Optional[str] = None, session_factory=None) -> Optional[ThreadingHTTPServer]:
+    """Serve webhooks on a daemon thread; repeated calls return the same server."""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        secret = secret or WEBHOOK_SECRET
+        if port is None:
+            if not WEBHOOK_PORT:
+                return None
+            port = int(WEBHOOK_PORT)
+        if not secret:
+            print("PR webhook receiver not started: PR_WEBHOOK_SECRET is not set")
+            return None
+        handler = type("WebhookHandler", (_WebhookHandler,),
+                       {"secret": secret,
+                        "session_factory": staticmethod(session_factory or _default_session_factory())})
+        server = ThreadingHTTPServer((host or WEBHOOK_HOST, port), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        _server = server
+        return server
+
+
+def stop_webhook_server() -> None:
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
+
+
+if __name__ == "__main__":
+    server = start_webhook_server()
+    if server is None:
+        print("Set PR_WEBHOOK_PORT and PR_WEBHOOK_SECRET to run the receiver")
+    else:
+        host, port = server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        print(f"Listening for GitHub webhooks on {host}:{port}")
+        threading.Event().wait()
@@ -0,0 +1,232 @@
+"""Opt-in SQL profiler for the SQLAlchemy engine.
+
+Hooks `before_cursor_execute`/`after_cursor_execute` to time every statement
+and aggregates by fingerprint (literals and IN-lists collapsed). It keeps:
+
+* per-fingerprint count, total/max duration and row counts (the DBAPI
+  rowcount, i.e. rows written; SQLite reports no count for SELECTs),
+* a top-N table of the slowest individual executions, with the SQLite
+  `EXPLAIN QUERY PLAN` captured once per fingerprint for outliers,
+* N+1 findings: a SELECT fingerprint repeated `n_plus_one_threshold` times
+  inside one transaction (each ORM session here runs one transaction), with
+  the application frame that issued it.
+
+Enable with JOB_O_MATIC_QUERY_PROFILE=true, or `src.db.enable_query_profiler()`.
+"""
+
+import heapq
+import os
+import re
+import sys
+import threading
+import time
+from functools import lru_cache
+from types import FrameType
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+
+from src import metrics
+
+SLOW_QUERY_MS = float(os.getenv("JOB_O_MATIC_SLOW_QUERY_MS", "50"))
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:\?|%\(\w+\)s|:\w+)\s*,?)+\)", re.IGNORECASE)
+_POSTCOMPILE_RE = re.compile(r"\(\s*__\[POSTCOMPILE_\w+\]\s*\)")
+_WS_RE = re.compile(r"\s+")
+
+_SKIP_FRAMES = ("sqlalchemy", "query_profiler", "contextlib", "threading")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Normalize a SQL statement so executions differing only in literals group together."""
+    fp = _STRING_RE.sub("?", statement)
+    fp = _NUMBER_RE.sub("?", fp)
+    fp = _POSTCOMPILE_RE.sub("(...)", fp)
+    fp = _IN_LIST_RE.sub("IN (...)", fp)
+    return _WS_RE.sub(" ", fp).strip()
+
+
+def _statement_kind(statement: str) -> str:
+    head = statement.lstrip().split(None, 1)
+    kind = head[0].upper() if head else ""
+    return kind if kind in ("SELECT", "INSERT", "UPDATE", "DELETE") else "OTHER"
+
+
+def _caller() -> str:
+    """Innermost frame outside SQLAlchemy, as 'function (file:line)'."""
+    frame: Optional[FrameType] = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not any(part in filename for part in _SKIP_FRAMES):
+            return f"{frame.f_code.co_name} ({os.path.relpath(filename)}:{frame.f_lineno})"
+        frame = frame.f_back
+    return "unknown"
+
+
+class QueryProfiler:
+    def __init__(self, slow_ms: float = SLOW_QUERY_MS, top_n: int = 20,
+                 n_plus_one_threshold: int = 10, explain: bool = True):
+        self.slow_ms = slow_ms
+        self.top_n = top_n
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.explain = explain
+        self._lock = threading.Lock()
+        self._engines: List[Any] = []
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats: Dict[str, dict] = {}
+            self._slowest: List[tuple] = []  # min-heap of (duration_ms, seq, entry)
+            self._seq = 0
+            self.plans: Dict[str, str] = {}
+            self.n_plus_one: Dict[tuple, dict] = {}
+
+    # -- engine wiring -------------------------------------------------------
+
+    def attach(self, engine) -> "QueryProfiler":
+        if engine in self._engines:
+            return self
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "commit", self._end_scope)
+        event.listen(engine, "rollback", self._end_scope)
+        event.listen(engine, "checkin", self._checkin)
+        self._engines.append(engine)
+        return self
+
+    def detach(self, engine=None) -> None:
+        for eng in [engine] if engine is not None else list(self._engines):
+            if eng not in self._engines:
+                continue
+            event.remove(eng, "before_cursor_execute", self._before)
+            event.remove(eng, "after_cursor_execute", self._after)
+            event.remove(eng, "commit", self._end_scope)
+            event.remove(eng, "rollback", self._end_scope)
+            event.remove(eng, "checkin", self._checkin)
+            self._engines.remove(eng)
+
+    # -- event handlers ------------------------------------------------------
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_qp_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("_qp_start")
+        if not starts:
+            return
+        duration_ms = (time.perf_counter() - starts.pop()) * 1000
+        fp = fingerprint(statement)
+        kind = _statement_kind(statement)
+        rows = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else 0
+
+        metrics.DB_QUERY_SECONDS.labels(kind=kind).observe(duration_ms / 1000)
+
+        scope = conn.info.setdefault("_qp_scope", {})
+        repeats = scope.get(fp, 0) + 1
+        scope[fp] = repeats
+
+        plan = None
+        if (duration_ms >= self.slow_ms and self.explain and not executemany
+                and kind == "SELECT" and fp not in self.plans
+                and conn.dialect.name == "sqlite"):
+            plan = self._explain(cursor, statement, parameters)
+
+        with self._lock:
+            s = self.stats.get(fp)
+            if s is None:
+                s = self.stats[fp] = {"fingerprint": fp, "kind": kind, "count": 0,
+                                      "total_ms": 0.0, "max_ms": 0.0, "rows": 0}
+            s["count"] += 1
+            s["total_ms"] += duration_ms
+            s["rows"] += rows
+            if duration_ms > s["max_ms"]:
+                s["max_ms"] = duration_ms
+
+            if plan is not None:
+                self.plans[fp] = plan
+            if duration_ms >= self.slow_ms:
+                self._seq += 1
+                entry = {"fingerprint": fp, "statement": statement, "duration_ms": duration_ms,
+                         "rows": rows, "executemany": executemany, "at": time.time()}
+                item = (duration_ms, self._seq, entry)
+                if len(self._slowest) < self.top_n:
+                    heapq.heappush(self._slowest, item)
+                elif duration_ms > self._slowest[0][0]:
+                    heapq.heapreplace(self._slowest, item)
+
+        if kind == "SELECT" and repeats == self.n_plus_one_threshold:
+            self._flag_n_plus_one(fp)
+
+    def _end_scope(self, conn):
+        conn.info.pop("_qp_scope", None)
+
+    def _checkin(self, dbapi_connection, connection_record):
+        # Sessions closed without commit are rolled back by the pool, not the Connection.
+        connection_record.info.pop("_qp_scope", None)
+        connection_record.info.pop("_qp_start", None)
+
+    def _explain(self, cursor, statement, parameters) -> Optional[str]:
+        try:
+            cur = cursor.connection.cursor()
+            try:
+                cur.execute("EXPLAIN QUERY PLAN " + statement, parameters or ())
+                return "\n".join(str(row[-1]) for row in cur.fetchall())
+            finally:
+                cur.close()
+        except Exception as e:
+            return f"(plan unavailable: {e})"
+
+    def _flag_n_plus_one(self, fp: str) -> None:
+        caller = _caller()
+        with self._lock:
+            finding = self.n_plus_one.get((fp, caller))
+            if finding is None:
+                self.n_plus_one[(fp, caller)] = {"fingerprint": fp, "caller": caller,
+                                                 "occurrences": 1,
+                                                 "threshold": self.n_plus_one_threshold}
+            else:
+                finding["occurrences"] += 1
+
+    # -- reporting -----------------------------------------------------------
+
+    def slow_queries(self) -> List[dict]:
+        with self._lock:
+            ordered = sorted(self._slowest, key=lambda item: item[0], reverse=True)
+            return [dict(entry, plan=self.plans.get(entry["fingerprint"])) for _, _, entry in ordered]
+
+    def top_fingerprints(self, n: int = 20, key: str = "total_ms") -> List[dict]:
+        with self._lock:
+            rows = [dict(s, mean_ms=s["total_ms"] / s["count"]) for s in self.stats.values()]
+        rows.sort(key=lambda r: r[key], reverse=True)
+        return rows[:n]
+
+    def n_plus_one_findings(self) -> List[dict]:
+        with self._lock:
+            return sorted((dict(f) for f in self.n_plus_one.values()),
+                          key=lambda f: f["occurrences"], reverse=True)
+
+    def report(self) -> dict:
+        return {
+            "fingerprints": self.top_fingerprints(),
+            "slow_queries": self.slow_queries(),
+            "n_plus_one": self.n_plus_one_findings(),
+        }
+
+
+_profiler: Optional[QueryProfiler] = None
+
+
+def get_profiler() -> Optional[QueryProfiler]:
+    """The profiler attached to the app engine, if profiling is enabled."""
+    return _profiler
+
+
+def enable(engine, **kwargs) -> QueryProfiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = QueryProfiler(**kwargs)
+    return _profiler.attach(engine)
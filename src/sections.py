@@ -0,0 +1,69 @@
+"""Parse `=== HEADER ===` sections out of tailored content.
+
+Tailored output is a single text blob with sections such as
+`=== COVER_PARAGRAPH ===`. `parse_sections` splits the whole blob in one pass
+so callers never rescan the text once per header.
+"""
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+SECTIONS_FILENAME = "sections.json"
+
+# Matches a header line like "=== COVER_PARAGRAPH ===" (compiled once).
+_HEADER_RE = re.compile(r"===\s*([^=\n]+?)\s*===")
+
+
+def _normalize_header(header: str) -> str:
+    return re.sub(r"\s+", "_", header.strip()).upper()
+
+
+def parse_sections(text: str) -> dict:
+    """Split tailored text into a {HEADER: body} dict in a single pass.
+
+    Headers are upper-cased with inner whitespace collapsed to underscores.
+    If a header repeats, the first occurrence wins (matching `extract_section`).
+    """
+    sections: Dict[str, str] = {}
+    if not text:
+        return sections
+    matches = list(_HEADER_RE.finditer(text))
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        sections.setdefault(_normalize_header(m.group(1)), text[m.end():end].strip())
+    return sections
+
+
+@lru_cache(maxsize=64)
+def _section_pattern(header: str):
+    return re.compile(
+        rf"===\s*{re.escape(header)}\s*===\s*(.*?)(?===|$)", re.DOTALL | re.IGNORECASE
+    )
+
+
+def extract_section(text: str, header: str) -> str:
+    """Extract a single section from tailored content (cached compiled pattern)."""
+    match = _section_pattern(header).search(text or "")
+    return match.group(1).strip() if match else ""
+
+
+def save_sections(outdir, sections: dict) -> Path:
+    """Store parsed sections alongside a bundle as sections.json."""
+    path = Path(outdir) / SECTIONS_FILENAME
+    path.write_text(json.dumps(sections, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def load_sections(outdir) -> dict:
+    """Load parsed sections for a bundle, falling back to parsing tailored.txt."""
+    bundle = Path(outdir)
+    path = bundle / SECTIONS_FILENAME
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    tailored = bundle / "tailored.txt"
+    if tailored.exists():
+        return parse_sections(tailored.read_text(encoding="utf-8"))
+    return {}
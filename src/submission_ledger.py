@@ -0,0 +1,181 @@
+"""Submission ledger: one row per idempotency key in `submission_ledger`.
+
+Every Greenhouse/Lever send first claims its idempotency key. The unique
+index makes the "was this already sent?" check a single indexed lookup, and
+the insert itself stops two concurrent reruns from both sending.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+STATUS_IN_FLIGHT = None
+
+
+def idempotency_key(platform: str, apply_url: str, candidate_data: Dict) -> str:
+    """Stable key for "this candidate applying to this posting on this platform"."""
+    email = (candidate_data.get("email") or "").strip().lower()
+    raw = f"{platform}\0{(apply_url or '').strip()}\0{email}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def request_hash(payload: Dict, cv_file_path: Optional[str] = None) -> str:
+    """Hash of the request body so changed applications can be told apart."""
+    body = json.dumps(payload, sort_keys=True, default=str)
+    if cv_file_path:
+        body += f"\0{cv_file_path}"
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def _is_success(status) -> bool:
+    return status in (200, 201)
+
+
+class SubmissionLedger:
+    """Claim/record submission attempts and report per-platform stats."""
+
+    def __init__(self, session_factory=None):
+        if session_factory is None:
+            from src.db import get_session, init_db
+
+            init_db()
+            session_factory = get_session
+        self.session_factory = session_factory
+
+    def lookup(self, key: str):
+        """Return the ledger row for `key` (detached) or None."""
+        from src.models import SubmissionRecord
+
+        sess = self.session_factory()
+        try:
+            row = sess.query(SubmissionRecord).filter(SubmissionRecord.idempotency_key == key).one_or_none()
+            if row is not None:
+                sess.expunge(row)
+            return row
+        finally:
+            sess.close()
+
+    def already_sent(self, key: str) -> bool:
+        row = self.lookup(key)
+        return row is not None and _is_success(row.response_status)
+
+    def claim(self, key: str, job_id, platform: str, req_hash: str) -> Tuple[bool, str]:
+        """Reserve `key` before sending.
+
+        Returns (True, "") if the caller may send. Returns (False, reason) if the
+        key already succeeded or another attempt is still in flight / unconfirmed.
+        Previously failed attempts can be claimed again.
+        """
+        from sqlalchemy.exc import IntegrityError
+
+        from src.models import SubmissionRecord
+
+        sess = self.session_factory()
+        try:
+            row = sess.query(SubmissionRecord).filter(SubmissionRecord.idempotency_key == key).one_or_none()
+            now = datetime.utcnow()
+            if row is None:
+                sess.add(
+                    SubmissionRecord(
+                        job_id=job_id,
+                        platform=platform,
+                        idempotency_key=key,
+                        request_hash=req_hash,
+                        response_status=STATUS_IN_FLIGHT,
+                        attempts=1,
+                        created_at=now,
+                        updated_at=now,
+                    )
+                )
+                sess.commit()
+                return True, ""
+            if _is_success(row.response_status):
+                return False, "Already submitted"
+            if row.response_status is STATUS_IN_FLIGHT:
+                return False, "Previous submission unconfirmed - check the platform before retrying"
+            # Claim a failed key for a retry, guarding against a concurrent claimer.
+            updated = (
+                sess.query(SubmissionRecord)
+                .filter(
+                    SubmissionRecord.id == row.id,
+                    SubmissionRecord.response_status == row.response_status,
+                )
+                .update(
+                    {
+                        SubmissionRecord.response_status: STATUS_IN_FLIGHT,
+                        SubmissionRecord.request_hash: req_hash,
+                        SubmissionRecord.attempts: SubmissionRecord.attempts + 1,
+                        SubmissionRecord.updated_at: now,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            sess.commit()
+            if not updated:
+                return False, "Submission already in progress"
+            return True, ""
+        except IntegrityError:
+            sess.rollback()
+            return False, "Submission already in progress"
+        finally:
+            sess.close()
+
+    def record(self, key: str, status: Optional[int], latency_ms: int, message: str = "") -> None:
+        """Store the outcome of a claimed attempt.
+
+        status is 0 when the request definitely never reached the platform (the
+        key can be claimed again), and STATUS_IN_FLIGHT when the outcome is
+        unknown, e.g. a read timeout, which keeps the key blocked.
+        """
+        from src.models import SubmissionRecord
+
+        sess = self.session_factory()
+        try:
+            sess.query(SubmissionRecord).filter(SubmissionRecord.idempotency_key == key).update(
+                {
+                    SubmissionRecord.response_status: status,
+                    SubmissionRecord.latency_ms: latency_ms,
+                    SubmissionRecord.message: (message or "")[:500],
+                    SubmissionRecord.updated_at: datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+            sess.commit()
+        except Exception as e:
+            print("Error recording submission:", e)
+            sess.rollback()
+        finally:
+            sess.close()
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-platform attempts, successes, success rate and average latency."""
+        from sqlalchemy import case, func
+
+        from src.models import SubmissionRecord
+
+        sess = self.session_factory()
+        try:
+            rows = (
+                sess.query(
+                    SubmissionRecord.platform,
+                    func.count(SubmissionRecord.id),
+                    func.sum(case((SubmissionRecord.response_status.in_([200, 201]), 1), else_=0)),
+                    func.avg(SubmissionRecord.latency_ms),
+                    func.max(SubmissionRecord.latency_ms),
+                )
+                .group_by(SubmissionRecord.platform)
+                .all()
+            )
+        finally:
+            sess.close()
+        return {
+            platform: {
+                "submissions": total,
+                "successes": int(ok or 0),
+                "success_rate": (int(ok or 0) / total) if total else 0.0,
+                "avg_latency_ms": float(avg) if avg is not None else None,
+                "max_latency_ms": mx,
+            }
+            for platform, total, ok, avg, mx in rows
+        }
@@ -0,0 +1,215 @@
+"""Concurrent auto-submit executor.
+
+Runs `JobApplicationSubmitter.auto_submit_with_confirmation` for a batch of
+jobs on a thread pool, with a per-platform concurrency cap and one shared rate
+limiter. 429 responses are retried with Retry-After-aware backoff; the
+platform slot is released while a job backs off. Progress is
+reported from the calling thread (safe for Streamlit) as each job completes.
+"""
+
+import contextvars
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+from src import metrics
+from src.auto_submit import JobApplicationSubmitter, RateLimited
+from src.bulk_ops import bundle_slug
+from src.tracing import traced
+
+API_RATE_LIMIT = float(os.getenv("API_RATE_LIMIT", "0.2"))
+DEFAULT_PLATFORM_CONCURRENCY = {"greenhouse": 2, "lever": 2}
+MAX_RETRIES = 3
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 60.0
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at least 1/rate seconds apart."""
+
+    def __init__(self, calls_per_second: float = API_RATE_LIMIT):
+        self.min_interval = 1.0 / calls_per_second if calls_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, seconds: float) -> None:
+        """Push the next available slot out, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+def find_bundle_dir(job_row: Dict, outputs_dir: str = "outputs") -> Optional[str]:
+    """Return the newest preview bundle directory for a job, if any.
+
+    Only used for rows without a stored preview_dir; matches the job's own
+    outputs/<timestamp>/<id>_<company>_<title> directory exactly.
+    """
+    slug = bundle_slug(job_row.get("id"), job_row["company"], job_row["title"])
+    matches = sorted(p for p in Path(outputs_dir).glob("*/*") if p.name == slug and p.is_dir())
+    return str(matches[-1]) if matches else None
+
+
+def mark_job_sent(job_id) -> None:
+    """Set a job's status to SENT (no-op if the DB helpers are unavailable)."""
+    try:
+        from src.db import get_session
+        from src.models import Job
+    except Exception:
+        return
+    sess = get_session()
+    try:
+        job = sess.get(Job, job_id)
+        if job is not None and job.status != "SENT":
+            job.status = "SENT"
+            sess.commit()
+    except Exception as e:
+        print(f"Error marking job {job_id} as sent:", e)
+        sess.rollback()
+    finally:
+        sess.close()
+
+
+class SubmitExecutor:
+    """Submit many applications concurrently with caps, rate limiting and retries."""
+
+    def __init__(self,
+                 submitter: Optional[JobApplicationSubmitter] = None,
+                 platform_concurrency: Optional[Dict[str, int]] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 max_retries: int = MAX_RETRIES,
+                 on_success: Optional[Callable[[Dict], None]] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.submitter = submitter or JobApplicationSubmitter()
+        self.platform_concurrency = platform_concurrency or dict(DEFAULT_PLATFORM_CONCURRENCY)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.on_success = on_success or (lambda row: mark_job_sent(row["id"]))
+        self._sleep = sleep
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {
+            p: threading.BoundedSemaphore(max(1, n)) for p, n in self.platform_concurrency.items()
+        }
+        self._done_lock = threading.Lock()
+        self._done: Set[Hashable] = set()
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(retry_after, BACKOFF_MAX)
+        return min(BACKOFF_BASE ** attempt + random.uniform(0, 1), BACKOFF_MAX)
+
+    @traced("submit.job")
+    def _submit_one(self, row: Dict, candidate_data: Dict, api_keys: Dict) -> Dict:
+        job_label = f"{row['company']} - {row['title']}"
+        result: Dict[str, Any] = {"job_id": row.get("id"), "job": job_label, "success": False,
+                  "message": "", "retries": 0}
+
+        if row.get("status") == "SENT":
+            result["message"] = "Already submitted - skipped"
+            result["skipped"] = True
+            return result
+
+        output_dir = row.get("output_dir") or find_bundle_dir(row)
+        if not output_dir:
+            result["message"] = "No preview bundle found - run Bulk Preview first"
+            return result
+
+        platform = row.get("platform") or self.submitter.detect_platform(row.get("apply_url") or "")
+        if not platform or platform not in self.submitter.supported_platforms:
+            result["message"] = "Unsupported platform - manual submission required"
+            return result
+        semaphore = self._semaphores.get(platform)
+        if semaphore is None:
+            semaphore = self._semaphores.setdefault(platform, threading.BoundedSemaphore(1))
+
+        inflight = metrics.SUBMIT_INFLIGHT.labels(platform=platform)
+        started = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            rate_limited = None
+            with semaphore:
+                inflight.inc()
+                try:
+                    self.rate_limiter.acquire()
+                    try:
+                        success, message = self.submitter.auto_submit_with_confirmation(
+                            row, candidate_data, output_dir, api_keys
+                        )
+                    except RateLimited as e:
+                        rate_limited = e
+                finally:
+                    inflight.dec()
+            if rate_limited is None:
+                break
+            if attempt >= self.max_retries:
+                success, message = False, "Rate limited - please try again later"
+                break
+            # Back off outside the semaphore so other jobs can use the slot meanwhile
+            delay = self._backoff(attempt + 1, rate_limited.retry_after)
+            self.rate_limiter.pause(delay)
+            result["retries"] += 1
+            metrics.SUBMIT_RETRIES.labels(platform=platform).inc()
+            self._sleep(delay)
+
+        result["success"] = success
+        result["message"] = message
+        result["elapsed_ms"] = (time.perf_counter() - started) * 1000
+        if success:
+            self.on_success(row)
+        return result
+
+    @traced("submit.executor.run")
+    def run(self,
+            job_rows: Iterable[Dict],
+            candidate_data: Dict,
+            api_keys: Dict,
+            on_progress: Optional[Callable[[int, int, Dict], None]] = None) -> List[Dict]:
+        """Submit all job_rows and return one result dict per unique job.
+
+        Duplicate job ids (and jobs already submitted by this executor) are
+        skipped so a job is never sent twice. on_progress(done, total, result)
+        is called from the calling thread as each job finishes.
+        """
+        unique_rows = []
+        with self._done_lock:
+            seen = set(self._done)
+            for row in job_rows:
+                key = row.get("id", row.get("apply_url"))
+                if key in seen:
+                    continue
+                seen.add(key)
+                unique_rows.append(row)
+
+        total = len(unique_rows)
+        results = []
+        workers = max(1, sum(self.platform_concurrency.values()))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                # Copy the context so worker spans nest under this run's span.
+                pool.submit(contextvars.copy_context().run, self._submit_one,
+                            row, candidate_data, api_keys): row
+                for row in unique_rows
+            }
+            for future in as_completed(futures):
+                row = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"job_id": row.get("id"), "job": f"{row['company']} - {row['title']}",
+                              "success": False, "message": f"Error: {e}", "retries": 0}
+                if result["success"]:
+                    with self._done_lock:
+                        self._done.add(row.get("id", row.get("apply_url")))
+                results.append(result)
+                if on_progress:
+                    on_progress(len(results), total, result)
+        return results
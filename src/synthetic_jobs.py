@@ -0,0 +1,208 @@
+"""Deterministic synthetic job corpus for scale testing.
+
+Produces job dicts in the same shape as `normalize_perplexity_results`, with
+skewed company popularity, weighted titles/locations/ATS platforms, a
+configurable duplicate (re-post) rate and log-normal description lengths.
+The same seed always yields the same corpus.
+
+Usage:
+    python -m src.synthetic_jobs --n 1000000 --seed 7 --out data/imports/synthetic.ndjson
+    python -m src.synthetic_jobs --n 100000 --db
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterator, List
+
+TITLES = [
+    ("Paralegal", 14), ("Legal Assistant", 12), ("Compliance Analyst", 10),
+    ("Contract Analyst", 8), ("Legal Researcher", 7), ("Privacy Analyst", 6),
+    ("Regulatory Analyst", 6), ("Policy Officer", 5), ("Legal Operations Associate", 4),
+    ("Data Protection Officer", 3), ("Legal Technologist", 3), ("Research Assistant", 3),
+    ("Document Review Associate", 3), ("Graduate Legal Adviser", 2), ("Content Moderator", 2),
+    ("Online Tutor (Law)", 1), ("Transcriptionist", 1),
+]
+LEVELS = [("", 10), ("Junior ", 4), ("Graduate ", 3), ("Trainee ", 1), ("Senior ", 1)]
+LOCATIONS = [
+    ("London", 30), ("Remote (UK)", 20), ("Hybrid - London", 12), ("Manchester", 6),
+    ("Birmingham", 5), ("Leeds", 4), ("Bristol", 4), ("Edinburgh", 3), ("Glasgow", 3),
+    ("Ilford", 2), ("Cambridge", 2), ("Oxford", 2), ("Remote (EMEA)", 4), ("Cardiff", 2),
+]
+PLATFORMS = [("greenhouse", 35), ("lever", 25), ("workday", 15), ("ashby", 5),
+             ("smartrecruiters", 5), ("company", 15)]
+_COMPANY_PREFIX = ["Acme", "Northwind", "Globex", "Initech", "Hooli", "Umbrella", "Stark",
+                   "Wayne", "Tyrell", "Cyberdyne", "Soylent", "Vandelay", "Wonka", "Gringotts",
+                   "Aperture", "Oscorp", "Monarch", "Pied Piper", "Massive", "Dunder"]
+_COMPANY_SUFFIX = ["Legal", "Compliance", "LLP", "Group", "Partners", "Analytics", "Ltd",
+                   "Advisory", "Solutions", "Holdings"]
+_SENTENCES = [
+    "You will support the legal team with research and drafting.",
+    "Experience with GDPR and UK data protection law is a plus.",
+    "Review commercial contracts and flag key risks to senior counsel.",
+    "Maintain compliance registers and assist with regulatory filings.",
+    "Work closely with policy, privacy and product stakeholders.",
+    "Strong written communication and attention to detail are essential.",
+    "Familiarity with legal technology and document automation tools.",
+    "Prepare briefing notes, case summaries and research memos.",
+    "Assist with due diligence and data room management.",
+    "Support internal audits and monitor regulatory change.",
+    "This role is open to recent LLB and LLM graduates.",
+    "Hybrid working with two days a week in our London office.",
+]
+
+
+def _weighted(items):
+    values = [v for v, _ in items]
+    cum = list(accumulate(w for _, w in items))
+    return values, cum
+
+
+def _company_names(n: int) -> List[str]:
+    """`n` distinct names; past the 200 prefix/suffix pairs they are numbered ("Acme Legal 2")"""
+    base = [f"{p} {s}" for p in _COMPANY_PREFIX for s in _COMPANY_SUFFIX]
+    return [base[i % len(base)] + (f" {i // len(base) + 1}" if i >= len(base) else "") for i in range(n)]
+
+
+def _description_pool(rng: random.Random, size: int = 256, mu: float = 4.2, sigma: float = 0.6):
+    """Precompute descriptions with log-normal word counts (median ~65 words)."""
+    pool = []
+    for _ in range(size):
+        words = max(8, int(rng.lognormvariate(mu, sigma)))
+        text, count = [], 0
+        while count < words:
+            sentence = rng.choice(_SENTENCES)
+            text.append(sentence)
+            count += len(sentence.split())
+        pool.append(" ".join(text))
+    return pool
+
+
+def _slug(company: str) -> str:
+    return company.lower().replace(" ", "")
+
+
+def _apply_url(platform: str, company: str, i: int, rng: random.Random) -> str:
+    slug = _slug(company)
+    if platform == "greenhouse":
+        return f"https://boards.greenhouse.io/{slug}/jobs/{4000000000 + i}"
+    if platform == "lever":
+        return f"https://jobs.lever.co/{slug}/{uuid.UUID(int=rng.getrandbits(128), version=4)}"
+    if platform == "workday":
+        return f"https://{slug}.wd3.myworkdayjobs.com/en-GB/careers/job/{i}"
+    if platform == "ashby":
+        return f"https://jobs.ashbyhq.com/{slug}/{i}"
+    if platform == "smartrecruiters":
+        return f"https://jobs.smartrecruiters.com/{slug}/{i}"
+    return f"https://careers.{slug}.example.com/jobs/{i}"
+
+
+def generate_jobs(n: int, seed: int = 0, duplicate_rate: float = 0.05,
+                  companies: int = 200) -> Iterator[dict]:
+    """Yield `n` synthetic jobs; about `duplicate_rate` of them re-post an earlier URL."""
+    rng = random.Random(seed)
+    titles, title_cum = _weighted(TITLES)
+    levels, level_cum = _weighted(LEVELS)
+    locations, loc_cum = _weighted(LOCATIONS)
+    platforms, plat_cum = _weighted(PLATFORMS)
+    company_names = _company_names(companies)
+    # Zipf-like popularity: a few employers post most of the jobs.
+    company_cum = list(accumulate(1.0 / (rank + 1) for rank in range(len(company_names))))
+    descriptions = _description_pool(rng)
+    recent_urls: List[dict] = []
+
+    for i in range(n):
+        if recent_urls and rng.random() < duplicate_rate:
+            prev = recent_urls[rng.randrange(len(recent_urls))]
+            job = dict(prev)
+            job["id"] = i + 1
+            job["posted_date"] = f"{rng.randint(0, 3)} days ago"
+            yield job
+            continue
+
+        company = rng.choices(company_names, cum_weights=company_cum)[0]
+        title = rng.choices(levels, cum_weights=level_cum)[0] + rng.choices(titles, cum_weights=title_cum)[0]
+        platform = rng.choices(platforms, cum_weights=plat_cum)[0]
+        if rng.random() < 0.6:
+            posted = f"{rng.randint(0, 30)} days ago"
+        else:
+            posted = f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        job = {
+            "id": i + 1,
+            "title": title,
+            "company": company,
+            "location": rng.choices(locations, cum_weights=loc_cum)[0],
+            "platform": "synthetic",
+            "apply_url": _apply_url(platform, company, i, rng),
+            "description": descriptions[rng.randrange(len(descriptions))],
+            "posted_date": posted,
+            "status": "NOT_APPLIED",
+        }
+        if len(recent_urls) < 4096:
+            recent_urls.append(job)
+        else:
+            recent_urls[rng.randrange(4096)] = job
+        yield job
+
+
+def write_ndjson(jobs, out_path) -> int:
+    """Stream jobs to an NDJSON file; returns the number of lines written."""
+    p = Path(out_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    with open(p, "w", encoding="utf-8", buffering=1 << 20) as f:
+        for job in jobs:
+            f.write(dumps(job))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def load_into_db(jobs, batch_size: int = 10000) -> int:
+    """Stream jobs into the database through the bulk upsert path."""
+    from src.db import init_db
+    from src.pplx_search import bulk_upsert_jobs
+
+    init_db()
+    return bulk_upsert_jobs(jobs, batch_size=batch_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic job corpus")
+    parser.add_argument("--n", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.05)
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--out", default=None, help="NDJSON output path ('-' for stdout)")
+    parser.add_argument("--db", action="store_true", help="insert into JOB_O_MATIC_DATABASE_URL")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    if not args.out and not args.db:
+        parser.error("choose --out and/or --db")
+
+    started = time.perf_counter()
+    jobs = generate_jobs(args.n, args.seed, args.duplicate_rate, args.companies)
+    if args.out == "-":
+        for job in jobs:
+            sys.stdout.write(json.dumps(job, ensure_ascii=False) + "\n")
+        return
+    if args.out and args.db:
+        jobs = list(jobs)
+    if args.out:
+        written = write_ndjson(jobs, args.out)
+        print(f"Wrote {written} jobs to {args.out}", file=sys.stderr)
+    if args.db:
+        inserted = load_into_db(jobs, args.batch_size)
+        print(f"Inserted {inserted} new jobs into the database", file=sys.stderr)
+    print(f"Done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
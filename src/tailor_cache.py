@@ -0,0 +1,188 @@
+"""Persistent memoization for `tailor(job_desc, variant)`.
+
+Tailoring is an LLM call and by far the most expensive step of bulk preview.
+Results are stored in the `tailor_cache` table keyed on a hash of the
+normalized job description, the CV variant and the prompt/template version,
+so re-previews and duplicate descriptions posted under different URLs are free.
+"""
+
+import hashlib
+import os
+import re
+from datetime import datetime
+from typing import Optional
+
+from src import metrics
+
+TAILOR_PROMPT_VERSION = os.getenv("TAILOR_PROMPT_VERSION", "1")
+TAILOR_CACHE_MAX_ENTRIES = int(os.getenv("TAILOR_CACHE_MAX_ENTRIES", "5000"))
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_description(job_desc: str) -> str:
+    """Collapse whitespace and case so trivially different postings share a key."""
+    return _WS_RE.sub(" ", (job_desc or "").strip()).lower()
+
+
+def cache_key(job_desc: str, variant: str, prompt_version: str = TAILOR_PROMPT_VERSION) -> str:
+    desc_hash = hashlib.sha256(normalize_description(job_desc).encode("utf-8")).hexdigest()
+    raw = f"{prompt_version}\0{variant}\0{desc_hash}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TailorCache:
+    """Size-bounded, DB-backed cache of tailored content with hit-rate stats."""
+
+    def __init__(self, session_factory=None, max_entries: int = TAILOR_CACHE_MAX_ENTRIES,
+                 prompt_version: str = TAILOR_PROMPT_VERSION):
+        if session_factory is None:
+            from src.db import get_session, init_db
+
+            init_db()
+            session_factory = get_session
+        self.session_factory = session_factory
+        self.max_entries = max_entries
+        self.prompt_version = prompt_version
+        self.hits = 0
+        self.misses = 0
+        self._count: Optional[int] = None  # running row count, loaded on the first insert
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+    def get_or_compute(self, job_desc: str, variant: str, compute, force_refresh: bool = False) -> str:
+        """Return cached content for (job_desc, variant) or call `compute()` and store it.
+
+        No session is held while `compute()` (the LLM call) runs.
+        """
+        from src.models import TailorCacheEntry
+
+        key = cache_key(job_desc, variant, self.prompt_version)
+        if not force_refresh:
+            sess = self.session_factory()
+            try:
+                entry = sess.query(TailorCacheEntry).filter(TailorCacheEntry.cache_key == key).one_or_none()
+                if entry is not None:
+                    entry.hit_count = (entry.hit_count or 0) + 1
+                    entry.last_used_at = datetime.utcnow()
+                    content = entry.content
+                    sess.commit()
+                    self.hits += 1
+                    metrics.TAILOR_CACHE_LOOKUPS.labels(result="hit").inc()
+                    return content
+            except Exception:
+                sess.rollback()
+                raise
+            finally:
+                sess.close()
+
+        self.misses += 1
+        metrics.TAILOR_CACHE_LOOKUPS.labels(result="miss").inc()
+        content = compute()
+        self._store(key, variant, content)
+        return content
+
+    def _store(self, key: str, variant: str, content: str) -> None:
+        from sqlalchemy.exc import IntegrityError
+
+        from src.models import TailorCacheEntry
+
+        now = datetime.utcnow()
+        sess = self.session_factory()
+        try:
+            # Another worker may have stored the same key while compute() ran
+            entry = sess.query(TailorCacheEntry).filter(TailorCacheEntry.cache_key == key).one_or_none()
+            if entry is None:
+                if self._count is None:
+                    self._count = sess.query(TailorCacheEntry).count()
+                sess.add(
+                    TailorCacheEntry(
+                        cache_key=key,
+                        variant=variant,
+                        prompt_version=self.prompt_version,
+                        content=content,
+                        created_at=now,
+                        last_used_at=now,
+                    )
+                )
+                self._count += 1
+            else:
+                entry.content = content
+                entry.created_at = now
+                entry.last_used_at = now
+            sess.flush()
+            if self._count is not None and self._count > self.max_entries:
+                self._evict(sess)
+            sess.commit()
+        except IntegrityError:
+            # Lost an insert race for the same key; the winner's row serves later hits
+            sess.rollback()
+            self._count = None
+        except Exception:
+            sess.rollback()
+            self._count = None  # recount on the next insert
+            raise
+        finally:
+            sess.close()
+
+    def _evict(self, sess) -> None:
+        """Drop least-recently-used entries beyond max_entries.
+
+        Only called when the running count says an insert went over the
+        limit; the table is counted again here in case other processes
+        share it.
+        """
+        from src.models import TailorCacheEntry
+
+        self._count = sess.query(TailorCacheEntry).count()
+        overflow = self._count - self.max_entries
+        if overflow <= 0:
+            return
+        stale_ids = [
+            row.id
+            for row in sess.query(TailorCacheEntry.id)
+            .order_by(TailorCacheEntry.last_used_at.asc())
+            .limit(overflow)
+        ]
+        sess.query(TailorCacheEntry).filter(TailorCacheEntry.id.in_(stale_ids)).delete(
+            synchronize_session=False
+        )
+        self._count -= len(stale_ids)
+
+    def clear(self) -> int:
+        from src.models import TailorCacheEntry
+
+        sess = self.session_factory()
+        try:
+            deleted = sess.query(TailorCacheEntry).delete()
+            sess.commit()
+            self._count = 0
+            return deleted
+        finally:
+            sess.close()
+
+
+_cache = None
+
+
+def get_cache() -> TailorCache:
+    global _cache
+    if _cache is None:
+        _cache = TailorCache()
+    return _cache
+
+
+def cached_tailor(job_desc: str, variant: str, force_refresh: bool = False, tailor_fn=None) -> str:
+    """Drop-in replacement for `tailor(job_desc, variant)` backed by the cache."""
+    if tailor_fn is None:
+        from src.tailor import tailor
+        tailor_fn = tailor
+    return get_cache().get_or_compute(
+        job_desc, variant, lambda: tailor_fn(job_desc, variant), force_refresh=force_refresh
+    )
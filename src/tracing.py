@@ -0,0 +1,226 @@
+"""Lightweight in-process tracing.
+
+`span()` (context manager) and `traced()` (decorator) time a block of work and
+record it, with attributes and parent/child links, into a fixed-size ring
+buffer. If JOB_O_MATIC_TRACE_FILE is set, each finished span is also appended
+to that file as one OTLP/JSON `resourceSpans` document per line.
+
+    with span("bulk_preview.tailor", job_id=job.id):
+        ...
+
+    @traced("pplx.search")
+    def search_perplexity(...): ...
+"""
+
+import contextvars
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterable, List, Optional
+
+TRACING_ENABLED = os.getenv("JOB_O_MATIC_TRACING", "true").lower() in ("1", "true", "yes")
+TRACE_BUFFER_SIZE = int(os.getenv("JOB_O_MATIC_TRACE_BUFFER", "2000"))
+TRACE_FILE = os.getenv("JOB_O_MATIC_TRACE_FILE", "")
+SERVICE_NAME = "job-o-matic"
+
+_buffer: Deque["Span"] = deque(maxlen=TRACE_BUFFER_SIZE)
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "job_o_matic_current_span", default=None)
+_file_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "duration_ns",
+                 "attributes", "status", "error", "_t0")
+
+    def __init__(self, name: str, parent=None, attributes=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = time.time_ns()
+        self.duration_ns = 0
+        self.attributes = dict(attributes or {})
+        self.status = "OK"
+        self.error: Optional[str] = None
+        self._t0 = time.perf_counter_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1e6
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": dict(self.attributes),
+        }
+
+    def to_otlp(self) -> dict:
+        def _value(v):
+            if isinstance(v, bool):
+                return {"boolValue": v}
+            if isinstance(v, int):
+                return {"intValue": str(v)}
+            if isinstance(v, float):
+                return {"doubleValue": v}
+            return {"stringValue": str(v)}
+
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.start_ns + self.duration_ns),
+            "attributes": [{"key": k, "value": _value(v)} for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error or ""} if self.status == "ERROR" else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _export(span: Span) -> None:
+    doc = {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "src.tracing"}, "spans": [span.to_otlp()]}],
+        }]
+    }
+    line = json.dumps(doc, separators=(",", ":")) + "\n"
+    try:
+        with _file_lock, open(TRACE_FILE, "a", encoding="utf-8") as f:
+            f.write(line)
+    except OSError as e:
+        print("Could not write trace file:", e)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time the enclosed block as a span named `name`."""
+    if not TRACING_ENABLED:
+        yield None
+        return
+    s = Span(name, _current.get(), attributes)
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.status = "ERROR"
+        s.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        s.duration_ns = time.perf_counter_ns() - s._t0
+        _current.reset(token)
+        _buffer.append(s)
+        if TRACE_FILE:
+            _export(s)
+
+
+def traced(name: Optional[str] = None, **attributes):
+    """Decorator form of `span`; defaults the span name to module.function."""
+    def decorator(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_span():
+    return _current.get()
+
+
+def recent_spans(limit: Optional[int] = None) -> list:
+    spans = list(_buffer)
+    return spans[-limit:] if limit else spans
+
+
+def slowest_spans(n: int = 20) -> list:
+    return sorted(_buffer, key=lambda s: s.duration_ns, reverse=True)[:n]
+
+
+def summarize_spans(spans: Optional[Iterable[dict]] = None) -> list:
+    """Per-name count, total, mean, p95 and max duration (ms), slowest first.
+
+    Summarizes the in-process buffer, or span dicts such as `load_trace_file()` returns.
+    """
+    if spans is None:
+        spans = [s.to_dict() for s in list(_buffer)]
+    by_name: Dict[str, List[float]] = {}
+    for s in spans:
+        by_name.setdefault(s["name"], []).append(s["duration_ms"])
+    rows: List[dict] = []
+    for name, durations in by_name.items():
+        durations.sort()
+        p95 = durations[min(len(durations) - 1, int(0.95 * len(durations)))]
+        rows.append({
+            "name": name,
+            "count": len(durations),
+            "total_ms": sum(durations),
+            "mean_ms": sum(durations) / len(durations),
+            "p95_ms": p95,
+            "max_ms": durations[-1],
+        })
+    rows.sort(key=lambda r: r["total_ms"], reverse=True)
+    return rows
+
+
+def load_trace_file(path: Optional[str] = None, limit: int = 5000) -> list:
+    """Read the last `limit` spans back from an OTLP/JSON trace file as dicts."""
+    path = path or TRACE_FILE
+    if not path:
+        return []
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = deque(f, maxlen=limit)
+    except OSError:
+        return []
+    spans = []
+    for line in lines:
+        try:
+            doc = json.loads(line)
+        except ValueError:
+            continue
+        for rs in doc.get("resourceSpans", []):
+            for ss in rs.get("scopeSpans", []):
+                for sp in ss.get("spans", []):
+                    start = int(sp.get("startTimeUnixNano", 0))
+                    attrs = {a["key"]: next(iter(a["value"].values()), None)
+                             for a in sp.get("attributes", [])}
+                    spans.append({
+                        "name": sp.get("name"),
+                        "trace_id": sp.get("traceId"),
+                        "span_id": sp.get("spanId"),
+                        "parent_id": sp.get("parentSpanId"),
+                        "start_ns": start,
+                        "duration_ms": (int(sp.get("endTimeUnixNano", start)) - start) / 1e6,
+                        "status": "ERROR" if sp.get("status", {}).get("code") == 2 else "OK",
+                        "error": sp.get("status", {}).get("message") or None,
+                        "attributes": attrs,
+                    })
+    return spans
+
+
+def clear_spans() -> None:
+    _buffer.clear()
@@ -0,0 +1,36 @@
+"""Shared fixtures for the pipeline benchmarks."""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.mock_pplx import start_mock_pplx  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def mock_pplx():
+    server = start_mock_pplx()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fresh_db(monkeypatch):
+    """Point src.db at a fresh in-memory database for one benchmark round."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    import src.db
+    from src.db import init_db
+
+    def _make():
+        engine = create_engine("sqlite://", future=True)
+        init_db(engine)
+        monkeypatch.setattr(
+            src.db, "SessionLocal", sessionmaker(bind=engine, autoflush=False, future=True)
+        )
+
+    return _make
@@ -0,0 +1,48 @@
+"""Cold-start benchmark: `python -X importtime -c "import app"`.
+
+Each round is a fresh interpreter. The slowest imports by cumulative time are
+stored in the benchmark's extra_info so regressions show which module grew.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+ROOT = Path(__file__).resolve().parents[2]
+BUDGET_S = float(os.getenv("JOB_O_MATIC_IMPORT_BUDGET_MS", "1000")) / 1000
+
+
+def parse_importtime(stderr: str):
+    """Return [(module, depth, self_us, cumulative_us)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def _import_app():
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "STREAMLIT_HEADLESS": "1"},
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    return parse_importtime(proc.stderr)
+
+
+def test_app_cold_import(benchmark):
+    rows = benchmark.pedantic(_import_app, rounds=5, iterations=1)
+    app_us = next(cum for name, depth, _, cum in rows if name == "app" and depth == 0)
+    # Direct imports of app (depth 1) are what a lazy-import change moves around.
+    direct = sorted((r for r in rows if r[1] == 1), key=lambda r: r[3], reverse=True)
+    benchmark.extra_info["app_import_ms"] = app_us / 1000
+    benchmark.extra_info["slowest_imports_ms"] = {name: cum / 1000 for name, _, _, cum in direct[:10]}
+    assert app_us / 1e6 <= BUDGET_S, f"import app took {app_us / 1000:.0f} ms"
@@ -0,0 +1,29 @@
+"""Benchmark for vectorized review analysis at 10k and 100k reviews.
+
+Run with `pytest tests/benchmarks --benchmark-only`.
+"""
+import random
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.pr_reviews import analyze_reviews_frame, reviews_to_frame  # noqa: E402
+
+# Absolute ceilings in seconds (mean time per round), ~20x the typical mean
+BUDGETS = {10_000: 0.5, 100_000: 2.0}
+
+
+@pytest.mark.parametrize("size", sorted(BUDGETS))
+def test_analyze_reviews_frame(benchmark, size):
+    rng = random.Random(size)
+    states = ["APPROVED", "CHANGES_REQUESTED", "COMMENTED", "DISMISSED"]
+    reviews_by_pr = {}
+    for _ in range(size):
+        reviews_by_pr.setdefault(rng.randrange(size // 50), []).append(
+            {"user": {"login": f"u{rng.randrange(40)}"}, "state": rng.choice(states)})
+    frame = reviews_to_frame(reviews_by_pr)
+
+    result = benchmark.pedantic(analyze_reviews_frame, args=(frame,), rounds=3, iterations=1)
+    assert len(result) == len(reviews_by_pr)
+    assert benchmark.stats.stats.mean <= BUDGETS[size]
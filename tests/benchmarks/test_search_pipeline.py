@@ -0,0 +1,67 @@
+"""Benchmarks for search -> normalize -> insert at 100, 10k and 100k jobs.
+
+Run with `pytest tests/benchmarks --benchmark-only`. Each case also asserts an
+absolute ceiling, set at roughly 10-20x the typical mean. That catches
+order-of-magnitude regressions on shared CI runners without flaking on
+runner noise. It does not catch small drift; for that, compare against a
+saved run locally (`--benchmark-save=base`, then
+`--benchmark-compare --benchmark-compare-fail=mean:20%`).
+Set JOB_O_MATIC_BENCH_SIZES (e.g. "100,10000") to run a subset.
+"""
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src import pplx_search  # noqa: E402
+from src.mock_pplx import build_payload  # noqa: E402
+
+SIZES = [int(s) for s in os.getenv("JOB_O_MATIC_BENCH_SIZES", "100,10000,100000").split(",")]
+
+# Absolute ceilings in seconds (mean time per round), not regression baselines.
+BUDGETS = {
+    "search": {100: 0.25, 10_000: 1.0, 100_000: 5.0},
+    "normalize": {100: 0.05, 10_000: 0.5, 100_000: 3.0},
+    "insert": {100: 1.0, 10_000: 30.0, 100_000: 300.0},
+}
+
+
+def _rounds(size):
+    return {"rounds": 5, "iterations": 1} if size <= 10_000 else {"rounds": 1, "iterations": 1}
+
+
+def _assert_budget(benchmark, stage, size):
+    mean = benchmark.stats.stats.mean
+    assert mean <= BUDGETS[stage][size], f"{stage}@{size}: {mean:.3f}s exceeds budget"
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_search_stage(benchmark, mock_pplx, monkeypatch, size):
+    monkeypatch.setattr(pplx_search, "ENABLED", True)
+    monkeypatch.setattr(pplx_search, "API_KEY", "test")
+    monkeypatch.setattr(pplx_search, "PERPLEXITY_API_URL", f"{mock_pplx.url}?n={size}")
+    mock_pplx.payload_bytes({**mock_pplx.defaults, "n": size})  # warm the payload cache
+
+    raw = benchmark.pedantic(pplx_search.search_perplexity, args=("bench", False), **_rounds(size))
+    assert len(raw["results"]) == size
+    _assert_budget(benchmark, "search", size)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_normalize_stage(benchmark, size):
+    raw = build_payload(n=size, shape="results", fields="mixed")
+    jobs = benchmark.pedantic(pplx_search.normalize_perplexity_results, args=(raw,), **_rounds(size))
+    assert len(jobs) == size
+    _assert_budget(benchmark, "normalize", size)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_insert_stage(benchmark, fresh_db, size):
+    jobs = pplx_search.normalize_perplexity_results(build_payload(n=size, shape="results"))
+
+    inserted = benchmark.pedantic(
+        pplx_search.insert_jobs_into_db, args=(jobs,), setup=fresh_db, **_rounds(size)
+    )
+    assert inserted == size
+    _assert_budget(benchmark, "insert", size)
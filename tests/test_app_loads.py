@@ -1,9 +1,39 @@
 """Basic import test for Streamlit app."""
 import os
+import subprocess
 import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[1]
+LAZY_MODULES = ("pandas", "numpy", "sqlalchemy", "requests", "docx")
+# Loose guard for plain `pytest` runs; the tight 1 s budget is in tests/benchmarks/test_import_time.py
+IMPORT_CEILING_S = float(os.getenv("JOB_O_MATIC_IMPORT_CEILING_MS", "5000")) / 1000
+
+
+def _import_app_fresh():
+    """Import app in a clean interpreter; return (heavy modules loaded eagerly, import seconds)."""
+    code = ("import sys, app; "
+            f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "STREAMLIT_HEADLESS": "1"},
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    # -X importtime lines: "import time: self [us] | cumulative | name"; app is at depth 0
+    app_us = next(int(line.split("|")[1]) for line in proc.stderr.splitlines()
+                  if line.startswith("import time:") and line.split("|")[2] == " app")
+    return [m for m in proc.stdout.strip().split(",") if m], app_us / 1e6
+
+
 def test_app_loads():
     os.environ["STREAMLIT_HEADLESS"] = "1"
-    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    sys.path.insert(0, str(ROOT))
     __import__("app")
+
+
+def test_heavy_modules_are_imported_lazily():
+    loaded, seconds = _import_app_fresh()
+    assert loaded == [], f"heavy modules imported at startup: {loaded}"
+    assert seconds <= IMPORT_CEILING_S, f"import app took {seconds * 1000:.0f} ms"
+
@@ -0,0 +1,143 @@
+"""Tests for bulk preview/approve over the jobs table."""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+import src.db
+from src.auto_submit import JobApplicationSubmitter
+from src.bulk_ops import bulk_approve, bulk_preview
+from src.db import init_db
+from src.models import Job
+from src.sections import load_sections
+from src.submission_ledger import SubmissionLedger
+from src.tailor_cache import TailorCache
+
+TAILORED = """=== SUMMARY ===
+Legal researcher.
+=== COVER_PARAGRAPH ===
+I would love to join {company}.
+"""
+
+
+def test_bulk_preview_writes_bundles_with_sections(tmp_path, monkeypatch):
+    engine = create_engine("sqlite://", future=True)
+    init_db(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, future=True)
+    monkeypatch.setattr(src.db, "SessionLocal", factory)
+    with engine.begin() as conn:
+        conn.execute(Job.__table__.insert(), [
+            {"title": "Paralegal", "company": "Acme", "description": "GDPR work", "status": "NOT_APPLIED"},
+            {"title": "Paralegal", "company": "Beta", "description": "GDPR work", "status": "NOT_APPLIED"},
+        ])
+
+    calls = []
+
+    def tailor(job_text, variant):
+        calls.append((job_text, variant))
+        return TAILORED.format(company="you")
+
+    progress = []
+    results = bulk_preview(
+        [1, 2], on_progress=lambda done, total, job, outdir: progress.append((done, total)),
+        pick_variant=lambda text: ("legal", "CV_Legal.docx"), tailor=tailor,
+        tailor_cache=TailorCache(factory), out_dir=tmp_path,
+    )
+
+    assert [r["status"] for r in results] == ["success", "success"]
+    assert progress == [(1, 2), (2, 2)]
+    assert calls == [("GDPR work", "legal")]  # the duplicate description is a cache hit
+    sections = load_sections(results[0]["output_dir"])
+    assert sections == {"SUMMARY": "Legal researcher.", "COVER_PARAGRAPH": "I would love to join you."}
+    outdir = Path(results[1]["output_dir"])
+    assert "I would love to join you." in (outdir / "email_body.txt").read_text(encoding="utf-8")
+
+    assert bulk_approve([1, 2]) == 2
+    with engine.connect() as conn:
+        assert set(conn.execute(select(Job.status)).scalars()) == {"APPROVED"}
+
+
+class RecordingSession:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, data=None, json=None, headers=None, timeout=None):
+        body = data.read() if hasattr(data, "read") else data
+        self.posts.append({"url": url, "body": body, "json": json, "headers": headers})
+        return SimpleNamespace(status_code=201, text="", headers={})
+
+
+def _preview_db(monkeypatch, jobs):
+    engine = create_engine("sqlite://", future=True)
+    init_db(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, future=True)
+    monkeypatch.setattr(src.db, "SessionLocal", factory)
+    with engine.begin() as conn:
+        conn.execute(Job.__table__.insert(), jobs)
+    return engine, factory
+
+
+def test_preview_bundle_cv_reaches_submitter(tmp_path, monkeypatch):
+    engine, factory = _preview_db(monkeypatch, [
+        {"title": "Paralegal", "company": "Acme", "description": "GDPR work", "status": "NOT_APPLIED",
+         "apply_url": "https://boards.greenhouse.io/acme/jobs/101"},
+        {"title": "Paralegal Senior", "company": "Acme", "description": "GDPR lead", "status": "NOT_APPLIED",
+         "apply_url": "https://boards.greenhouse.io/acme/jobs/102"},
+    ])
+    cv_dir = tmp_path / "cv"
+    cv_dir.mkdir()
+    (cv_dir / "CV_Legal.pdf").write_bytes(b"%PDF legal cv")
+
+    results = bulk_preview(
+        [1, 2], pick_variant=lambda text: ("legal", "CV_Legal.pdf"),
+        tailor=lambda text, variant: TAILORED.format(company=text),
+        tailor_cache=TailorCache(factory), out_dir=tmp_path / "outputs", cv_dir=cv_dir,
+    )
+    assert [r["status"] for r in results] == ["success", "success"]
+    assert results[0]["output_dir"] != results[1]["output_dir"]
+    assert (Path(results[0]["output_dir"]) / "cv_legal.pdf").read_bytes() == b"%PDF legal cv"
+
+    with engine.connect() as conn:
+        row = dict(conn.execute(
+            select(Job.id, Job.company, Job.title, Job.apply_url, Job.preview_dir.label("output_dir"))
+            .where(Job.id == 1)
+        ).mappings().one())
+    assert row["output_dir"] == results[0]["output_dir"]
+
+    http = RecordingSession()
+    submitter = JobApplicationSubmitter(session=http, ledger=SubmissionLedger(factory))
+    ok, message = submitter.auto_submit_with_confirmation(
+        row, {"email": "omar@example.com"}, row["output_dir"], {"greenhouse": "k"}
+    )
+    assert ok, message
+    (post,) = http.posts
+    assert post["url"].endswith("/v1/boards/acme/jobs/101")
+    assert b"%PDF legal cv" in post["body"]
+    assert b"GDPR work" in post["body"]  # this job's own cover letter
+
+
+def test_submitter_refuses_bundle_without_cv(tmp_path, monkeypatch):
+    _, factory = _preview_db(monkeypatch, [
+        {"title": "Paralegal", "company": "Acme", "description": "GDPR work", "status": "NOT_APPLIED",
+         "apply_url": "https://boards.greenhouse.io/acme/jobs/101"},
+    ])
+    (result,) = bulk_preview(
+        [1], pick_variant=lambda text: ("legal", "missing.pdf"),
+        tailor=lambda text, variant: TAILORED.format(company="you"),
+        tailor_cache=TailorCache(factory), out_dir=tmp_path, cv_dir=tmp_path / "cv",
+    )
+    assert result["cv_file"] is None
+
+    http = RecordingSession()
+    submitter = JobApplicationSubmitter(session=http, ledger=SubmissionLedger(factory))
+    ok, message = submitter.auto_submit_with_confirmation(
+        {"id": 1, "apply_url": "https://boards.greenhouse.io/acme/jobs/101"}, {"email": "o@example.com"},
+        result["output_dir"], {"greenhouse": "k"},
+    )
+    assert not ok
+    assert "No CV" in message
+    assert http.posts == []
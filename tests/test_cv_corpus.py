@@ -0,0 +1,22 @@
+"""Tests for the in-memory CV corpus loader."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.cv_corpus import corpus_signature, load_cv_corpus
+
+
+def test_corpus_loads_text_and_signature_tracks_changes(tmp_path):
+    assert load_cv_corpus(tmp_path / "missing") == {}
+    (tmp_path / "CV_General.txt").write_text("Legal researcher", encoding="utf-8")
+    (tmp_path / "CV_Legal.pdf").write_bytes(b"%PDF-1.4")
+    before = corpus_signature(tmp_path)
+
+    corpus = load_cv_corpus(tmp_path)
+    assert list(corpus) == ["CV_General.txt", "CV_Legal.pdf"]
+    assert corpus["CV_General.txt"]["text"] == "Legal researcher"
+    assert corpus["CV_Legal.pdf"]["text"] == ""
+
+    (tmp_path / "CV_General.txt").write_text("Legal researcher, GDPR", encoding="utf-8")
+    assert corpus_signature(tmp_path) != before
@@ -0,0 +1,38 @@
+"""Tests for the compiled email/cover-letter templates."""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.email_templates import TemplateStore
+
+
+def test_defaults_render_without_files(tmp_path):
+    store = TemplateStore(tmp_path / "missing")
+    subject, body = store.render(
+        "email_template.txt",
+        {"company": "Acme", "title": "Paralegal", "cover_paragraph": "Hi.", "candidate_name": "O"},
+    )
+    assert subject == "Application for Paralegal at Acme"
+    assert "Dear Hiring Team at Acme," in body
+
+
+def test_reloads_when_file_changes(tmp_path):
+    tpl = tmp_path / "email_template.txt"
+    tpl.write_text("Subject: v1 $title\nBody one", encoding="utf-8")
+    store = TemplateStore(tmp_path, watch_interval=0)
+    assert store.render("email_template.txt", {"title": "X"}) == ("v1 X", "Body one")
+
+    tpl.write_text("Subject: v2 $title\nBody two", encoding="utf-8")
+    future = time.time() + 10
+    os.utime(tpl, (future, future))
+    assert store.render("email_template.txt", {"title": "X"}) == ("v2 X", "Body two")
+
+
+def test_render_batch(tmp_path):
+    store = TemplateStore(tmp_path)
+    rows = [{"company": f"C{i}", "title": "T", "cover_paragraph": "", "candidate_name": ""} for i in range(3)]
+    out = store.render_batch("email_template.txt", rows)
+    assert [s for s, _ in out] == [f"Application for T at C{i}" for i in range(3)]
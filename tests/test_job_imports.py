@@ -0,0 +1,106 @@
+"""Tests for streaming, resumable job imports."""
+import io
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+import src.db
+import src.pplx_search
+from src.db import init_db
+from src.job_imports import iter_json_array, scan_imports
+from src.job_schema import normalize
+from src.models import Job
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://", future=True)
+    init_db(engine)
+    monkeypatch.setattr(src.db, "SessionLocal", sessionmaker(bind=engine, autoflush=False, future=True))
+    return engine
+
+
+def _job(i):
+    return {"title": f"Paralegal {i}", "company": "Acmé", "apply_url": f"https://boards.greenhouse.io/acme/jobs/{i}"}
+
+
+def _count(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count(Job.id))).scalar_one()
+
+
+def test_json_array_stream_offsets_are_resumable_byte_positions():
+    raw = json.dumps([_job(i) for i in range(20)], ensure_ascii=False, indent=1).encode("utf-8")
+    items = list(iter_json_array(io.BytesIO(raw), chunk_size=7))
+    assert [it["title"] for it, _ in items[:-1]] == [f"Paralegal {i}" for i in range(20)]
+    assert items[-1] == (None, len(raw))
+
+    offset = items[4][1]
+    resumed = list(iter_json_array(io.BytesIO(raw), start=offset, chunk_size=5))
+    assert [it["title"] for it, _ in resumed[:-1]] == [f"Paralegal {i}" for i in range(5, 20)]
+    # Truncated mid-item: stops after the last complete element
+    assert len(list(iter_json_array(io.BytesIO(raw[:-40])))) == 19
+
+
+def test_ndjson_skip_append_and_partial_line(tmp_path, db):
+    path = tmp_path / "feed.ndjson"
+    path.write_text("".join(json.dumps(_job(i)) + "\n" for i in range(5)) + '{"title": "half', encoding="utf-8")
+
+    (result,) = scan_imports(tmp_path, batch_size=2)
+    assert (result["status"], result["items"]) == ("partial", 5)
+    assert _count(db) == 5
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(' written", "company": "Acme"}\nnot json\n' + json.dumps(_job(6)) + "\n")
+    (result,) = scan_imports(tmp_path, batch_size=2)
+    assert (result["status"], result["items"], result["errors"]) == ("resumed", 2, 1)
+    assert _count(db) == 7
+
+    assert scan_imports(tmp_path)[0]["status"] == "skipped"
+
+
+def test_failed_batch_resumes_and_rewrite_restarts(tmp_path, db, monkeypatch):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps([_job(i) for i in range(6)]), encoding="utf-8")
+
+    real = src.pplx_search.bulk_upsert_jobs
+    calls = []
+
+    def flaky(jobs, batch_size=5000, raise_errors=False):
+        calls.append(len(jobs))
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        return real(jobs, batch_size, raise_errors)
+
+    monkeypatch.setattr(src.pplx_search, "bulk_upsert_jobs", flaky)
+    assert scan_imports(tmp_path, batch_size=2)[0]["status"] == "error"
+    assert _count(db) == 2
+
+    (result,) = scan_imports(tmp_path, batch_size=2)
+    assert (result["status"], result["items"]) == ("resumed", 4)
+    assert _count(db) == 6
+
+    path.write_text(json.dumps({"jobs": [_job(i) for i in range(10, 13)]}), encoding="utf-8")
+    (result,) = scan_imports(tmp_path, batch_size=2)
+    assert (result["status"], result["items"]) == ("imported", 3)
+    assert _count(db) == 9
+
+
+def test_saved_search_results_keep_their_posted_at(tmp_path, db):
+    raw = [{**_job(0), "posted_date": "2 days ago"}, {**_job(1), "posted_date": "Dec 20"}]
+    jobs, _ = normalize(raw, now=datetime(2026, 1, 1, 12, 0))
+    src.pplx_search.save_jobs_to_file(jobs, str(tmp_path))
+
+    (result,) = scan_imports(tmp_path)
+    assert (result["status"], result["items"]) == ("imported", 2)
+    with db.connect() as conn:
+        posted = dict(conn.execute(select(Job.title, Job.posted_at)).all())
+    assert posted["Paralegal 0"].date() == datetime(2025, 12, 30).date()
+    assert posted["Paralegal 1"].date() == datetime(2025, 12, 20).date()
@@ -0,0 +1,90 @@
+"""Tests for the schema-mapping engine behind normalize_perplexity_results."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src import job_schema
+from src.mock_pplx import build_payload
+from src.pplx_search import normalize_perplexity_results
+
+
+def test_envelopes_are_unwrapped():
+    items = build_payload(n=5, shape="list")
+    for payload in (items, {"results": items}, {"jobs": items, "meta": {"n": 5}},
+                    {"data": items}, {"data": {"jobs": items}}, {"data": {"data": {"results": items}}}):
+        jobs = normalize_perplexity_results(payload)
+        assert [j["title"] for j in jobs] == [it["title"] for it in items]
+    assert len(normalize_perplexity_results(items[0])) == 1
+    assert normalize_perplexity_results({"meta": {}}) == []
+    assert normalize_perplexity_results(None) == []
+
+
+def test_alias_fields_map_like_canonical_ones():
+    canonical = {"title": "Engineer", "company": "Acme", "location": "London",
+                 "apply_url": "https://acme.example/jobs/1", "description_snippet": "Build",
+                 "posted_date": "2026-10-01"}
+    alt = {"job_title": "Engineer", "employer": "Acme", "place": "London",
+           "url": "https://acme.example/jobs/1", "description": "Build", "date": "2026-10-01"}
+    a, b = normalize_perplexity_results([canonical]), normalize_perplexity_results([alt])
+    assert a == b
+    assert a[0]["platform"] == "perplexity"
+    assert a[0]["posted_at"] == "2026-10-01T00:00:00"
+    # An empty preferred key falls through to the next alias, as before
+    assert normalize_perplexity_results([{**alt, "title": ""}])[0]["title"] == "Engineer"
+
+
+def test_ids_are_stable_and_content_based():
+    items = build_payload(n=50, shape="list", fields="mixed")
+    first = [j["id"] for j in normalize_perplexity_results(items)]
+    again = [j["id"] for j in normalize_perplexity_results(list(reversed(items)))]
+    assert sorted(first) == sorted(again)
+    assert len(set(first)) == len(first)
+    assert normalize_perplexity_results(items[:1])[0]["id"] == first[0]
+
+
+def test_bulk_validation_and_coverage():
+    payload = {"jobs": [
+        {"title": "A", "company": "X", "url": "https://x.example/1"},
+        {"title": "A", "company": "X", "url": "https://x.example/1"},  # duplicate
+        {"title": "B", "company": "Y"},
+        {"title": "no company"},
+        "not a job",
+    ]}
+    jobs, report = job_schema.normalize(payload)
+    assert [j["title"] for j in jobs] == ["A", "B"]
+    assert (report["items"], report["valid"], report["invalid"], report["duplicates"]) == (5, 2, 2, 1)
+    assert report["coverage"]["title"] == 1.0
+    assert report["coverage"]["apply_url"] == 0.5
+    assert report["coverage"]["posted_date"] == 0.0
+
+
+def test_extractors_are_keyed_on_known_aliases_only():
+    job_schema._extractors.clear()
+    items = [{"title": f"T{i}", "company": "X", f"extra_{i}": i} for i in range(50)]
+    jobs = normalize_perplexity_results(items)
+    assert len(jobs) == 50
+    assert len(job_schema._extractors) == 1
+    # Reordered keys share the extractor as well
+    normalize_perplexity_results([{"company": "X", "title": "T"}])
+    assert len(job_schema._extractors) == 1
+
+
+def test_scalar_values_are_coerced_to_str():
+    jobs, report = job_schema.normalize([
+        {"title": "x", "company": "y", "apply_url": 123, "location": 4.5, "posted_date": 2026},
+    ])
+    assert report["valid"] == 1
+    assert (jobs[0]["apply_url"], jobs[0]["location"], jobs[0]["posted_date"]) == ("123", "4.5", "2026")
+    assert jobs[0]["id"] == job_schema.normalize([{"title": "x", "company": "y", "apply_url": "123"}])[0][0]["id"]
+
+
+def test_non_scalar_fields_are_dropped_or_rejected():
+    jobs, report = job_schema.normalize([
+        {"title": "A", "company": "X", "location": {"city": "London"}, "description": ["a", "b"]},
+        {"title": ["B"], "company": "Y"},
+        {"title": "C", "company": {"name": "Z"}},
+    ])
+    assert [j["title"] for j in jobs] == ["A"]
+    assert (jobs[0]["location"], jobs[0]["description"]) == ("", "")
+    assert (report["valid"], report["invalid"]) == (1, 2)
@@ -0,0 +1,60 @@
+"""Tests for the metrics registry and /metrics endpoint."""
+import sys
+import threading
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.metrics import Registry, start_metrics_server, stop_metrics_server
+
+
+def test_exposition_format():
+    reg = Registry()
+    c = reg.counter("demo_requests_total", "Requests.", ["outcome"])
+    g = reg.gauge("demo_inflight", "In flight.")
+    h = reg.histogram("demo_seconds", "Latency.", buckets=(0.1, 1.0))
+    c.labels(outcome='bad "x"').inc(2)
+    g.set(3)
+    for v in (0.05, 0.5, 5):
+        h.observe(v)
+
+    text = reg.render()
+    assert "# TYPE demo_requests_total counter" in text
+    assert 'demo_requests_total{outcome="bad \\"x\\""} 2' in text
+    assert "demo_inflight 3" in text
+    assert 'demo_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{le="1"} 2' in text
+    assert 'demo_seconds_bucket{le="+Inf"} 3' in text
+    assert "demo_seconds_count 3" in text
+    assert reg.counter("demo_requests_total", "Requests.", ["outcome"]) is c
+
+
+def test_concurrent_increments_are_exact():
+    reg = Registry()
+    c = reg.counter("demo_total", "Demo.", ["worker"])
+
+    def work(i):
+        for _ in range(5000):
+            c.labels(worker=i % 2).inc()
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert c.labels(worker=0).get() + c.labels(worker=1).get() == 40000
+
+
+def test_sidecar_serves_registry():
+    reg = Registry()
+    reg.counter("demo_scraped_total", "Demo.").inc()
+    server = start_metrics_server(port=0, registry=reg)
+    try:
+        host, port = server.server_address[:2]
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as resp:
+            body = resp.read().decode()
+            assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "demo_scraped_total 1" in body
+    finally:
+        stop_metrics_server()
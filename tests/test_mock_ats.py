@@ -0,0 +1,56 @@
+"""Submitter round trips against the local mock ATS server."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.auto_submit import JobApplicationSubmitter, RateLimited
+from src.db import init_db
+from src.mock_ats import MockATSConfig, start_mock_ats
+from src.submission_ledger import SubmissionLedger
+
+CANDIDATE = {"first_name": "O", "last_name": "R", "email": "o@example.com"}
+GH_URL = "https://boards.greenhouse.io/acme/jobs/{}"
+
+
+@pytest.fixture
+def make_submitter():
+    servers = []
+
+    def _make(**config):
+        server = start_mock_ats(MockATSConfig(latency_ms=0, jitter_ms=0, **config))
+        servers.append(server)
+        engine = create_engine("sqlite://", future=True)
+        init_db(engine)
+        ledger = SubmissionLedger(sessionmaker(bind=engine, future=True))
+        return server, JobApplicationSubmitter(ledger=ledger, greenhouse_api_base=server.base_url,
+                                               lever_api_base=server.base_url)
+
+    yield _make
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_accepts_greenhouse_and_lever(make_submitter):
+    server, submitter = make_submitter()
+    assert submitter.submit_greenhouse_application(GH_URL.format(1), "k", CANDIDATE)[0]
+    lever_url = "https://jobs.lever.co/acme/5ac21346-8e0c-4494-8e7a-3eb92ff77902"
+    assert submitter.submit_lever_application(lever_url, "k", CANDIDATE)[0]
+    assert server.stats["accepted"] == 2
+
+
+def test_rate_limit_and_failure_injection(make_submitter):
+    server, submitter = make_submitter(rate_limit=0.001, burst=1, retry_after=3)
+    assert submitter.submit_greenhouse_application(GH_URL.format(1), "k", CANDIDATE)[0]
+    with pytest.raises(RateLimited) as exc:
+        submitter.submit_greenhouse_application(GH_URL.format(2), "k", CANDIDATE)
+    assert exc.value.retry_after == 3
+
+    server, submitter = make_submitter(fail_rate=1.0)
+    ok, message = submitter.submit_greenhouse_application(GH_URL.format(3), "k", CANDIDATE)
+    assert not ok and message.startswith("Submission failed: 5")
@@ -0,0 +1,118 @@
+"""Tests for the rotating NDJSON writer and its indexed reader."""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+
+from src.ndjson_store import NDJSONReader, NDJSONWriter
+from src.pplx_search import save_jobs_to_file
+
+
+class Clock:
+    def __init__(self):
+        self.now = datetime(2026, 3, 1, 9)
+
+    def __call__(self):
+        return self.now
+
+
+def test_size_rotation_and_random_access(tmp_path):
+    with NDJSONWriter(tmp_path, max_bytes=2000, index_every=8, fsync="never") as writer:
+        writer.extend({"i": i, "title": "Paralegal – Londres"} for i in range(300))
+
+    segments = NDJSONReader(tmp_path).segments()
+    assert len(segments) > 5
+    assert all(p.stat().st_size <= 2000 for p in segments)
+
+    reader = NDJSONReader(tmp_path)
+    assert len(reader) == 300
+    assert [reader.read(i)["i"] for i in (0, 7, 8, 151, 299)] == [0, 7, 8, 151, 299]
+    assert [r["i"] for r in reader.iter_from(295)] == [295, 296, 297, 298, 299]
+    with pytest.raises(IndexError):
+        reader.read(300)
+
+
+def test_daily_rotation_compression_and_reopen(tmp_path):
+    clock = Clock()
+    writer = NDJSONWriter(tmp_path, compress="gzip", index_every=10, clock=clock)
+    writer.extend({"i": i} for i in range(25))
+    clock.now += timedelta(days=1)
+    writer.append({"i": 25})
+    writer.close()
+
+    names = sorted(p.name for p in NDJSONReader(tmp_path).segments())
+    assert names == ["jobs-20260301-0001.ndjson.gz", "jobs-20260302-0001.ndjson"]
+
+    # A torn final line (crash mid-write) is dropped when the segment is reopened
+    active = tmp_path / names[1]
+    with open(active, "ab") as f:
+        f.write(b'{"i": 9')
+    with NDJSONWriter(tmp_path, compress="gzip", index_every=10, clock=clock) as writer:
+        writer.append({"i": 26})
+
+    reader = NDJSONReader(tmp_path)
+    assert [r["i"] for r in reader] == list(range(27))
+    assert reader.read(13) == {"i": 13}
+
+
+def test_zstd_segments(tmp_path):
+    pytest.importorskip("zstandard")
+    with NDJSONWriter(tmp_path, compress="zstd", max_bytes=200, index_every=4) as writer:
+        writer.extend({"i": i} for i in range(50))
+    reader = NDJSONReader(tmp_path)
+    assert any(p.name.endswith(".zst") for p in reader.segments())
+    assert [reader.read(i)["i"] for i in range(0, 50, 7)] == list(range(0, 50, 7))
+
+
+def test_save_jobs_to_file_appends(tmp_path):
+    save_jobs_to_file([{"title": "A"}], str(tmp_path))
+    save_jobs_to_file([{"title": "B"}, {"title": "C"}], str(tmp_path))
+    assert [j["title"] for j in NDJSONReader(tmp_path, prefix="search")] == ["A", "B", "C"]
+
+
+def test_two_writers_share_a_directory(tmp_path):
+    a = NDJSONWriter(tmp_path, max_bytes=600, index_every=4, fsync="never")
+    b = NDJSONWriter(tmp_path, max_bytes=600, index_every=4, fsync="never")
+    for i in range(60):
+        (a if i % 3 else b).append({"i": i, "pad": "x" * 20})
+    a.close()
+    b.close()
+
+    reader = NDJSONReader(tmp_path)
+    assert len(reader) == 60
+    assert [r["i"] for r in reader] == list(range(60))
+    assert [reader.read(i)["i"] for i in (0, 13, 37, 59)] == [0, 13, 37, 59]
+    assert all(p.stat().st_size <= 600 for p in reader.segments())
+
+
+def test_crash_between_compressing_and_removing_the_plain_segment(tmp_path, monkeypatch):
+    clock = Clock()
+    writer = NDJSONWriter(tmp_path, compress="gzip", index_every=10, clock=clock)
+    writer.extend({"i": i} for i in range(25))
+    unlink = Path.unlink
+
+    def crash_on_plain_segment(self, missing_ok=False):
+        if self.name.endswith(".ndjson"):
+            raise OSError("simulated crash")
+        unlink(self, missing_ok=missing_ok)
+
+    monkeypatch.setattr(Path, "unlink", crash_on_plain_segment)
+    with pytest.raises(OSError):
+        writer.rotate()
+    monkeypatch.undo()
+    plain = tmp_path / "jobs-20260301-0001.ndjson"
+    assert plain.exists() and plain.with_suffix(".ndjson.gz").exists()
+
+    # Readers see the archive only, not both copies
+    reader = NDJSONReader(tmp_path)
+    assert [p.name for p in reader.segments()] == ["jobs-20260301-0001.ndjson.gz"]
+    assert [r["i"] for r in reader] == list(range(25))
+
+    # The next writer removes the leftover and starts a fresh segment instead of appending to it
+    with NDJSONWriter(tmp_path, compress="gzip", index_every=10, clock=clock) as writer:
+        writer.append({"i": 25})
+    assert not plain.exists()
+    assert [r["i"] for r in NDJSONReader(tmp_path)] == list(range(26))
@@ -0,0 +1,67 @@
+"""Tests for URL -> ATS platform classification."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, inspect, text
+
+from src.db import init_db
+from src.platforms import (
+    HostTrie,
+    PostingRef,
+    classify_url,
+    classify_urls,
+    load_platform_rules,
+    parse_job_url,
+)
+
+
+def test_suffix_match_on_label_boundaries():
+    assert classify_url("https://boards.greenhouse.io/acme/jobs/1") == "greenhouse"
+    assert classify_url("https://boards-api.greenhouse.io/v1/boards/acme/jobs/1?x=1") == "greenhouse"
+    assert classify_url("https://jobs.lever.co/acme/abc") == "lever"
+    assert classify_url("https://acme.wd5.myworkdayjobs.com/en-US/careers") == "workday"
+    assert classify_url("https://jobs.ashbyhq.com/acme") == "ashby"
+    assert classify_url("https://notgreenhouse.io.example.com/jobs") is None
+    assert classify_url("https://evilgreenhouse.io/") is None
+    assert classify_url("") is None
+
+
+def test_longest_suffix_wins():
+    trie = HostTrie({"a": ["example.com"], "b": ["jobs.example.com"]})
+    assert trie.match("x.jobs.example.com") == "b"
+    assert trie.match("www.example.com") == "a"
+
+
+def test_batch_and_yaml_rules(tmp_path):
+    assert classify_urls(["https://jobs.lever.co/a", None, "https://x.org"]) == ["lever", None, None]
+    rules = tmp_path / "platforms.yaml"
+    rules.write_text("teamtailor:\n  - teamtailor.com\n", encoding="utf-8")
+    assert load_platform_rules(str(rules)) == {"teamtailor": ["teamtailor.com"]}
+
+
+def test_init_db_adds_platform_column_to_old_jobs_table():
+    engine = create_engine("sqlite://", future=True)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE jobs (id INTEGER PRIMARY KEY, title VARCHAR(256) NOT NULL, "
+                          "company VARCHAR(256) NOT NULL)"))
+    init_db(engine)
+    assert "platform" in {c["name"] for c in inspect(engine).get_columns("jobs")}
+
+
+def test_parse_job_url_variants():
+    gh = PostingRef("greenhouse", "acme", "4043584006")
+    assert parse_job_url("https://boards.greenhouse.io/acme/jobs/4043584006?gh_src=x#app") == gh
+    assert parse_job_url("https://boards-api.greenhouse.io/v1/boards/acme/jobs/4043584006") == gh
+    assert parse_job_url("https://job-boards.greenhouse.io/acme/jobs/4043584006/") == gh
+    assert parse_job_url("https://boards.greenhouse.io/embed/job_app?for=acme&token=4043584006") == gh
+
+    uuid = "5ac21346-8e0c-4494-8e7a-3eb92ff77902"
+    lever = PostingRef("lever", "acme", uuid)
+    assert parse_job_url(f"https://jobs.lever.co/acme/{uuid}/apply?lever-source=x") == lever
+    assert parse_job_url(f"https://api.lever.co/v0/postings/acme/{uuid}") == lever
+
+    assert parse_job_url("https://boards.greenhouse.io/acme") is None
+    assert parse_job_url("https://jobs.lever.co/acme/not-a-uuid") is None
+    assert parse_job_url("https://example.com/acme/jobs/1") is None
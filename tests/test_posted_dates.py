@@ -0,0 +1,95 @@
+"""Tests for posted_date parsing and the indexed posted_at column."""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+import src.db
+from src.db import init_db
+from src.models import Job
+from src.posted_dates import backfill_posted_at, parse_posted_date, recent_jobs
+from src.pplx_search import bulk_upsert_jobs, normalize_perplexity_results
+
+NOW = datetime(2026, 10, 19, 15, 30)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("2 days ago", NOW - timedelta(days=2)),
+    ("Posted 3 hours ago", NOW - timedelta(hours=3)),
+    ("30+ days ago", NOW - timedelta(days=30)),
+    ("a week ago", NOW - timedelta(weeks=1)),
+    ("yesterday", NOW - timedelta(days=1)),
+    ("Today", NOW),
+    ("2026-10-01", datetime(2026, 10, 1)),
+    ("2026-10-01T09:00:00Z", datetime(2026, 10, 1, 9)),
+    ("2026-10-01T10:00:00+01:00", datetime(2026, 10, 1, 9)),
+    ("Oct 3", datetime(2026, 10, 3)),
+    ("December 24", datetime(2025, 12, 24)),  # no year: the most recent one not in the future
+    ("3rd October 2025", datetime(2025, 10, 3)),
+    ("Sep 5, 2026", datetime(2026, 9, 5)),
+    ("03/10/2026", datetime(2026, 10, 3)),  # day-first
+    ("", None),
+    ("recently", None),
+    ("Feb 30", None),
+    (None, None),
+])
+def test_parse_posted_date(raw, expected):
+    assert parse_posted_date(raw, NOW) == expected
+
+
+@pytest.mark.parametrize("now, expected", [
+    (NOW, datetime(2024, 2, 29)),  # 2026: two years back
+    (datetime(2027, 3, 1), datetime(2024, 2, 29)),  # three years back
+    (datetime(2028, 2, 28), datetime(2024, 2, 29)),  # this year's is still ahead
+    (datetime(2028, 2, 29, 12), datetime(2028, 2, 29)),
+    (datetime(2103, 1, 1), datetime(2096, 2, 29)),  # 2100 is not a leap year
+])
+def test_yearless_feb_29_is_the_latest_one_not_in_the_future(now, expected):
+    assert parse_posted_date("Feb 29", now) == expected
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://", future=True)
+    init_db(engine)
+    monkeypatch.setattr(src.db, "SessionLocal", sessionmaker(bind=engine, autoflush=False, future=True))
+    return engine
+
+
+def test_ingest_fills_posted_at_and_recency_is_a_range_query(db):
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+    jobs = normalize_perplexity_results({"jobs": [
+        {"title": "New", "company": "A", "url": "https://a.example/1", "date": "2 days ago"},
+        {"title": "Today", "company": "B", "url": "https://b.example/1", "posted_date": today},
+        {"title": "Old", "company": "C", "url": "https://c.example/1", "posted_date": "2020-01-01"},
+        {"title": "Unknown", "company": "D", "url": "https://d.example/1", "posted_date": "recently"},
+    ]})
+    assert bulk_upsert_jobs(jobs) == 4
+    with db.connect() as conn:
+        rows = dict(conn.execute(select(Job.title, Job.posted_date)).all())
+    assert rows["New"] == "2 days ago"  # raw string kept
+
+    assert [j.title for j in recent_jobs(days=7)] == ["Today", "New"]
+
+    plan = db.connect().exec_driver_sql(
+        "EXPLAIN QUERY PLAN SELECT id FROM jobs WHERE posted_at >= '2026-01-01' ORDER BY posted_at DESC").all()
+    assert "ix_jobs_posted_at" in " ".join(str(r[-1]) for r in plan)
+
+
+def test_backfill_uses_created_at_for_relative_dates(db):
+    scraped = datetime(2026, 10, 10, 12)
+    with db.begin() as conn:
+        conn.execute(Job.__table__.insert(), [
+            {"title": "A", "company": "X", "posted_date": "3 days ago", "created_at": scraped},
+            {"title": "B", "company": "X", "posted_date": "2026-09-01", "created_at": scraped},
+            {"title": "C", "company": "X", "posted_date": "", "created_at": scraped},
+        ])
+    assert backfill_posted_at() == 2
+    with db.connect() as conn:
+        rows = dict(conn.execute(select(Job.title, Job.posted_at)).all())
+    assert rows == {"A": scraped - timedelta(days=3), "B": datetime(2026, 9, 1), "C": None}
@@ -0,0 +1,118 @@
+"""Tests for the importable PR checker."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.pr_checker import PRChecker, check_prs, clear_checks_cache, rollup_checks
+
+API = "https://api.github.com/repos/o/r"
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        self.calls.append(url)
+        page = (params or {}).get("page", 1)
+        return FakeResponse(self.routes.get((url, page), self.routes.get(url, {})))
+
+
+def _pr(number, draft=False):
+    return {"number": number, "title": f"PR {number}", "user": {"login": "dev"}, "draft": draft,
+            "head": {"sha": f"sha{number}"}, "updated_at": "2026-01-01T00:00:00Z"}
+
+
+def test_check_prs_returns_report_with_progress():
+    clear_checks_cache()
+    routes = {
+        f"{API}/pulls": [_pr(1), _pr(2, draft=True)],
+        f"{API}/pulls/1": {"mergeable": True, "mergeable_state": "clean"},
+        f"{API}/pulls/2": {"mergeable": True, "mergeable_state": "draft"},
+        f"{API}/pulls/1/reviews": [{"user": {"login": "a"}, "state": "APPROVED"}],
+        f"{API}/pulls/2/reviews": [],
+        f"{API}/commits/sha1/status": {"state": "success"},
+        f"{API}/commits/sha2/status": {"state": "pending"},
+    }
+    progress = []
+    report = check_prs("o", "r", token="t", session=FakeSession(routes),
+                       on_progress=lambda done, total, pr: progress.append((done, total, pr["pr_number"])))
+
+    assert report["summary"] == {"total_prs": 2, "ready_count": 1, "needs_attention_count": 1}
+    assert report["ready_to_merge"][0]["pr_number"] == 1
+    assert "PR is marked as draft" in report["needs_attention"][0]["blocking_factors"]
+    assert progress == [(1, 2, 1), (2, 2, 2)]
+    assert report["ready_to_merge"][0]["review_status"]["reviewers"] == {"a": "APPROVED"}
+
+
+def test_review_analysis_fetches_each_pr_once():
+    routes = {
+        f"{API}/pulls/1/reviews": [{"user": {"login": "a"}, "state": "APPROVED"},
+                                   {"user": {"login": "a"}, "state": "COMMENTED"}],
+        f"{API}/pulls/2/reviews": [{"user": {"login": "b"}, "state": "CHANGES_REQUESTED"}],
+        f"{API}/pulls/3/reviews": [],
+    }
+    session = FakeSession(routes)
+    checker = PRChecker("o", "r", token="t", session=session)
+    summaries = checker.review_analysis([1, 2, 3, 2])
+
+    assert sorted(session.calls) == [f"{API}/pulls/{n}/reviews" for n in (1, 2, 3)]
+    assert summaries[1]["has_approval"] and not summaries[1]["needs_approval"]
+    assert summaries[2]["has_requested_changes"] and summaries[2]["reviewers"] == {"b": "CHANGES_REQUESTED"}
+    assert summaries[3]["review_count"] == 0 and summaries[3]["needs_approval"]
+
+
+def test_check_runs_merge_with_status_dedup_and_cache():
+    clear_checks_cache()
+    runs = [{"name": f"job{i}", "status": "completed", "conclusion": "success"} for i in range(100)]
+    routes = {
+        f"{API}/pulls": [_pr(1), _pr(2), _pr(3)],
+        f"{API}/pulls/1": {"mergeable": True},
+        f"{API}/pulls/2": {"mergeable": True},
+        f"{API}/pulls/3": {"mergeable": True},
+        f"{API}/pulls/1/reviews": [{"user": {"login": "a"}, "state": "APPROVED"}],
+        f"{API}/pulls/2/reviews": [{"user": {"login": "a"}, "state": "APPROVED"}],
+        f"{API}/pulls/3/reviews": [{"user": {"login": "a"}, "state": "APPROVED"}],
+        # No legacy statuses: the combined state alone would say "pending" forever
+        f"{API}/commits/shared/status": {"state": "pending", "total_count": 0, "statuses": []},
+        (f"{API}/commits/shared/check-runs", 1): {"total_count": 101, "check_runs": runs},
+        (f"{API}/commits/shared/check-runs", 2): {
+            "total_count": 101, "check_runs": [{"name": "lint", "status": "completed", "conclusion": "skipped"}]},
+        f"{API}/commits/sha3/status": {"state": "success", "total_count": 1,
+                                       "statuses": [{"context": "ci/legacy", "state": "success"}]},
+        f"{API}/commits/sha3/check-runs": {"total_count": 1, "check_runs": [
+            {"name": "tests", "status": "completed", "conclusion": "failure"}]},
+    }
+    prs = routes[f"{API}/pulls"]
+    prs[0]["head"]["sha"] = prs[1]["head"]["sha"] = "shared"
+    session = FakeSession(routes)
+
+    report = check_prs("o", "r", token="t", session=session)
+    assert [p["pr_number"] for p in report["ready_to_merge"]] == [1, 2]
+    assert report["needs_attention"][0]["blocking_factors"] == ["Checks status: failure (tests)"]
+    # Both pages fetched once for the shared SHA
+    assert session.calls.count(f"{API}/commits/shared/check-runs") == 2
+
+    session.calls.clear()
+    check_prs("o", "r", token="t", session=session)
+    assert not [c for c in session.calls if "/commits/" in c]  # completed rollups are cached
+
+
+def test_rollup_checks_pending_and_errors():
+    in_progress = [{"name": "build", "status": "in_progress", "conclusion": None}]
+    assert rollup_checks({}, in_progress)["state"] == "pending"
+    assert rollup_checks({"statuses": [{"state": "error", "context": "x"}]}, in_progress)["state"] == "error"
+    assert rollup_checks({"state": "pending", "total_count": 0, "statuses": []}, [])["state"] == "pending"
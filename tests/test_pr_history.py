@@ -0,0 +1,109 @@
+"""Tests for the PR readiness history tables and rollups."""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from src.db import init_db
+from src.models import PRSnapshot
+from src.pr_history import backfill_from_reports, daily_trend, pr_rollups, record_report, rollup_summary
+from src.pr_reports import ReportStore
+
+REPO = "o/r"
+
+
+def _factory():
+    engine = create_engine("sqlite://", future=True)
+    init_db(engine)
+    return sessionmaker(bind=engine, future=True)
+
+
+def _pr(number, draft=False, checks="success", sha="abc", approved=True):
+    blocking = []
+    if draft:
+        blocking.append("PR is marked as draft")
+    if checks != "success":
+        blocking.append(f"Checks status: {checks}")
+    if not approved:
+        blocking.append("Needs review approval")
+    return {"pr_number": number, "title": f"PR {number}", "author": "dev", "head_sha": sha,
+            "draft": draft, "mergeable": True, "checks_status": checks,
+            "review_status": {"needs_approval": not approved, "has_approval": approved,
+                              "has_requested_changes": False, "review_count": int(approved)},
+            "can_merge": not blocking, "blocking_factors": blocking}
+
+
+def _report(when, *prs):
+    return {"timestamp": when.isoformat(), "repository": REPO,
+            "ready_to_merge": [p for p in prs if p["can_merge"]],
+            "needs_attention": [p for p in prs if not p["can_merge"]],
+            "summary": {"total_prs": len(prs)}}
+
+
+def test_rollups_track_draft_time_time_to_ready_and_flaky_checks():
+    factory = _factory()
+    t0 = datetime.now() - timedelta(days=2)
+    record_report(_report(t0, _pr(1, draft=True, checks="pending"), _pr(2, checks="failure")), factory)
+    record_report(_report(t0 + timedelta(hours=2), _pr(1, checks="failure"), _pr(2)), factory)
+    record_report(_report(t0 + timedelta(hours=5), _pr(1, sha="def")), factory)
+    # Recording the same report again is a no-op
+    assert record_report(_report(t0 + timedelta(hours=5), _pr(1, sha="def")), factory) == 0
+
+    rollups = {r["pr_number"]: r for r in pr_rollups(REPO, session_factory=factory)}
+    assert rollups[1]["draft_hours"] == 2
+    assert rollups[1]["time_to_ready_hours"] == 5
+    assert rollups[1]["flaky_flips"] == 0  # failure -> success came with a new commit
+    assert rollups[2]["flaky_flips"] == 1  # failure -> success on the same SHA
+    assert rollups[2]["time_to_ready_hours"] == 2
+
+    summary = rollup_summary(REPO, session_factory=factory)
+    assert summary["prs_tracked"] == 2
+    assert summary["median_time_to_ready_hours"] == 3.5
+
+    sess = factory()
+    assert sess.execute(select(func.count(PRSnapshot.id))).scalar_one() == 5
+    sess.close()
+
+    trend = daily_trend(REPO, days=30, session_factory=factory)
+    assert sum(d["runs"] for d in trend) == 3
+    assert all(0 <= d["ready_share"] <= 1 for d in trend)
+
+
+def test_backfill_from_report_store_is_idempotent(tmp_path):
+    factory = _factory()
+    store = ReportStore(tmp_path)
+    base = datetime(2026, 1, 1, 9)
+    for i in range(3):
+        when = base + timedelta(days=i)
+        store.save(_report(when, _pr(7, approved=i > 0)), when=when)
+
+    assert backfill_from_reports(store, factory) == 3
+    assert backfill_from_reports(store, factory) == 0
+    (rollup,) = pr_rollups(REPO, session_factory=factory)
+    assert rollup["time_to_ready_hours"] == 24
+
+
+def test_reports_without_a_timestamp_are_skipped():
+    factory = _factory()
+    for timestamp in (None, "not a date"):
+        report = {**_report(datetime(2026, 1, 1), _pr(7)), "timestamp": timestamp}
+        assert record_report(report, factory) == 0
+        assert record_report(report, factory) == 0
+    with factory() as sess:
+        assert sess.execute(select(func.count(PRSnapshot.id))).scalar_one() == 0
+
+
+def test_reports_without_prs_are_recorded_once():
+    factory = _factory()
+    when = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0) - timedelta(days=1)
+    assert record_report(_report(when), factory) == 0
+    assert record_report(_report(when), factory) == 0
+    record_report(_report(when + timedelta(minutes=5), _pr(1)), factory)
+
+    (day,) = [d for d in daily_trend(REPO, days=30, session_factory=factory) if d["runs"]]
+    assert day["runs"] == 2
+    assert day["avg_open_prs"] == 0.5
@@ -0,0 +1,84 @@
+"""Tests for the PR report store (index, cache, compaction)."""
+import json
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.pr_reports import ReportStore
+
+
+def _report(ready):
+    return {"timestamp": "t", "repository": "o/r", "ready_to_merge": [], "needs_attention": [],
+            "summary": {"total_prs": 3, "ready_count": ready, "needs_attention_count": 3 - ready}}
+
+
+def test_save_updates_index_and_latest_is_cached(tmp_path):
+    store = ReportStore(tmp_path)
+    base = datetime(2026, 1, 1, 9)
+    for i in range(3):
+        store.save(_report(i), when=base + timedelta(hours=i))
+
+    index = json.loads((tmp_path / "index.json").read_text())
+    assert index["latest"] == "pr-merge-readiness-20260101-110000.json"
+    assert [r["ready_count"] for r in store.summaries()] == [0, 1, 2]
+    assert store.latest() is store.latest()  # parsed once while the mtime is unchanged
+
+    # A store over an existing directory without an index rebuilds it once.
+    (tmp_path / "index.json").unlink()
+    assert ReportStore(tmp_path).latest()["summary"]["ready_count"] == 2
+
+
+def test_compact_archives_old_reports_and_prune_drops_them(tmp_path):
+    store = ReportStore(tmp_path)
+    old = datetime.now() - timedelta(days=400)
+    for i in range(4):
+        store.save(_report(i), when=old + timedelta(minutes=i))
+    latest = store.save(_report(3))
+
+    assert store.compact(keep_last=2) == 3
+    assert sorted(p.name for p in tmp_path.glob("pr-merge-readiness-*.json"))[-1] == latest.name
+    assert len(list(tmp_path.glob("pr-merge-readiness-*.json"))) == 2
+    first = store.summaries()[0]
+    assert first["archive"] and store.load(first["file"])["summary"]["ready_count"] == 0
+    assert len(ReportStore(tmp_path).rebuild_index()["reports"]) == 5
+
+    assert store.prune(max_age_days=365) == 4
+    assert [r["file"] for r in store.summaries()] == [latest.name]
+    assert not list((tmp_path / "archive").glob("*.gz"))
+
+
+def test_prune_rewrites_a_partly_expired_archive(tmp_path):
+    store = ReportStore(tmp_path)
+    month = (datetime.now() - timedelta(days=400)).replace(day=1, hour=9, minute=0, second=0, microsecond=0)
+    old, newer = month, month + timedelta(days=20)
+    store.save(_report(0), when=old)
+    store.save(_report(1), when=newer)
+    latest = store.save(_report(2))
+    store.compact(keep_last=1)
+    assert len(list((tmp_path / "archive").glob("*.gz"))) == 1
+
+    assert store.prune(max_age_days=(datetime.now() - month).days - 10) == 1
+    kept = [r["file"] for r in store.summaries()]
+    assert kept == [f"pr-merge-readiness-{newer:%Y%m%d-%H%M%S}.json", latest.name]
+    assert store.load(kept[0])["summary"]["ready_count"] == 1
+    # The dropped report is gone from the archive too, so a rescan cannot bring it back.
+    assert [r["file"] for r in ReportStore(tmp_path).rebuild_index()["reports"]] == kept
+
+
+def test_stores_sharing_a_directory_keep_every_row(tmp_path):
+    base = datetime(2026, 1, 1)
+
+    def save_many(offset):
+        store = ReportStore(tmp_path)  # separate instances, as the app and the CLI would have
+        for i in range(25):
+            store.save(_report(1), when=base + timedelta(minutes=offset + 2 * i))
+
+    threads = [threading.Thread(target=save_many, args=(n,)) for n in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(ReportStore(tmp_path).summaries()) == 50
@@ -0,0 +1,57 @@
+"""Tests for per-PR and vectorized review analysis."""
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.pr_reviews import SUMMARY_COLUMNS, analyze_reviews_frame, review_summaries, summarize_reviews
+
+
+def _review(login, state):
+    return {"user": {"login": login}, "state": state}
+
+
+def test_commented_keeps_approval_and_dismissed_withdraws_it():
+    reviews = [_review("a", "APPROVED"), _review("a", "COMMENTED"), _review("b", "COMMENTED"),
+               _review("c", "CHANGES_REQUESTED"), _review("c", "DISMISSED"), _review("d", "PENDING")]
+    summary = summarize_reviews(reviews, min_approvals=1)
+    assert summary["has_approval"] and not summary["needs_approval"]
+    assert not summary["has_requested_changes"]
+    assert (summary["review_count"], summary["commented"], summary["dismissed"]) == (3, 1, 1)
+    assert summary["reviewers"] == {"a": "APPROVED", "b": "COMMENTED", "c": "DISMISSED"}
+
+    owners = summarize_reviews(reviews, min_approvals=1, required_reviewers={"c"})
+    assert owners["needs_approval"] and owners["required_approvals"] == 0
+    assert summarize_reviews(reviews, min_approvals=2)["needs_approval"]
+
+
+def test_vectorized_matches_per_pr_analysis():
+    rng = random.Random(7)
+    states = ["APPROVED", "CHANGES_REQUESTED", "COMMENTED", "DISMISSED", "PENDING"]
+    reviews_by_pr = {
+        pr: [_review(f"u{rng.randrange(6)}", rng.choice(states)) for _ in range(rng.randrange(0, 40))]
+        for pr in range(1, 60)
+    }
+    kwargs = {"min_approvals": 2, "required_reviewers": {"u0", "u1"}}
+
+    frame = analyze_reviews_frame(reviews_by_pr, **kwargs)
+    assert sorted(frame.index) == sorted(reviews_by_pr)
+    for pr, reviews in reviews_by_pr.items():
+        expected = summarize_reviews(reviews, **kwargs)
+        assert {c: frame.at[pr, c].item() for c in SUMMARY_COLUMNS} == {c: expected[c] for c in SUMMARY_COLUMNS}, pr
+
+
+def test_review_summaries_match_summarize_reviews():
+    rng = random.Random(11)
+    states = ["APPROVED", "CHANGES_REQUESTED", "COMMENTED", "DISMISSED", "PENDING"]
+    reviews_by_pr = {
+        pr: [_review(f"u{rng.randrange(5)}", rng.choice(states)) for _ in range(rng.randrange(0, 20))]
+        for pr in range(1, 30)
+    }
+    summaries = review_summaries(reviews_by_pr, min_approvals=1, required_reviewers={"u2"})
+    assert summaries == {
+        pr: summarize_reviews(reviews, min_approvals=1, required_reviewers={"u2"})
+        for pr, reviews in reviews_by_pr.items()
+    }
+    assert review_summaries({}) == {}
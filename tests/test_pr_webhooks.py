@@ -0,0 +1,122 @@
+"""Tests for the webhook receiver and the current PR state it maintains."""
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import requests
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db import init_db
+from src.models import PRCheckState
+from src.pr_state import CHECK_STATE_RETENTION, current_report, replace_from_report
+from src.pr_webhooks import apply_event, sign, start_webhook_server, stop_webhook_server, verify_signature
+from replay_webhooks import iter_fixtures
+
+REPO = "letter-orgz/job-O-matic-"
+FIXTURES = Path(__file__).parent / "fixtures" / "webhooks"
+
+
+def _factory():
+    # One shared connection so the receiver's worker threads see the same in-memory DB
+    engine = create_engine("sqlite://", future=True, poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
+    init_db(engine)
+    return sessionmaker(bind=engine, future=True)
+
+
+def test_signature_verification():
+    body = b'{"zen": "hi"}'
+    assert verify_signature("s3cret", body, sign("s3cret", body))
+    assert not verify_signature("s3cret", body, sign("other", body))
+    assert not verify_signature("", body, sign("", body))
+
+
+def test_replayed_fixtures_update_only_the_affected_pr():
+    factory = _factory()
+    replace_from_report({"repository": REPO, "ready_to_merge": [], "needs_attention": [
+        {"pr_number": 7, "title": "Other", "author": "x", "head_sha": "zzz", "draft": False,
+         "mergeable": True, "checks_status": "pending", "check_states": {"tests": "pending"},
+         "review_status": {"reviewers": {}}, "can_merge": False, "blocking_factors": ["Checks status: pending"]},
+    ]}, factory)
+
+    states = []
+    for _, event, payload in iter_fixtures([FIXTURES]):
+        assert apply_event(event, payload, factory) == [42]
+        report = current_report(REPO, factory)
+        pr = next(p for p in report["ready_to_merge"] + report["needs_attention"] if p["pr_number"] == 42)
+        states.append((pr["checks_status"], pr["can_merge"]))
+
+    assert states[2] == ("failure", False)
+    assert states[-2:] == [("success", True), ("success", True)]  # a later comment keeps the approval
+    report = current_report(REPO, factory)
+    assert [p["pr_number"] for p in report["ready_to_merge"]] == [42]
+    assert report["needs_attention"][0]["checks_status"] == "pending"  # PR 7 untouched
+
+    closed = {"action": "closed", "pull_request": {"number": 42}, "repository": {"full_name": REPO}}
+    apply_event("pull_request", closed, factory)
+    assert current_report(REPO, factory)["summary"]["total_prs"] == 1
+
+
+def test_receiver_rejects_bad_signatures():
+    factory = _factory()
+    server = start_webhook_server(port=0, secret="s3cret", session_factory=factory)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        _, event, payload = next(iter_fixtures([FIXTURES / "01_opened.json"]))
+        body = json.dumps(payload).encode()
+
+        bad = requests.post(url, data=body, headers={"X-GitHub-Event": event,
+                                                     "X-Hub-Signature-256": sign("wrong", body)})
+        assert bad.status_code == 401
+        ok = requests.post(url, data=body, headers={"X-GitHub-Event": event,
+                                                    "X-Hub-Signature-256": sign("s3cret", body)})
+        assert ok.json() == {"event": "pull_request", "updated": [42]}
+        assert current_report(REPO, factory)["summary"]["total_prs"] == 1
+    finally:
+        stop_webhook_server()
+
+
+def test_checks_delivered_before_synchronize_are_kept():
+    factory = _factory()
+    for _, event, payload in iter_fixtures([FIXTURES]):
+        apply_event(event, payload, factory)
+    repo = {"full_name": REPO}
+
+    # The new commit's checks arrive before the synchronize event that moves the PR to it
+    run = {"name": "tests", "head_sha": "d4e5f6", "status": "completed", "conclusion": "success"}
+    assert apply_event("check_run", {"action": "completed", "check_run": run, "repository": repo}, factory) == []
+    status = {"sha": "d4e5f6", "context": "ci/legacy", "state": "success", "repository": repo}
+    assert apply_event("status", status, factory) == []
+
+    pr = {"number": 42, "title": "Add webhook receiver", "user": {"login": "dev"}, "draft": False,
+          "head": {"sha": "d4e5f6"}, "mergeable": True, "updated_at": "2026-10-01T10:00:00Z"}
+    assert apply_event("pull_request", {"action": "synchronize", "pull_request": pr, "repository": repo},
+                       factory) == [42]
+    (state,) = current_report(REPO, factory)["ready_to_merge"]
+    assert (state["pr_number"], state["checks_status"], state["can_merge"]) == (42, "success", True)
+
+
+def test_stale_check_states_are_pruned_by_full_checks_not_deliveries():
+    factory = _factory()
+    sess = factory()
+    sess.add(PRCheckState(repository=REPO, sha="old", name="ci", state="success",
+                          updated_at=datetime.utcnow() - CHECK_STATE_RETENTION - timedelta(days=1)))
+    sess.commit()
+    sess.close()
+
+    status = {"sha": "new", "context": "ci", "state": "success", "repository": {"full_name": REPO}}
+    apply_event("status", status, factory)
+    sess = factory()
+    assert sorted(sess.execute(select(PRCheckState.sha)).scalars()) == ["new", "old"]
+    sess.close()
+
+    replace_from_report({"repository": REPO, "ready_to_merge": [], "needs_attention": []}, factory)
+    sess = factory()
+    assert list(sess.execute(select(PRCheckState.sha)).scalars()) == ["new"]
+    sess.close()
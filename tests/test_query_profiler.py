@@ -0,0 +1,59 @@
+"""Tests for the SQL profiler engine hooks."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+import src.db
+from src.db import init_db
+from src.pplx_search import bulk_upsert_jobs, insert_jobs_into_db
+from src.query_profiler import QueryProfiler, fingerprint
+from src.synthetic_jobs import generate_jobs
+
+
+def _profiled_db(monkeypatch, **kwargs):
+    engine = create_engine("sqlite://", future=True)
+    init_db(engine)
+    monkeypatch.setattr(src.db, "SessionLocal", sessionmaker(bind=engine, future=True))
+    return engine, QueryProfiler(**kwargs).attach(engine)
+
+
+def test_fingerprint_collapses_literals_and_in_lists():
+    a = fingerprint("SELECT id FROM jobs WHERE id IN (?, ?, ?) AND company = 'Acme'  LIMIT 10")
+    b = fingerprint("SELECT id FROM jobs WHERE id IN (?) AND company = 'Globex' LIMIT 5")
+    assert a == b == "SELECT id FROM jobs WHERE id IN (...) AND company = ? LIMIT ?"
+
+
+def test_flags_per_job_lookup_as_n_plus_one(monkeypatch):
+    _, profiler = _profiled_db(monkeypatch, n_plus_one_threshold=5)
+    insert_jobs_into_db(list(generate_jobs(20, seed=1, duplicate_rate=0)))
+
+    findings = profiler.n_plus_one_findings()
+    assert len(findings) == 1
+    assert "jobs.apply_url = ?" in findings[0]["fingerprint"]
+    assert findings[0]["caller"].startswith("insert_jobs_into_db")
+    top = profiler.top_fingerprints(key="count")[0]
+    assert top["count"] == 20 and top["kind"] == "SELECT"
+
+
+def test_bulk_path_is_not_flagged(monkeypatch):
+    _, profiler = _profiled_db(monkeypatch, n_plus_one_threshold=5)
+    bulk_upsert_jobs(generate_jobs(200, seed=1), batch_size=50)
+    assert profiler.n_plus_one_findings() == []
+
+
+def test_slow_queries_capture_plan(monkeypatch):
+    engine, profiler = _profiled_db(monkeypatch, slow_ms=0, top_n=3)
+    with engine.connect() as conn:
+        for i in range(5):
+            conn.execute(text("SELECT id FROM jobs WHERE apply_url = :u"), {"u": f"x{i}"})
+
+    slow = profiler.slow_queries()
+    assert len(slow) == 3
+    assert slow[0]["duration_ms"] >= slow[-1]["duration_ms"]
+    plans = [q["plan"] for q in slow if "apply_url" in q["statement"]]
+    assert plans and "ix_jobs_apply_url" in plans[0]
+    profiler.detach()
@@ -0,0 +1,33 @@
+"""Tests for the tailored-content section parser."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.sections import extract_section, load_sections, parse_sections, save_sections
+
+TAILORED = """=== SUMMARY ===
+Legal researcher with GDPR focus.
+=== cover paragraph ===
+I am excited to apply.
+Second line.
+=== SKILLS ===
+- research
+"""
+
+
+def test_parse_sections_single_pass():
+    sections = parse_sections(TAILORED)
+    assert list(sections) == ["SUMMARY", "COVER_PARAGRAPH", "SKILLS"]
+    assert sections["COVER_PARAGRAPH"] == "I am excited to apply.\nSecond line."
+    assert sections["SKILLS"] == "- research"
+
+
+def test_extract_section_matches_parser():
+    assert extract_section(TAILORED, "SUMMARY") == parse_sections(TAILORED)["SUMMARY"]
+    assert extract_section(TAILORED, "MISSING") == ""
+
+
+def test_sections_round_trip(tmp_path):
+    save_sections(tmp_path, parse_sections(TAILORED))
+    assert load_sections(tmp_path)["SUMMARY"] == "Legal researcher with GDPR focus."
@@ -0,0 +1,54 @@
+"""Tests for the streaming multipart body used for CV uploads."""
+import sys
+from email.parser import BytesParser
+from email.policy import default
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.apply.streaming import MultipartStream, deferred_file, iter_file_chunks
+
+
+def test_multipart_stream_matches_declared_length(tmp_path):
+    cv = tmp_path / "cv.pdf"
+    cv.write_bytes(b"%PDF" + b"x" * 200_000)
+    fields = {"first_name": "Omar", "data_compliance": {"gdpr_consent_given": True}}
+    with MultipartStream(fields, {"resume": cv}, chunk_size=4096) as body:
+        data = b"".join(iter(lambda: body.read(1000), b""))
+        assert len(data) == len(body)
+
+    msg = BytesParser(policy=default).parsebytes(
+        f"Content-Type: {body.content_type}\r\n\r\n".encode() + data
+    )
+    parts = {p.get_param("name", header="content-disposition"): p for p in msg.iter_parts()}
+    assert parts["first_name"].get_content() == "Omar"
+    assert parts["data_compliance[gdpr_consent_given]"].get_content() == "true"
+    assert parts["resume"].get_content() == cv.read_bytes()
+
+
+def test_close_releases_handle_mid_stream(tmp_path):
+    cv = tmp_path / "cv.pdf"
+    cv.write_bytes(b"y" * 100_000)
+    body = MultipartStream({}, {"resume": cv}, chunk_size=1024)
+    body.read(2000)
+    handle = body._open_file
+    assert handle is not None and not handle.closed
+    body.close()
+    assert handle.closed
+
+
+def test_iter_file_chunks(tmp_path):
+    f = tmp_path / "a.bin"
+    f.write_bytes(b"z" * 10)
+    assert list(iter_file_chunks(f, chunk_size=4)) == [b"zzzz", b"zzzz", b"zz"]
+
+
+def test_deferred_file_reads_in_chunks_and_closes(tmp_path):
+    cv = tmp_path / "cv.pdf"
+    cv.write_bytes(bytes(range(256)) * 40)
+    reader = deferred_file(cv, chunk_size=1000)()
+    assert reader._fh is None  # nothing opened until read
+    reader.seek(0)
+    assert reader.read() == cv.read_bytes()  # what Streamlit does with a RawIOBase
+    assert reader._fh is None
+    reader.close()
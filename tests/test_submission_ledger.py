@@ -0,0 +1,95 @@
+"""Tests for the submission ledger and idempotent sends."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import requests
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.auto_submit import JobApplicationSubmitter
+from src.db import init_db
+from src.submission_ledger import SubmissionLedger
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = ""
+        self.headers = {}
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.posts = 0
+
+    def post(self, url, **kwargs):
+        self.posts += 1
+        return FakeResponse(self.statuses.pop(0))
+
+
+def _ledger():
+    engine = create_engine("sqlite://", future=True)
+    init_db(engine)
+    return SubmissionLedger(sessionmaker(bind=engine, future=True))
+
+
+CANDIDATE = {"first_name": "O", "last_name": "R", "email": "o@example.com"}
+URL = "https://boards-api.greenhouse.io/v1/boards/acme/jobs/123"
+
+
+def test_success_is_never_resent():
+    ledger = _ledger()
+    http = FakeSession([201])
+    submitter = JobApplicationSubmitter(session=http, ledger=ledger)
+    assert submitter.submit_greenhouse_application(URL, "k", CANDIDATE, job_id=1)[0]
+    ok, message = submitter.submit_greenhouse_application(URL, "k", CANDIDATE, job_id=1)
+    assert ok and message == "Already submitted"
+    assert http.posts == 1
+    stats = ledger.stats()["greenhouse"]
+    assert stats["submissions"] == 1 and stats["success_rate"] == 1.0
+
+
+def test_failed_attempt_can_be_retried():
+    ledger = _ledger()
+    http = FakeSession([500, 200])
+    submitter = JobApplicationSubmitter(session=http, ledger=ledger)
+    assert not submitter.submit_greenhouse_application(URL, "k", CANDIDATE)[0]
+    assert submitter.submit_greenhouse_application(URL, "k", CANDIDATE)[0]
+    assert http.posts == 2
+
+
+def test_in_flight_key_blocks_second_claim():
+    ledger = _ledger()
+    assert ledger.claim("key", 1, "lever", "h") == (True, "")
+    assert ledger.claim("key", 1, "lever", "h")[0] is False
+
+
+class FailingSession:
+    def __init__(self, exc):
+        self.exc = exc
+        self.posts = 0
+
+    def post(self, url, **kwargs):
+        self.posts += 1
+        raise self.exc
+
+
+def test_timeout_stays_unconfirmed_but_connect_failure_can_retry():
+    ledger = _ledger()
+    http = FailingSession(requests.exceptions.ReadTimeout("read timed out"))
+    submitter = JobApplicationSubmitter(session=http, ledger=ledger)
+    ok, message = submitter.submit_greenhouse_application(URL, "k", CANDIDATE)
+    assert not ok and "unconfirmed" in message
+    ok, message = submitter.submit_greenhouse_application(URL, "k", CANDIDATE)
+    assert not ok and message.startswith("Previous submission unconfirmed")
+    assert http.posts == 1
+
+    ledger = _ledger()
+    http = FailingSession(requests.exceptions.ConnectTimeout("connect timed out"))
+    submitter = JobApplicationSubmitter(session=http, ledger=ledger)
+    assert not submitter.submit_greenhouse_application(URL, "k", CANDIDATE)[0]
+    assert not submitter.submit_greenhouse_application(URL, "k", CANDIDATE)[0]
+    assert http.posts == 2
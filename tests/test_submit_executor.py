@@ -0,0 +1,133 @@
+"""Tests for the concurrent auto-submit executor."""
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.auto_submit import JobApplicationSubmitter, RateLimited
+from src.submit_executor import RateLimiter, SubmitExecutor, find_bundle_dir
+
+
+class FakeSubmitter(JobApplicationSubmitter):
+    def __init__(self, latency=0.05, rate_limit_first=False):
+        super().__init__(session=object())
+        self.latency = latency
+        self.rate_limit_first = rate_limit_first
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def auto_submit_with_confirmation(self, job_row, candidate_data, output_dir, api_keys):
+        with self.lock:
+            self.calls.append(job_row["id"])
+            first = self.calls.count(job_row["id"]) == 1
+        if self.rate_limit_first and first:
+            raise RateLimited("greenhouse", retry_after=0)
+        time.sleep(self.latency)
+        return True, "ok"
+
+
+def _rows(n):
+    return [
+        {"id": i, "company": "Acme", "title": f"Role {i}", "status": "APPROVED",
+         "apply_url": f"https://boards.greenhouse.io/acme/jobs/{i}", "output_dir": "bundle"}
+        for i in range(n)
+    ]
+
+
+def _executor(submitter, **kw):
+    return SubmitExecutor(submitter, platform_concurrency={"greenhouse": 4},
+                          rate_limiter=RateLimiter(0), on_success=lambda row: None,
+                          sleep=lambda s: None, **kw)
+
+
+def test_runs_concurrently_and_dedups():
+    submitter = FakeSubmitter(latency=0.1)
+    progress = []
+    start = time.monotonic()
+    rows = _rows(8) + _rows(8)
+    results = _executor(submitter).run(rows, {}, {"greenhouse": "k"},
+                                       on_progress=lambda d, t, r: progress.append(d))
+    assert time.monotonic() - start < 0.6
+    assert sorted(submitter.calls) == list(range(8))
+    assert progress == list(range(1, 9))
+    assert all(r["success"] for r in results)
+
+
+def test_retries_rate_limited_and_never_resubmits():
+    submitter = FakeSubmitter(latency=0, rate_limit_first=True)
+    executor = _executor(submitter)
+    results = executor.run(_rows(2), {}, {"greenhouse": "k"})
+    assert all(r["success"] and r["retries"] == 1 for r in results)
+    assert executor.run(_rows(2), {}, {"greenhouse": "k"}) == []
+
+
+def test_backoff_releases_the_platform_slot():
+    submitter = FakeSubmitter(latency=0, rate_limit_first=True)
+    free_during_backoff = []
+
+    def sleep(seconds):
+        semaphore = executor._semaphores["greenhouse"]
+        acquired = semaphore.acquire(blocking=False)
+        free_during_backoff.append(acquired)
+        if acquired:
+            semaphore.release()
+
+    executor = SubmitExecutor(submitter, platform_concurrency={"greenhouse": 1},
+                              rate_limiter=RateLimiter(0), on_success=lambda row: None, sleep=sleep)
+    results = executor.run(_rows(1), {}, {"greenhouse": "k"})
+    assert results[0]["success"] and free_during_backoff == [True]
+
+
+def test_find_bundle_dir_matches_job_exactly(tmp_path):
+    for run in ("20250101-090000", "20250102-090000"):
+        (tmp_path / run / "7_Acme_Paralegal").mkdir(parents=True)
+        (tmp_path / run / "8_Acme_Paralegal_Senior").mkdir(parents=True)
+    row = {"id": 7, "company": "Acme", "title": "Paralegal"}
+    assert find_bundle_dir(row, str(tmp_path)) == str(tmp_path / "20250102-090000" / "7_Acme_Paralegal")
+    assert find_bundle_dir({**row, "id": 9}, str(tmp_path)) is None
+
+
+def test_approved_jobs_carry_stored_posting_ids(tmp_path, monkeypatch):
+    monkeypatch.setenv("STREAMLIT_HEADLESS", "1")
+    import app
+    from sqlalchemy import create_engine
+
+    from src.auto_submit import JobApplicationSubmitter
+    from src.db import init_db
+    from src.models import Job
+
+    engine = create_engine("sqlite://", future=True)
+    init_db(engine)
+    monkeypatch.setattr(app, "get_engine", lambda: engine)
+    bundle = tmp_path / "bundle"
+    bundle.mkdir()
+    (bundle / "cv_legal.pdf").write_bytes(b"%PDF")
+    with engine.begin() as conn:
+        conn.execute(Job.__table__.insert(), [
+            {"title": "Paralegal", "company": "Acme", "status": "APPROVED", "platform": "greenhouse",
+             "apply_url": "https://boards.greenhouse.io/acme/jobs/101", "board_token": "acme-stored",
+             "posting_id": "9001", "preview_dir": str(bundle)},
+            {"title": "Analyst", "company": "Beta", "status": "APPROVED", "platform": "lever",
+             "apply_url": "https://jobs.lever.co/beta/abc", "board_token": "beta-stored",
+             "posting_id": "uuid-1", "preview_dir": str(bundle)},
+        ])
+
+    calls = []
+
+    class RecordingSubmitter(JobApplicationSubmitter):
+        def submit_greenhouse_application(self, *args, **kwargs):
+            calls.append(("greenhouse", kwargs["board_token"], kwargs["posting_id"]))
+            return True, "ok"
+
+        def submit_lever_application(self, *args, **kwargs):
+            calls.append(("lever", kwargs["site"], kwargs["posting_id"]))
+            return True, "ok"
+
+    submitter = RecordingSubmitter(session=object())
+    for row in app.get_approved_jobs():
+        assert submitter.auto_submit_with_confirmation(
+            row, {}, row["output_dir"], {"greenhouse": "k", "lever": "k"}
+        )[0]
+    assert calls == [("greenhouse", "acme-stored", "9001"), ("lever", "beta-stored", "uuid-1")]
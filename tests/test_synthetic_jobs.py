@@ -0,0 +1,57 @@
+"""Tests for the synthetic job corpus and the bulk upsert path."""
+import json
+import sys
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+import src.db
+from src.db import init_db
+from src.models import Job
+from src.pplx_search import bulk_upsert_jobs
+from src.synthetic_jobs import _company_names, generate_jobs, write_ndjson
+
+
+def test_generator_is_deterministic_and_has_duplicates():
+    a = list(generate_jobs(2000, seed=3, duplicate_rate=0.1))
+    b = list(generate_jobs(2000, seed=3, duplicate_rate=0.1))
+    assert a == b
+    assert a != list(generate_jobs(2000, seed=4, duplicate_rate=0.1))
+    unique = len({j["apply_url"] for j in a})
+    assert 0.85 * 2000 < unique < 0.95 * 2000
+
+
+def test_write_ndjson_streams(tmp_path):
+    out = tmp_path / "jobs.ndjson"
+    assert write_ndjson(generate_jobs(50, seed=1), out) == 50
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[0])["id"] == 1
+
+
+def test_bulk_upsert_dedups_and_updates(monkeypatch):
+    engine = create_engine("sqlite://", future=True)
+    init_db(engine)
+    monkeypatch.setattr(src.db, "SessionLocal", sessionmaker(bind=engine, future=True))
+
+    jobs = list(generate_jobs(500, seed=2, duplicate_rate=0.2))
+    unique = len({j["apply_url"] for j in jobs})
+    assert bulk_upsert_jobs(iter(jobs), batch_size=64) == unique
+
+    changed = dict(jobs[0], title="Updated Title")
+    assert bulk_upsert_jobs(islice([changed], 1)) == 0
+    with sessionmaker(bind=engine, future=True)() as s:
+        assert s.scalar(select(func.count(Job.id))) == unique
+        row = s.execute(select(Job).where(Job.apply_url == changed["apply_url"])).scalar_one()
+        assert row.title == "Updated Title" and row.platform is not None
+
+
+def test_more_than_200_companies_get_numbered_names():
+    names = _company_names(450)
+    assert len(set(names)) == 450
+    assert names[0] == "Acme Legal" and names[200] == "Acme Legal 2" and names[449] == "Hooli Holdings 3"
+    jobs = list(generate_jobs(3000, seed=5, duplicate_rate=0, companies=450))
+    assert len({j["company"] for j in jobs}) > 200
@@ -0,0 +1,101 @@
+"""Tests for the persistent tailoring cache."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.db import init_db
+from src.tailor_cache import TailorCache, cache_key
+
+
+def _cache(max_entries=10):
+    engine = create_engine("sqlite://", future=True)
+    init_db(engine)
+    return TailorCache(sessionmaker(bind=engine, future=True), max_entries=max_entries)
+
+
+def test_hits_on_normalized_duplicate():
+    cache = _cache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "tailored"
+
+    assert cache.get_or_compute("Paralegal  role\n", "legal", compute) == "tailored"
+    assert cache.get_or_compute("paralegal role", "legal", compute) == "tailored"
+    assert len(calls) == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+    cache.get_or_compute("paralegal role", "legal", compute, force_refresh=True)
+    assert len(calls) == 2
+
+
+def test_key_depends_on_variant_and_version():
+    assert cache_key("x", "a") != cache_key("x", "b")
+    assert cache_key("x", "a", "1") != cache_key("x", "a", "2")
+
+
+def test_lru_eviction():
+    cache = _cache(max_entries=2)
+    for desc in ("a", "b", "c"):
+        cache.get_or_compute(desc, "v", lambda: desc)
+    cache.get_or_compute("c", "v", lambda: "recomputed")
+    assert cache.hits == 1
+    cache.get_or_compute("a", "v", lambda: "recomputed")
+    assert cache.misses == 4
+
+
+def test_compute_runs_without_an_open_session_and_misses_do_not_count_rows():
+    engine = create_engine("sqlite://", future=True)
+    init_db(engine)
+    open_sessions = []
+
+    class TrackedSession(Session):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            open_sessions.append(self)
+
+        def close(self):
+            if self in open_sessions:
+                open_sessions.remove(self)
+            super().close()
+
+    counts = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *a: counts.append(1) if "count(" in statement.lower() else None)
+    cache = TailorCache(sessionmaker(bind=engine, class_=TrackedSession, future=True), max_entries=3)
+
+    def compute():
+        assert open_sessions == []
+        return "tailored"
+
+    for desc in ("a", "b", "c"):
+        cache.get_or_compute(desc, "v", compute)
+    assert len(counts) == 1  # loaded once on the first insert, not on every miss
+    cache.get_or_compute("d", "v", compute)
+    assert len(counts) == 2  # over the limit: recount and evict
+    assert cache.get_or_compute("a", "v", lambda: "recomputed") == "recomputed"
+
+
+def test_store_survives_a_concurrent_insert_of_the_same_key(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}", future=True)
+    init_db(engine)
+    factory = sessionmaker(bind=engine, future=True)
+    other = TailorCache(factory)
+    raced = []
+
+    def insert_first(conn, cursor, statement, *args):
+        # Another worker stores the key between our lookup and our insert
+        if statement.startswith("INSERT INTO tailor_cache") and not raced:
+            raced.append(1)
+            other._store(cache_key("Paralegal", "legal"), "legal", "theirs")
+
+    event.listen(engine, "before_cursor_execute", insert_first)
+    cache = TailorCache(factory)
+    assert cache.get_or_compute("Paralegal", "legal", lambda: "ours") == "ours"
+    assert raced == [1]
+    assert cache.get_or_compute("Paralegal", "legal", lambda: "recomputed") == "theirs"
@@ -0,0 +1,55 @@
+"""Tests for the in-process span recorder."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src import tracing
+from src.tracing import span, traced
+
+
+@pytest.fixture(autouse=True)
+def _clean_buffer():
+    tracing.clear_spans()
+    yield
+    tracing.clear_spans()
+
+
+def test_spans_nest_and_record_errors():
+    @traced("outer")
+    def outer():
+        with span("inner", job_id=7):
+            pass
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        outer()
+
+    inner, outer_span = tracing.recent_spans()
+    assert inner.parent_id == outer_span.span_id
+    assert inner.trace_id == outer_span.trace_id
+    assert inner.attributes == {"job_id": 7}
+    assert outer_span.status == "ERROR" and "boom" in outer_span.error
+    assert tracing.slowest_spans(1)[0] is outer_span
+    names = {row["name"]: row["count"] for row in tracing.summarize_spans()}
+    assert names == {"outer": 1, "inner": 1}
+
+
+def test_trace_file_round_trip(tmp_path, monkeypatch):
+    trace_file = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(tracing, "TRACE_FILE", str(trace_file))
+    with span("pplx.normalize", items=3):
+        pass
+
+    doc = json.loads(trace_file.read_text().splitlines()[0])
+    otlp = doc["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert otlp["name"] == "pplx.normalize"
+    assert otlp["attributes"] == [{"key": "items", "value": {"intValue": "3"}}]
+
+    loaded = tracing.load_trace_file()
+    assert loaded[0]["name"] == "pplx.normalize"
+    assert loaded[0]["attributes"] == {"items": "3"}
+    assert [(r["name"], r["count"]) for r in tracing.summarize_spans(loaded)] == [("pplx.normalize", 1)]